@@ -0,0 +1,89 @@
+"""
+Async versions of the crud functions, for the API endpoints.
+
+Each function runs the matching function from crud.py on an AsyncSession via
+run_sync: the ORM code is shared, but the SQL goes through aiosqlite on the
+event loop instead of occupying a threadpool worker for the whole request.
+crud.py stays the implementation used by scripts and sync code.
+
+run_sync calls the function on the event loop thread, so only short calls
+that touch a handful of rows belong here. Endpoints that load whole tables
+or do real work in Python (statistics, tags, duplicate detection, the
+unpaged lists) stay sync routes on crud.py and run in the threadpool.
+"""
+from functools import wraps
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from . import companies, crud, models, skills, typeahead
+
+
+def _run_sync(func):
+    @wraps(func)
+    async def wrapper(db: AsyncSession, *args, **kwargs):
+        return await db.run_sync(func, *args, **kwargs)
+    return wrapper
+
+
+# Job applications
+get_application = _run_sync(crud.get_application)
+update_application = _run_sync(crud.update_application)
+delete_application = _run_sync(crud.delete_application)
+archive_application = _run_sync(crud.archive_application)
+bulk_delete_applications = _run_sync(crud.bulk_delete_applications)
+bulk_archive_applications = _run_sync(crud.bulk_archive_applications)
+bulk_update_status = _run_sync(crud.bulk_update_status)
+
+# Cold messages
+create_cold_message = _run_sync(crud.create_cold_message)
+get_cold_message_page = _run_sync(crud.get_cold_message_page)
+get_cold_message = _run_sync(crud.get_cold_message)
+update_cold_message = _run_sync(crud.update_cold_message)
+delete_cold_message = _run_sync(crud.delete_cold_message)
+get_cold_message_stats = _run_sync(crud.get_cold_message_stats)
+
+# LinkedIn connections
+create_connection = _run_sync(crud.create_connection)
+get_connection_page = _run_sync(crud.get_connection_page)
+get_connection = _run_sync(crud.get_connection)
+check_connection_duplicate = _run_sync(crud.check_connection_duplicate)
+update_connection = _run_sync(crud.update_connection)
+delete_connection = _run_sync(crud.delete_connection)
+get_connection_stats = _run_sync(crud.get_connection_stats)
+
+# Due queue
+get_due_items = _run_sync(crud.get_due_items)
+
+# Saved views
+get_saved_views = _run_sync(crud.get_saved_views)
+get_saved_view = _run_sync(crud.get_saved_view)
+get_saved_view_applications = _run_sync(crud.get_saved_view_applications)
+create_saved_view = _run_sync(crud.create_saved_view)
+update_saved_view = _run_sync(crud.update_saved_view)
+delete_saved_view = _run_sync(crud.delete_saved_view)
+
+# Skills
+top_skills = _run_sync(skills.top_skills)
+applications_with_skill = _run_sync(skills.applications_with)
+
+# Companies
+search_companies = _run_sync(companies.search)
+get_company = _run_sync(companies.get_company)
+
+
+async def get_unique_domains(db: AsyncSession):
+    result = await db.execute(
+        select(models.JobApplication.domain)
+        .where(models.JobApplication.domain.isnot(None))
+        .distinct()
+    )
+    return [domain for domain in result.scalars() if domain]
+
+
+async def get_typeahead_index(db: AsyncSession) -> typeahead.TypeaheadIndex:
+    """The in-memory typeahead index; only goes to the database to (re)build it."""
+    index = typeahead.cached(db)
+    if index is None:
+        index = await db.run_sync(typeahead.load)
+    return index
@@ -0,0 +1,182 @@
+"""
+Online database backups using the SQLite backup API.
+
+Snapshots are taken with sqlite3.Connection.backup, which copies the database
+page by page and yields between steps, so writers are only blocked for the
+duration of a single step and the result is always transactionally consistent
+(unlike copying the live file).
+
+This module only depends on the standard library (zstandard is optional) so it
+can also be used from scripts such as backup_db.py.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import tempfile
+import zlib
+from typing import Iterator, Optional
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+# Pages copied per backup step and pause between steps (seconds)
+BACKUP_STEP_PAGES = 256
+BACKUP_STEP_SLEEP = 0.005
+
+CHUNK_SIZE = 1024 * 1024
+
+COMPRESSION_SUFFIXES = {
+    "none": "",
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def row_hash(*values) -> str:
+    """Content hash of one row's values, used to detect changed rows."""
+    h = hashlib.sha1()
+    for value in values:
+        # Tag each value with its type so NULL, '' and 0 hash differently
+        h.update(type(value).__name__.encode())
+        h.update(b"\x1e")
+        h.update(value if isinstance(value, bytes) else str(value).encode("utf-8"))
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Make row_hash(...) available in SQL on this connection."""
+    conn.create_function("row_hash", -1, row_hash, deterministic=True)
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def check_compression(compression: str):
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unknown compression '{compression}'. Use one of: {', '.join(COMPRESSION_SUFFIXES)}")
+    if compression == "zstd" and zstandard is None:
+        raise ValueError("zstd compression requires the 'zstandard' package.")
+
+
+def snapshot_database(db_path: str, dest_path: str,
+                      pages: int = BACKUP_STEP_PAGES, sleep: float = BACKUP_STEP_SLEEP) -> str:
+    """Write a consistent copy of db_path to dest_path and return dest_path."""
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database file not found: {db_path}")
+    src = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    dst = sqlite3.connect(dest_path)
+    try:
+        src.backup(dst, pages=pages, sleep=sleep)
+    finally:
+        dst.close()
+        src.close()
+    return dest_path
+
+
+def copy_into_database(src_path: str, db_path: str, busy_timeout: float = 30.0):
+    """Replace the contents of the live database db_path with those of src_path.
+
+    Unlike swapping the file, this goes through SQLite's own locking, so
+    connections other processes still hold on db_path stay valid and simply
+    see the new data. The copy is a single backup step and so atomic.
+    """
+    dst = sqlite3.connect(db_path, timeout=busy_timeout)
+    src = sqlite3.connect(src_path)
+    try:
+        journal_mode = dst.execute("PRAGMA journal_mode").fetchone()[0]
+        page_size = dst.execute("PRAGMA page_size").fetchone()[0]
+        if journal_mode == "wal" and src.execute("PRAGMA page_size").fetchone()[0] != page_size:
+            # A WAL database can't change page size, so convert the source instead
+            src.execute("PRAGMA journal_mode=DELETE")
+            src.execute(f"PRAGMA page_size={int(page_size)}")
+            src.execute("VACUUM")
+        src.backup(dst)
+        if journal_mode == "wal":
+            # Fold the copied pages into the main file now rather than at the next checkpoint
+            dst.execute("PRAGMA wal_checkpoint(PASSIVE)")
+    finally:
+        src.close()
+        dst.close()
+
+
+def snapshot_to_tempfile(db_path: str, dir: Optional[str] = None) -> str:
+    """Snapshot db_path into a new temporary file; the caller removes it."""
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", prefix="job_tracker_snapshot_", dir=dir)
+    os.close(fd)
+    try:
+        return snapshot_database(db_path, tmp_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+def _compressor(compression: str):
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=3, threads=-1).compressobj()
+    # wbits=31 produces a gzip container compatible with the gzip module / CLI
+    return zlib.compressobj(6, zlib.DEFLATED, 31)
+
+
+def iter_file(path: str, compression: str = "none") -> Iterator[bytes]:
+    """Yield the contents of path in chunks, compressing on the fly."""
+    check_compression(compression)
+    compressor = None if compression == "none" else _compressor(compression)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            if compressor is None:
+                yield chunk
+            else:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+    if compressor is not None:
+        yield compressor.flush()
+
+
+def write_compressed(src_path: str, dest_path: str, compression: str = "none") -> str:
+    """Copy src_path to dest_path, compressing with the given method."""
+    with open(dest_path, "wb") as out:
+        for chunk in iter_file(src_path, compression):
+            out.write(chunk)
+    return dest_path
+
+
+def compression_for_filename(filename: str) -> Optional[str]:
+    """Return the compression of an uploaded backup file, or None if it is not a backup."""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if filename.endswith(".db" + suffix):
+            return compression
+    return None
+
+
+def save_uploaded_backup(fileobj, filename: str, dest_path: str):
+    """Store an uploaded (possibly compressed) backup as a plain .db file."""
+    compression = compression_for_filename(filename)
+    if compression is None:
+        raise ValueError("Invalid file format. Please upload a .db, .db.gz or .db.zst file")
+    check_compression(compression)
+    with open(dest_path, "wb") as out:
+        if compression == "none":
+            shutil.copyfileobj(fileobj, out, CHUNK_SIZE)
+            return
+        try:
+            if compression == "gzip":
+                with gzip.GzipFile(fileobj=fileobj, mode="rb") as src:
+                    shutil.copyfileobj(src, out, CHUNK_SIZE)
+            else:
+                zstandard.ZstdDecompressor().copy_stream(fileobj, out)
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Could not decompress the uploaded backup: {e}")
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise ValueError(f"Could not decompress the uploaded backup: {e}")
+            raise
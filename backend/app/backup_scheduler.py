@@ -0,0 +1,252 @@
+"""
+In-process scheduled backups.
+
+A daemon thread takes a consistent, compressed snapshot of the database every
+BACKUP_INTERVAL_MINUTES, thins old snapshots out into hourly / daily / weekly
+buckets and prunes the job_tracker.db.bak_* safety copies left by restores.
+
+Configuration (environment variables):
+    BACKUP_INTERVAL_MINUTES   minutes between snapshots, 0 disables (default 60)
+    BACKUP_DIR                where snapshots are kept (default backups/snapshots)
+    BACKUP_COMPRESSION        none, gzip or zstd (default gzip)
+    BACKUP_KEEP_HOURLY        hourly snapshots to keep (default 24)
+    BACKUP_KEEP_DAILY         daily snapshots to keep (default 7)
+    BACKUP_KEEP_WEEKLY        weekly snapshots to keep (default 4)
+    BACKUP_KEEP_RESTORE_BAKS  job_tracker.db.bak_* files to keep (default 3)
+    BACKUP_LOCK_FILE          lock held by the worker running a cycle
+                              (default job_tracker.db.backup.lock)
+
+Every API worker runs the scheduler; the lock file makes sure only one of
+them takes each interval's snapshot and applies retention.
+
+With MULTI_TENANT each user's database is snapshotted as well, into
+BACKUP_DIR/tenants/<user>.
+"""
+import glob
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from . import backup, dump
+from .database import DB_PATH, list_tenants, restore_coordinator_for, tenant_db_path, tenant_dir
+from .locks import file_lock
+
+SNAPSHOT_RE = re.compile(r"^job_tracker_(\d{8}_\d{6})\.db(\.gz|\.zst)?$")
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        print(f"Invalid {name}={os.environ.get(name)!r}, using {default}")
+        return default
+
+
+class BackupConfig:
+    def __init__(self):
+        self.interval_minutes = _env_int("BACKUP_INTERVAL_MINUTES", 60)
+        self.backup_dir = os.environ.get("BACKUP_DIR", os.path.join("backups", "snapshots"))
+        self.compression = os.environ.get("BACKUP_COMPRESSION", "gzip")
+        self.keep_hourly = _env_int("BACKUP_KEEP_HOURLY", 24)
+        self.keep_daily = _env_int("BACKUP_KEEP_DAILY", 7)
+        self.keep_weekly = _env_int("BACKUP_KEEP_WEEKLY", 4)
+        self.keep_restore_baks = _env_int("BACKUP_KEEP_RESTORE_BAKS", 3)
+        self.lock_file = os.environ.get("BACKUP_LOCK_FILE", f"{DB_PATH}.backup.lock")
+
+
+# ─── Snapshots ───────────────────────────────────────────────────────
+
+def list_snapshots(backup_dir: str) -> List[Dict]:
+    """Snapshots in backup_dir, newest first."""
+    if not os.path.isdir(backup_dir):
+        return []
+    snapshots = []
+    with os.scandir(backup_dir) as it:
+        for entry in it:
+            match = SNAPSHOT_RE.match(entry.name)
+            if not match or not entry.is_file():
+                continue
+            snapshots.append({
+                "name": entry.name,
+                "created_at": datetime.strptime(match.group(1), "%Y%m%d_%H%M%S"),
+                "size_bytes": entry.stat().st_size,
+            })
+    return sorted(snapshots, key=lambda s: s["created_at"], reverse=True)
+
+
+def snapshot_path(backup_dir: str, name: str) -> str:
+    """Path of an existing snapshot; raises LookupError for unknown names."""
+    if not SNAPSHOT_RE.match(name):
+        raise LookupError("Unknown snapshot")
+    path = os.path.join(backup_dir, name)
+    if not os.path.exists(path):
+        raise LookupError("Snapshot not found")
+    return path
+
+
+def _tenant_db_path(tenant: Optional[str]) -> Optional[str]:
+    return None if tenant is None else tenant_db_path(tenant)
+
+
+def take_snapshot(config: BackupConfig, tenant: Optional[str] = None) -> Dict:
+    backup.check_compression(config.compression)
+    backup_dir = tenant_dir(config.backup_dir, tenant)
+    os.makedirs(backup_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    name = f"job_tracker_{timestamp}.db{backup.COMPRESSION_SUFFIXES[config.compression]}"
+    dest = os.path.join(backup_dir, name)
+    tmp_dest = dest + ".tmp"
+
+    db_path = _tenant_db_path(tenant)
+    with restore_coordinator_for(db_path).checkout():
+        raw_path = dump.snapshot_to_tempfile(dir=backup_dir, db_path=db_path)
+    try:
+        # Compress outside the checkout so a restore never waits on it
+        if config.compression == "none":
+            os.replace(raw_path, tmp_dest)
+        else:
+            backup.write_compressed(raw_path, tmp_dest, config.compression)
+        os.replace(tmp_dest, dest)
+    finally:
+        for path in (raw_path, tmp_dest):
+            if os.path.exists(path):
+                os.remove(path)
+    return {"name": name, "size_bytes": os.path.getsize(dest)}
+
+
+# ─── Retention ───────────────────────────────────────────────────────
+
+def select_retained(snapshots: List[Dict], keep_hourly: int, keep_daily: int, keep_weekly: int) -> set:
+    """Names to keep: the newest snapshot of each of the most recent hour / day / week buckets."""
+    keep = set()
+    buckets = (
+        (keep_hourly, "%Y%m%d%H"),
+        (keep_daily, "%Y%m%d"),
+        (keep_weekly, "%G%V"),  # ISO year + week
+    )
+    for limit, fmt in buckets:
+        seen = set()
+        for snap in snapshots:  # newest first
+            if len(seen) >= limit:
+                break
+            key = snap["created_at"].strftime(fmt)
+            if key not in seen:
+                seen.add(key)
+                keep.add(snap["name"])
+    if snapshots:
+        keep.add(snapshots[0]["name"])  # never drop the latest
+    return keep
+
+
+def apply_retention(config: BackupConfig, tenant: Optional[str] = None) -> List[str]:
+    backup_dir = tenant_dir(config.backup_dir, tenant)
+    snapshots = list_snapshots(backup_dir)
+    keep = select_retained(snapshots, config.keep_hourly, config.keep_daily, config.keep_weekly)
+    removed = []
+    for snap in snapshots:
+        if snap["name"] not in keep:
+            path = os.path.join(backup_dir, snap["name"])
+            try:
+                os.remove(path)
+                removed.append(snap["name"])
+            except OSError as e:
+                print(f"Could not remove {path}: {e}")
+    return removed
+
+
+def prune_restore_baks(keep: int, db_path: str = DB_PATH) -> List[str]:
+    """Delete all but the newest `keep` job_tracker.db.bak_* files left by restores."""
+    baks = sorted(glob.glob(f"{db_path}.bak_*"), key=os.path.getmtime, reverse=True)
+    removed = []
+    for path in baks[max(keep, 0):]:
+        try:
+            os.remove(path)
+            removed.append(os.path.basename(path))
+        except OSError as e:
+            print(f"Could not remove {path}: {e}")
+    return removed
+
+
+def run_backup_cycle(config: BackupConfig, tenant: Optional[str] = None) -> Dict:
+    snapshot = take_snapshot(config, tenant)
+    return {
+        "snapshot": snapshot,
+        "pruned_snapshots": apply_retention(config, tenant),
+        "pruned_restore_baks": prune_restore_baks(config.keep_restore_baks, _tenant_db_path(tenant) or DB_PATH),
+    }
+
+
+def run_all_backup_cycles(config: BackupConfig) -> Dict:
+    """Backup cycle for the default database and every user's database."""
+    result = run_backup_cycle(config)
+    for tenant in list_tenants():
+        try:
+            run_backup_cycle(config, tenant)
+        except Exception as e:
+            print(f"Scheduled backup for user '{tenant}' failed: {e}")
+    return result
+
+
+# ─── Scheduler thread ────────────────────────────────────────────────
+
+class BackupScheduler:
+    def __init__(self, config: Optional[BackupConfig] = None):
+        self.config = config or BackupConfig()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _seconds_until_due(self) -> float:
+        snapshots = list_snapshots(self.config.backup_dir)
+        if not snapshots:
+            return 0
+        age = time.time() - snapshots[0]["created_at"].timestamp()
+        return max(self.config.interval_minutes * 60 - age, 0)
+
+    def _run_cycle(self) -> Optional[Dict]:
+        """Run a cycle unless another worker is running one or already took this
+        interval's snapshot; returns None when skipped."""
+        try:
+            with file_lock(self.config.lock_file, timeout=0):
+                if self._seconds_until_due() > 0:
+                    return None
+                return run_all_backup_cycles(self.config)
+        except TimeoutError:
+            return None
+
+    def _run(self):
+        # Reloads / restarts don't trigger a fresh snapshot if a recent one exists
+        wait = self._seconds_until_due()
+        while not self._stop.wait(wait):
+            wait = self.config.interval_minutes * 60
+            try:
+                result = self._run_cycle()
+                if result is None:
+                    # Line up with the other worker's schedule
+                    wait = max(self._seconds_until_due(), 60)
+                    continue
+                print(f"Scheduled backup written: {result['snapshot']['name']}")
+            except Exception as e:
+                print(f"Scheduled backup failed: {e}")
+
+    def start(self):
+        if self.config.interval_minutes <= 0 or self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="backup-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+
+backup_scheduler = BackupScheduler()
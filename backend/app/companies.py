@@ -0,0 +1,174 @@
+"""
+Companies shared by applications, cold messages and connections.
+
+Each of the three tables keeps its free-text company_name and links to a
+companies row through company_id; rows whose names normalise to the same
+key (normalize.company_key) share one company, so the per-company view is an
+index lookup on company_id rather than three LIKE scans.
+
+Fuzzy lookup goes through company_ngrams, an inverted index of the
+trigrams of every normalised name: candidates are the companies sharing
+the most trigrams with the query, ranked by trigram similarity (shared /
+union, as PostgreSQL's pg_trgm does). Works the same on SQLite and
+PostgreSQL.
+
+link_missing() accepts a SQLAlchemy Connection or Session as well as a
+plain sqlite3 connection, for the backup merge (see restore.py).
+"""
+import sqlite3
+from typing import Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session, selectinload
+
+from . import models, normalize
+
+# Tables with a company_name / company_id pair
+LINKED_TABLES = ("job_applications", "cold_messages", "linkedin_connections")
+
+MIN_SIMILARITY = 0.3
+MAX_CANDIDATES = 50
+
+_INSERT_COMPANY = (
+    "INSERT INTO companies (name, normalized_name) VALUES (:name, :normalized_name)"
+    " ON CONFLICT (normalized_name) DO NOTHING"
+)
+_INSERT_NGRAM = "INSERT INTO company_ngrams (ngram, company_id) VALUES (:ngram, :company_id)"
+
+
+def ngrams(key: str) -> Set[str]:
+    """Trigrams of a normalised name, each word padded like pg_trgm ('  ab ' -> '  a', ' ab', 'ab ')."""
+    grams = set()
+    for word in key.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def _fetch(conn, sql: str, params: Optional[dict] = None) -> List[tuple]:
+    if isinstance(conn, sqlite3.Connection):
+        return conn.execute(sql, params or {}).fetchall()
+    return [tuple(row) for row in conn.execute(text(sql), params or {})]
+
+
+def _execute(conn, sql: str, params) -> int:
+    if not params:
+        return 0
+    if isinstance(conn, sqlite3.Connection):
+        if isinstance(params, list):
+            return conn.executemany(sql, params).rowcount
+        return conn.execute(sql, params).rowcount
+    return conn.execute(text(sql), params).rowcount
+
+
+def _index_ngrams(conn, company_ids: Dict[str, int]):
+    _execute(conn, _INSERT_NGRAM, [
+        {"ngram": gram, "company_id": company_id}
+        for key, company_id in company_ids.items()
+        for gram in sorted(ngrams(key))
+    ])
+
+
+def get_or_create(db: Session, name: Optional[str]) -> Optional[int]:
+    """Id of the company name belongs to, adding it if it's new; None for a blank name.
+
+    Joins the caller's transaction without committing.
+    """
+    key = normalize.company_key(name)
+    if key is None:
+        return None
+    lookup = "SELECT id FROM companies WHERE normalized_name = :normalized_name"
+    rows = _fetch(db, lookup, {"normalized_name": key})
+    if rows:
+        return rows[0][0]
+    # ON CONFLICT: a concurrent request may have added it since the lookup
+    created = _execute(db, _INSERT_COMPANY, {"name": name.strip(), "normalized_name": key})
+    company_id = _fetch(db, lookup, {"normalized_name": key})[0][0]
+    if created:
+        _index_ngrams(db, {key: company_id})
+    return company_id
+
+
+def link_missing(conn, tables: Iterable[str] = LINKED_TABLES) -> int:
+    """Link every row that has a company_name but no company_id; returns how many were linked.
+
+    Set-based: one query per table for the unlinked rows, the companies
+    they need are added in bulk and the rows updated with executemany.
+    Doesn't commit.
+    """
+    pending = {
+        table: _fetch(conn, f"SELECT id, company_name FROM {table}"
+                            " WHERE company_id IS NULL AND company_name IS NOT NULL")
+        for table in tables
+    }
+    names: Dict[str, str] = {}
+    for rows in pending.values():
+        for _, name in rows:
+            key = normalize.company_key(name)
+            if key is not None:
+                names.setdefault(key, name.strip())
+    if not names:
+        return 0
+
+    known = dict(_fetch(conn, "SELECT normalized_name, id FROM companies"))
+    new = [{"name": name, "normalized_name": key} for key, name in names.items() if key not in known]
+    if new:
+        _execute(conn, _INSERT_COMPANY, new)
+        added = dict(_fetch(conn, "SELECT normalized_name, id FROM companies"))
+        _index_ngrams(conn, {key: company_id for key, company_id in added.items() if key not in known})
+        known = added
+
+    linked = 0
+    for table, rows in pending.items():
+        updates = []
+        for row_id, name in rows:
+            key = normalize.company_key(name)
+            if key is not None:
+                updates.append({"company_id": known[key], "id": row_id})
+        _execute(conn, f"UPDATE {table} SET company_id = :company_id WHERE id = :id", updates)
+        linked += len(updates)
+    return linked
+
+
+def search(db: Session, query: str, limit: int = 10) -> List[dict]:
+    """Companies whose names are similar to query, best match first."""
+    key = normalize.company_key(query)
+    if key is None:
+        return []
+    grams = ngrams(key)
+    shared = func.count(models.CompanyNgram.id).label("shared")
+    candidates = (
+        db.query(models.Company.id, models.Company.name, models.Company.normalized_name, shared)
+        .join(models.CompanyNgram, models.CompanyNgram.company_id == models.Company.id)
+        .filter(models.CompanyNgram.ngram.in_(grams))
+        .group_by(models.Company.id, models.Company.name, models.Company.normalized_name)
+        .order_by(shared.desc())
+        .limit(MAX_CANDIDATES)
+        .all()
+    )
+    matches = []
+    for company_id, name, normalized_name, count in candidates:
+        similarity = count / (len(grams) + len(ngrams(normalized_name)) - count)
+        if similarity >= MIN_SIMILARITY:
+            matches.append({"id": company_id, "name": name, "similarity": round(similarity, 3)})
+    matches.sort(key=lambda m: (-m["similarity"], m["name"]))
+    return matches[:limit]
+
+
+def get_company(db: Session, company_id: int) -> Optional[models.Company]:
+    """A company with its applications, messages and connections loaded.
+
+    Each collection is one query on its indexed company_id column
+    (selectin loading), which avoids the row multiplication of joining three
+    one-to-many tables at once.
+    """
+    return (
+        db.query(models.Company)
+        .options(
+            selectinload(models.Company.applications),
+            selectinload(models.Company.cold_messages),
+            selectinload(models.Company.connections),
+        )
+        .filter(models.Company.id == company_id)
+        .first()
+    )
@@ -1,9 +1,10 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, or_, and_
+from sqlalchemy import func, extract, or_, and_, cast, insert, Text
 from datetime import datetime, timedelta
 from typing import List, Optional
 from collections import defaultdict
-from . import models, schemas
+import heapq
+from . import companies, models, normalize, pagination, schemas, skills, typeahead, uploads
 import os
 import json
 
@@ -65,13 +66,9 @@ def _latest_rejection_stage(history):
     return None
 
 
-def get_applications(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None, 
-                     domain: Optional[str] = None, search: Optional[str] = None, 
-                     work_type: Optional[str] = None, tags: Optional[str] = None,
-                     include_archived: bool = False, sort_by: str = "created_at", 
-                     sort_order: str = "desc", status_stage: Optional[str] = None):
-    query = db.query(models.JobApplication)
-    
+def _filter_applications(query, status: Optional[str] = None, domain: Optional[str] = None,
+                         search: Optional[str] = None, work_type: Optional[str] = None,
+                         tags: Optional[str] = None, include_archived: bool = False):
     # Filter by archived status
     if not include_archived:
         query = query.filter(models.JobApplication.is_archived == 0)
@@ -92,7 +89,8 @@ def get_applications(db: Session, skip: int = 0, limit: int = 100, status: Optio
     if tags:
         tag_list = tags.split(',')
         for tag in tag_list:
-            query = query.filter(models.JobApplication.tags.contains(tag.strip()))
+            # Match on the JSON text so the filter works on SQLite and PostgreSQL alike
+            query = query.filter(cast(models.JobApplication.tags, Text).contains(tag.strip()))
     
     # Global search across multiple fields
     if search:
@@ -107,27 +105,41 @@ def get_applications(db: Session, skip: int = 0, limit: int = 100, status: Optio
                 models.JobApplication.job_description.ilike(search_term)
             )
         )
-    
-    # Sorting
+    return query
+
+def _rejection_stage_matches(app, status_stage: Optional[str]) -> bool:
+    """The rejection stage filter, applied in Python (status_history is JSON)."""
+    if not status_stage:
+        return True
+    if app.status != "Rejected":
+        return False
+    stage = _latest_rejection_stage(app.status_history)
+    return (stage or "Not specified") == status_stage
+
+def _sort_applications(query, sort_by: str, sort_order: str):
     sort_column = getattr(models.JobApplication, sort_by, models.JobApplication.created_at)
     if sort_order == "asc":
-        query = query.order_by(sort_column.asc())
-    else:
-        query = query.order_by(sort_column.desc())
+        return query.order_by(sort_column.asc())
+    return query.order_by(sort_column.desc())
+
+def get_applications(db: Session, skip: int = 0, limit: int = 100, status: Optional[str] = None, 
+                     domain: Optional[str] = None, search: Optional[str] = None, 
+                     work_type: Optional[str] = None, tags: Optional[str] = None,
+                     include_archived: bool = False, sort_by: str = "created_at", 
+                     sort_order: str = "desc", status_stage: Optional[str] = None):
+    query = _filter_applications(
+        db.query(models.JobApplication), status=status, domain=domain, search=search,
+        work_type=work_type, tags=tags, include_archived=include_archived,
+    )
+    
+    # Sorting
+    query = _sort_applications(query, sort_by, sort_order)
     
     results = query.offset(skip).limit(limit).all()
 
     # Filter by rejection stage in Python (status_history is JSON)
     if status_stage:
-        filtered = []
-        for app in results:
-            if app.status != "Rejected":
-                continue
-            stage = _latest_rejection_stage(app.status_history)
-            stage_label = stage or "Not specified"
-            if stage_label == status_stage:
-                filtered.append(app)
-        return filtered
+        return [app for app in results if _rejection_stage_matches(app, status_stage)]
 
     return results
 
@@ -151,16 +163,24 @@ def create_application(db: Session, application: schemas.JobApplicationCreate):
         "stage": status_stage or status
     }
     app_data["status_history"] = [initial_status]
+    app_data["company_id"] = companies.get_or_create(db, app_data.get("company_name"))
+    app_data["job_url_key"] = normalize.job_url_key(app_data.get("job_url"))
     
     db_application = models.JobApplication(**app_data)
     db.add(db_application)
+    db.flush()
+    _sync_saved_views(db, db_application.id)
+    skills.sync(db, db_application)
     db.commit()
     db.refresh(db_application)
+    typeahead.application_changed(db, None, typeahead.values(db_application))
     return db_application
 
 def update_application(db: Session, application_id: int, application: schemas.JobApplicationUpdate):
     db_application = get_application(db, application_id)
     if db_application:
+        before = typeahead.values(db_application)
+        indexed_before = skills.indexed_values(db_application)
         update_data = application.model_dump(exclude_unset=True)
         
         # Check if status is being updated
@@ -215,43 +235,53 @@ def update_application(db: Session, application_id: int, application: schemas.Jo
         # Apply other updates
         for field, value in update_data.items():
             setattr(db_application, field, value)
+        if "company_name" in update_data:
+            db_application.company_id = companies.get_or_create(db, db_application.company_name)
+        if "job_url" in update_data:
+            db_application.job_url_key = normalize.job_url_key(db_application.job_url)
+        _sync_saved_views(db, db_application.id)
+        skills.sync(db, db_application, indexed_before)
         
         db.commit()
         db.refresh(db_application)
+        typeahead.application_changed(db, before, typeahead.values(db_application))
     return db_application
 
 def delete_application(db: Session, application_id: int):
     db_application = get_application(db, application_id)
     if db_application:
-        # Delete associated files
-        if db_application.cv_filepath and os.path.exists(db_application.cv_filepath):
-            os.remove(db_application.cv_filepath)
-        if db_application.coverletter_filepath and os.path.exists(db_application.coverletter_filepath):
-            os.remove(db_application.coverletter_filepath)
-        
+        old_files = [db_application.cv_filepath, db_application.coverletter_filepath]
+        before = typeahead.values(db_application)
+        _sync_saved_views(db, application_id, deleted=True)
+        skills.remove(db, application_id)
         db.delete(db_application)
         db.commit()
+        typeahead.application_changed(db, before, None)
+        # Delete associated files only once the row is gone, so a failed
+        # commit never leaves the DB pointing at missing documents
+        for filepath in old_files:
+            uploads.remove_file(filepath)
         return True
     return False
 
 def update_document(db: Session, application_id: int, doc_type: str, filename: str, filepath: str):
     db_application = get_application(db, application_id)
     if db_application:
+        old_filepath = None
         if doc_type == "cv":
-            # Delete old CV if exists
-            if db_application.cv_filepath and os.path.exists(db_application.cv_filepath):
-                os.remove(db_application.cv_filepath)
+            old_filepath = db_application.cv_filepath
             db_application.cv_filename = filename
             db_application.cv_filepath = filepath
         elif doc_type == "coverletter":
-            # Delete old cover letter if exists
-            if db_application.coverletter_filepath and os.path.exists(db_application.coverletter_filepath):
-                os.remove(db_application.coverletter_filepath)
+            old_filepath = db_application.coverletter_filepath
             db_application.coverletter_filename = filename
             db_application.coverletter_filepath = filepath
         
         db.commit()
         db.refresh(db_application)
+        # Delete the replaced document after the new path is committed
+        if old_filepath and old_filepath != filepath:
+            uploads.remove_file(old_filepath)
     return db_application
 
 def get_statistics(db: Session):
@@ -325,6 +355,7 @@ def archive_application(db: Session, application_id: int, archive: bool = True):
     db_application = get_application(db, application_id)
     if db_application:
         db_application.is_archived = 1 if archive else 0
+        _sync_saved_views(db, application_id)
         db.commit()
         db.refresh(db_application)
     return db_application
@@ -350,6 +381,7 @@ def bulk_update_status(db: Session, application_ids: List[int], status: str, sta
         db_application = get_application(db, app_id)
         if db_application:
             previous_status = db_application.status
+            indexed_before = skills.indexed_values(db_application)
             db_application.status = status
             # Add to status history
             stage_label = stage or (previous_status if status == "Rejected" else status)
@@ -362,6 +394,8 @@ def bulk_update_status(db: Session, application_ids: List[int], status: str, sta
             status_history = list(db_application.status_history) if db_application.status_history else []
             status_history.append(new_status_entry)
             db_application.status_history = status_history
+            _sync_saved_views(db, app_id)
+            skills.sync(db, db_application, indexed_before)
             db.commit()
             count += 1
     return count
@@ -386,28 +420,46 @@ def get_all_tags(db: Session) -> List[str]:
 
 # ─── Cold Message CRUD ───────────────────────────────────────────────
 
+def _link_message(db: Session, db_msg: models.ColdMessage):
+    """Make db_msg's connection point back at it; drops a link to a missing connection."""
+    db_conn = get_connection(db, db_msg.connection_id)
+    if db_conn is None:
+        db_msg.connection_id = None
+        return
+    db_conn.cold_message_sent = True
+    db_conn.cold_message_id = db_msg.id
+
+def _unlink_message(db: Session, connection_id: int, msg_id: int):
+    """Point the connection at its newest other message if it was pointing at msg_id."""
+    db_conn = get_connection(db, connection_id)
+    if db_conn is None or db_conn.cold_message_id != msg_id:
+        return
+    newest = db.query(func.max(models.ColdMessage.id)).filter(
+        models.ColdMessage.connection_id == connection_id,
+        models.ColdMessage.id != msg_id,
+    ).scalar()
+    db_conn.cold_message_id = newest
+    db_conn.cold_message_sent = newest is not None
+
+# Each write below changes the message and its connection in one transaction,
+# so the two sides of the link can't drift apart (see links.py)
+
 def create_cold_message(db: Session, cold_message: schemas.ColdMessageCreate):
     data = cold_message.model_dump()
-    connection_id = data.get("connection_id")
     if not data.get("sent_date"):
         data["sent_date"] = datetime.now()
+    data["company_id"] = companies.get_or_create(db, data.get("company_name"))
     db_msg = models.ColdMessage(**data)
     db.add(db_msg)
+    if db_msg.connection_id:
+        db.flush()  # assigns db_msg.id
+        _link_message(db, db_msg)
     db.commit()
     db.refresh(db_msg)
-    # Auto-sync: mark the linked connection as cold_message_sent
-    if connection_id:
-        db_conn = get_connection(db, connection_id)
-        if db_conn:
-            db_conn.cold_message_sent = True
-            db_conn.cold_message_id = db_msg.id
-            db.commit()
     return db_msg
 
-def get_cold_messages(db: Session, search: Optional[str] = None,
-                      via: Optional[str] = None, category: Optional[str] = None,
-                      sort_by: str = "created_at", sort_order: str = "desc"):
-    query = db.query(models.ColdMessage)
+def _filter_cold_messages(query, search: Optional[str] = None,
+                          via: Optional[str] = None, category: Optional[str] = None):
     if search:
         term = f"%{search}%"
         query = query.filter(
@@ -422,6 +474,16 @@ def get_cold_messages(db: Session, search: Optional[str] = None,
         query = query.filter(models.ColdMessage.via == via)
     if category:
         query = query.filter(models.ColdMessage.category == category)
+    return query
+
+def _sort_column(sort_keys, sort_by: str) -> str:
+    # Only indexed sort keys, so every page is an index range scan
+    return sort_by if sort_by in sort_keys else "created_at"
+
+def get_cold_messages(db: Session, search: Optional[str] = None,
+                      via: Optional[str] = None, category: Optional[str] = None,
+                      sort_by: str = "created_at", sort_order: str = "desc"):
+    query = _filter_cold_messages(db.query(models.ColdMessage), search, via, category)
 
     sort_col = getattr(models.ColdMessage, sort_by, models.ColdMessage.created_at)
     if sort_order == "asc":
@@ -430,6 +492,23 @@ def get_cold_messages(db: Session, search: Optional[str] = None,
         query = query.order_by(sort_col.desc())
     return query.all()
 
+# Columns of the list views; the long text (message_body, notes) is only
+# loaded when a single message is opened
+COLD_MESSAGE_SUMMARY_COLUMNS = [
+    models.ColdMessage.__table__.c[name] for name in schemas.ColdMessageSummary.model_fields
+]
+
+def get_cold_message_page(db: Session, search: Optional[str] = None,
+                          via: Optional[str] = None, category: Optional[str] = None,
+                          sort_by: str = "created_at", sort_order: str = "desc",
+                          cursor: Optional[str] = None, limit: int = pagination.DEFAULT_PAGE_SIZE):
+    """One page of cold message summaries; raises ValueError for a bad cursor."""
+    query = _filter_cold_messages(db.query(*COLD_MESSAGE_SUMMARY_COLUMNS), search, via, category)
+    items, next_cursor = pagination.keyset_page(
+        db, query, models.ColdMessage, _sort_column(models.COLD_MESSAGE_SORT_KEYS, sort_by), sort_order, cursor, limit
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
 def get_cold_message(db: Session, msg_id: int):
     return db.query(models.ColdMessage).filter(models.ColdMessage.id == msg_id).first()
 
@@ -441,39 +520,26 @@ def update_cold_message(db: Session, msg_id: int, data: schemas.ColdMessageUpdat
     old_connection_id = db_msg.connection_id
     for field, value in updates.items():
         setattr(db_msg, field, value)
+    if "company_name" in updates:
+        db_msg.company_id = companies.get_or_create(db, db_msg.company_name)
+    if "connection_id" in updates:
+        if old_connection_id and old_connection_id != db_msg.connection_id:
+            _unlink_message(db, old_connection_id, msg_id)
+        if db_msg.connection_id:
+            _link_message(db, db_msg)
     db.commit()
     db.refresh(db_msg)
-    # Sync connection if connection_id changed
-    if "connection_id" in updates:
-        new_connection_id = updates["connection_id"]
-        # Reset old connection if it was pointing back at this message
-        if old_connection_id and old_connection_id != new_connection_id:
-            old_conn = get_connection(db, old_connection_id)
-            if old_conn and old_conn.cold_message_id == msg_id:
-                old_conn.cold_message_sent = False
-                old_conn.cold_message_id = None
-                db.commit()
-        # Set new connection
-        if new_connection_id:
-            new_conn = get_connection(db, new_connection_id)
-            if new_conn:
-                new_conn.cold_message_sent = True
-                new_conn.cold_message_id = db_msg.id
-                db.commit()
     return db_msg
 
 def delete_cold_message(db: Session, msg_id: int):
     db_msg = get_cold_message(db, msg_id)
     if not db_msg:
         return False
-    # Reset the linked connection if this was its primary message
-    if db_msg.connection_id:
-        db_conn = get_connection(db, db_msg.connection_id)
-        if db_conn and db_conn.cold_message_id == msg_id:
-            db_conn.cold_message_sent = False
-            db_conn.cold_message_id = None
-            db.commit()
+    connection_id = db_msg.connection_id
     db.delete(db_msg)
+    if connection_id:
+        db.flush()
+        _unlink_message(db, connection_id, msg_id)
     db.commit()
     return True
 
@@ -508,23 +574,22 @@ def create_connection(db: Session, connection: schemas.LinkedInConnectionCreate)
     data = connection.model_dump()
     if not data.get("requested_on"):
         data["requested_on"] = datetime.now()
+    data.update(normalize.connection_keys(data["contact_name"], data.get("company_name"), data.get("linkedin_profile_id")))
+    data["company_id"] = companies.get_or_create(db, data.get("company_name"))
     db_conn = models.LinkedInConnection(**data)
     db.add(db_conn)
     db.commit()
     db.refresh(db_conn)
     return db_conn
 
-def get_connections(
-    db: Session,
+def _filter_connections(
+    query,
     search: Optional[str] = None,
     status: Optional[str] = None,
     category: Optional[str] = None,
     cold_message_sent: Optional[bool] = None,
     stage: Optional[str] = None,
-    sort_by: str = "created_at",
-    sort_order: str = "desc",
 ):
-    query = db.query(models.LinkedInConnection)
     if search:
         term = f"%{search}%"
         query = query.filter(
@@ -543,6 +608,21 @@ def get_connections(
         query = query.filter(models.LinkedInConnection.cold_message_sent == cold_message_sent)
     if stage:
         query = query.filter(models.LinkedInConnection.stage == stage)
+    return query
+
+def get_connections(
+    db: Session,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    cold_message_sent: Optional[bool] = None,
+    stage: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+):
+    query = _filter_connections(
+        db.query(models.LinkedInConnection), search, status, category, cold_message_sent, stage
+    )
 
     sort_col = getattr(models.LinkedInConnection, sort_by, models.LinkedInConnection.created_at)
     if sort_order == "asc":
@@ -551,6 +631,35 @@ def get_connections(
         query = query.order_by(sort_col.desc())
     return query.all()
 
+NOTES_PREVIEW_LENGTH = 140
+
+CONNECTION_SUMMARY_COLUMNS = [
+    models.LinkedInConnection.__table__.c[name]
+    for name in schemas.LinkedInConnectionSummary.model_fields if name != "notes_preview"
+] + [func.substr(models.LinkedInConnection.notes, 1, NOTES_PREVIEW_LENGTH).label("notes_preview")]
+
+def get_connection_page(
+    db: Session,
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    cold_message_sent: Optional[bool] = None,
+    stage: Optional[str] = None,
+    sort_by: str = "created_at",
+    sort_order: str = "desc",
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+):
+    """One page of connection summaries; raises ValueError for a bad cursor."""
+    query = _filter_connections(
+        db.query(*CONNECTION_SUMMARY_COLUMNS), search, status, category, cold_message_sent, stage
+    )
+    items, next_cursor = pagination.keyset_page(
+        db, query, models.LinkedInConnection, _sort_column(models.CONNECTION_SORT_KEYS, sort_by),
+        sort_order, cursor, limit,
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
 def get_connection(db: Session, conn_id: int):
     return db.query(models.LinkedInConnection).filter(models.LinkedInConnection.id == conn_id).first()
 
@@ -562,27 +671,55 @@ def check_connection_duplicate(
     linkedin_profile_id: Optional[str] = None,
 ) -> Optional[models.LinkedInConnection]:
     """Check if a matching connection already exists.
-    Matches on name (required) + company (if provided) + LinkedIn URL (if provided).
+    Matches on name (required) + company (if provided) + LinkedIn URL (if provided),
+    compared through the normalised key columns.
     Returns the existing record or None.
     """
+    keys = normalize.connection_keys(contact_name, company_name, linkedin_profile_id)
     query = db.query(models.LinkedInConnection).filter(
-        func.lower(models.LinkedInConnection.contact_name) == contact_name.lower()
+        models.LinkedInConnection.name_key == keys["name_key"]
     )
-    if company_name:
-        query = query.filter(
-            func.lower(models.LinkedInConnection.company_name) == company_name.lower()
-        )
-    if linkedin_profile_id:
-        # Normalize by stripping trailing slashes for comparison
-        normalized = linkedin_profile_id.rstrip('/')
-        query = query.filter(
-            or_(
-                func.lower(models.LinkedInConnection.linkedin_profile_id) == normalized.lower(),
-                func.lower(models.LinkedInConnection.linkedin_profile_id) == (normalized.lower() + '/'),
-            )
-        )
+    if keys["company_key"]:
+        query = query.filter(models.LinkedInConnection.company_key == keys["company_key"])
+    if keys["linkedin_slug"]:
+        query = query.filter(models.LinkedInConnection.linkedin_slug == keys["linkedin_slug"])
     return query.first()
 
+# Keeps IN lists under SQLite's bound-parameter limit
+_DUPLICATE_CHECK_CHUNK = 500
+
+def check_connection_duplicates(db: Session, candidates: List[schemas.ConnectionCandidate]) -> List[Optional[int]]:
+    """Batch version of check_connection_duplicate: the id of an existing match
+    (or None) for each candidate, in order. One indexed query per 500 names."""
+    candidate_keys = [normalize.connection_keys(c.name, c.company, c.linkedin_url) for c in candidates]
+    name_keys = sorted({k["name_key"] for k in candidate_keys if k["name_key"]})
+
+    existing = defaultdict(list)
+    for start in range(0, len(name_keys), _DUPLICATE_CHECK_CHUNK):
+        rows = db.query(
+            models.LinkedInConnection.id,
+            models.LinkedInConnection.name_key,
+            models.LinkedInConnection.company_key,
+            models.LinkedInConnection.linkedin_slug,
+        ).filter(
+            models.LinkedInConnection.name_key.in_(name_keys[start:start + _DUPLICATE_CHECK_CHUNK])
+        ).order_by(models.LinkedInConnection.id).all()
+        for row in rows:
+            existing[row.name_key].append(row)
+
+    matches = []
+    for keys in candidate_keys:
+        match = None
+        for row in existing.get(keys["name_key"], []):
+            if keys["company_key"] and row.company_key != keys["company_key"]:
+                continue
+            if keys["linkedin_slug"] and row.linkedin_slug != keys["linkedin_slug"]:
+                continue
+            match = row.id
+            break
+        matches.append(match)
+    return matches
+
 def update_connection(db: Session, conn_id: int, data: schemas.LinkedInConnectionUpdate):
     db_conn = get_connection(db, conn_id)
     if not db_conn:
@@ -593,6 +730,12 @@ def update_connection(db: Session, conn_id: int, data: schemas.LinkedInConnectio
         updates["accepted_on"] = datetime.now()
     for field, value in updates.items():
         setattr(db_conn, field, value)
+    for field, value in normalize.connection_keys(
+        db_conn.contact_name, db_conn.company_name, db_conn.linkedin_profile_id
+    ).items():
+        setattr(db_conn, field, value)
+    if "company_name" in updates:
+        db_conn.company_id = companies.get_or_create(db, db_conn.company_name)
     db.commit()
     db.refresh(db_conn)
     return db_conn
@@ -601,6 +744,10 @@ def delete_connection(db: Session, conn_id: int):
     db_conn = get_connection(db, conn_id)
     if not db_conn:
         return False
+    # Unlink its cold messages in the same transaction
+    db.query(models.ColdMessage).filter(models.ColdMessage.connection_id == conn_id).update(
+        {models.ColdMessage.connection_id: None}, synchronize_session=False
+    )
     db.delete(db_conn)
     db.commit()
     return True
@@ -646,3 +793,206 @@ def get_connection_stats(db: Session):
 def get_all_connections_for_export(db: Session):
     return db.query(models.LinkedInConnection).order_by(models.LinkedInConnection.created_at.desc()).all()
 
+
+# ─── Due Queue ───────────────────────────────────────────────────────
+
+DUE_KINDS = ("deadline", "follow_up", "interview")  # also the order of items due at the same time
+DEADLINE_STATUSES = ("Saved", "To Apply")  # a deadline no longer matters once applied
+
+def _due_sources():
+    """(kind, model, date column, title column, detail column, filters) of each dated item."""
+    app, conn = models.JobApplication, models.LinkedInConnection
+    return [
+        ("deadline", app, app.application_deadline, app.job_title, app.status,
+         [app.is_archived == 0, app.status.in_(DEADLINE_STATUSES)]),
+        ("follow_up", conn, conn.follow_up_date, conn.contact_name, conn.connection_status, []),
+        ("interview", app, app.interview_date, app.job_title, app.status, [app.is_archived == 0]),
+    ]
+
+def _decode_due_cursor(cursor: str):
+    due, kind, row_id = pagination.decode_token(cursor, 3)
+    if kind not in DUE_KINDS or not isinstance(row_id, int) or not isinstance(due, str):
+        raise ValueError("Invalid cursor")
+    return datetime.fromisoformat(due), kind, row_id
+
+def get_due_items(db: Session, days: int = 7, overdue: bool = False, cursor: Optional[str] = None,
+                  limit: int = pagination.DEFAULT_PAGE_SIZE, now: Optional[datetime] = None):
+    """Deadlines, follow-ups and interviews from today to days ahead, earliest first.
+
+    With overdue, earlier items are included too. Each source is an index
+    range scan on its date column that stops after limit + 1 rows, and the
+    three sorted streams are merged here, so a page costs the same however
+    much history there is. Raises ValueError for a bad cursor.
+    """
+    limit = max(1, min(limit, pagination.MAX_PAGE_SIZE))
+    today = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    end = today + timedelta(days=max(days, 0) + 1)
+    after = _decode_due_cursor(cursor) if cursor else None
+
+    streams = []
+    for kind, model, column, title, detail, filters in _due_sources():
+        query = db.query(
+            column.label("due"), model.id, title.label("title"),
+            model.company_name, model.company_id, detail.label("detail"),
+        ).filter(column.isnot(None), column < end, *filters)
+        if not overdue:
+            query = query.filter(column >= today)
+        if after:
+            after_due, after_kind, after_id = after
+            if kind < after_kind:
+                query = query.filter(column > after_due)
+            elif kind == after_kind:
+                query = query.filter(or_(column > after_due, and_(column == after_due, model.id > after_id)))
+            else:
+                query = query.filter(column >= after_due)
+        rows = query.order_by(column, model.id).limit(limit + 1).all()
+        streams.append([dict(row._mapping, kind=kind) for row in rows])
+
+    merged = list(heapq.merge(*streams, key=lambda item: (item["due"], item["kind"], item["id"])))
+    items = merged[:limit]
+    next_cursor = None
+    if len(merged) > limit:
+        last = items[-1]
+        next_cursor = pagination.encode_token([last["due"], last["kind"], last["id"]])
+    return {"items": items, "next_cursor": next_cursor}
+
+
+# ─── Saved Views ─────────────────────────────────────────────────────
+# Each view's matching application ids are materialized in
+# saved_view_members. Every write to an application re-checks it against
+# the views in the same transaction, so opening a view is an index scan on
+# its members and its badge count is a column read.
+
+def _view_filter_args(filters: dict) -> dict:
+    return {
+        "status": filters.get("status"),
+        "domain": filters.get("domain"),
+        "search": filters.get("search"),
+        "work_type": filters.get("work_type"),
+        "tags": filters.get("tags"),
+        "include_archived": bool(filters.get("include_archived")),
+    }
+
+def _view_query(db: Session, filters: dict):
+    columns = [models.JobApplication.id]
+    if filters.get("status_stage"):
+        columns += [models.JobApplication.status, models.JobApplication.status_history]
+    return _filter_applications(db.query(*columns), **_view_filter_args(filters))
+
+def _materialize_view(db: Session, view: models.SavedView):
+    """Rebuild a view's members from scratch; joins the caller's transaction."""
+    filters = view.filters or {}
+    ids = [
+        row.id for row in _view_query(db, filters)
+        if _rejection_stage_matches(row, filters.get("status_stage"))
+    ]
+    db.query(models.SavedViewMember).filter(models.SavedViewMember.view_id == view.id).delete(
+        synchronize_session=False
+    )
+    if ids:
+        db.execute(insert(models.SavedViewMember), [{"view_id": view.id, "application_id": i} for i in ids])
+    view.match_count = len(ids)
+
+def _sync_saved_views(db: Session, application_id: int, deleted: bool = False):
+    """Add or remove one application from the views it now does or doesn't match.
+
+    Called by the write paths before they commit, so members and counts
+    change in the same transaction as the application.
+    """
+    views = db.query(models.SavedView).filter(models.SavedView.match_count.isnot(None)).all()
+    if not views:
+        return
+    db.flush()  # the sessions don't autoflush
+    member_of = {
+        view_id for (view_id,) in db.query(models.SavedViewMember.view_id)
+        .filter(models.SavedViewMember.application_id == application_id)
+    }
+    for view in views:
+        matches = False
+        if not deleted:
+            filters = view.filters or {}
+            row = _view_query(db, filters).filter(models.JobApplication.id == application_id).first()
+            matches = row is not None and _rejection_stage_matches(row, filters.get("status_stage"))
+        if matches == (view.id in member_of):
+            continue
+        if matches:
+            db.add(models.SavedViewMember(view_id=view.id, application_id=application_id))
+        else:
+            db.query(models.SavedViewMember).filter(
+                models.SavedViewMember.view_id == view.id,
+                models.SavedViewMember.application_id == application_id,
+            ).delete(synchronize_session=False)
+        # Relative update, so concurrent writers don't lose each other's changes
+        db.query(models.SavedView).filter(models.SavedView.id == view.id).update(
+            {models.SavedView.match_count: models.SavedView.match_count + (1 if matches else -1)},
+            synchronize_session=False,
+        )
+
+def invalidate_saved_views(db: Session):
+    """Have every view rebuilt when next read, after a bulk write that skipped
+    _sync_saved_views; joins the caller's transaction."""
+    db.query(models.SavedView).update({models.SavedView.match_count: None}, synchronize_session=False)
+
+def _refresh_stale_views(db: Session, views: List[models.SavedView]):
+    stale = [view for view in views if view.match_count is None]
+    for view in stale:
+        _materialize_view(db, view)
+    if stale:
+        db.commit()
+
+def get_saved_views(db: Session) -> List[models.SavedView]:
+    views = db.query(models.SavedView).order_by(models.SavedView.name, models.SavedView.id).all()
+    _refresh_stale_views(db, views)
+    return views
+
+def get_saved_view(db: Session, view_id: int) -> Optional[models.SavedView]:
+    view = db.query(models.SavedView).filter(models.SavedView.id == view_id).first()
+    if view is not None:
+        _refresh_stale_views(db, [view])
+    return view
+
+def get_saved_view_applications(db: Session, view_id: int, skip: int = 0, limit: int = 100):
+    """The applications in a view, in its sort order; None if there's no such view."""
+    view = get_saved_view(db, view_id)
+    if view is None:
+        return None
+    query = (
+        db.query(models.JobApplication)
+        .join(models.SavedViewMember, models.SavedViewMember.application_id == models.JobApplication.id)
+        .filter(models.SavedViewMember.view_id == view_id)
+    )
+    query = _sort_applications(query, view.sort_by or "created_at", view.sort_order or "desc")
+    return query.offset(skip).limit(limit).all()
+
+def create_saved_view(db: Session, view: schemas.SavedViewCreate):
+    db_view = models.SavedView(**view.model_dump())
+    db.add(db_view)
+    db.flush()
+    _materialize_view(db, db_view)
+    db.commit()
+    db.refresh(db_view)
+    return db_view
+
+def update_saved_view(db: Session, view_id: int, data: schemas.SavedViewUpdate):
+    db_view = db.query(models.SavedView).filter(models.SavedView.id == view_id).first()
+    if not db_view:
+        return None
+    update_data = data.model_dump(exclude_unset=True)
+    for field, value in update_data.items():
+        setattr(db_view, field, value)
+    if "filters" in update_data or db_view.match_count is None:
+        _materialize_view(db, db_view)
+    db.commit()
+    db.refresh(db_view)
+    return db_view
+
+def delete_saved_view(db: Session, view_id: int):
+    db_view = db.query(models.SavedView).filter(models.SavedView.id == view_id).first()
+    if not db_view:
+        return False
+    db.query(models.SavedViewMember).filter(models.SavedViewMember.view_id == view_id).delete(
+        synchronize_session=False
+    )
+    db.delete(db_view)
+    db.commit()
+    return True
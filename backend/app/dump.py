@@ -0,0 +1,144 @@
+"""
+Backend-neutral snapshots: the live database to and from SQLite backup files.
+
+Backups are always SQLite files, whatever the live database is: previews,
+merges, scheduled snapshots and incremental backups all work on that format.
+On SQLite the snapshot comes from the backup API (see backup.py); on other
+backends (PostgreSQL) the rows are copied through SQLAlchemy into a new SQLite
+file, and a restore loads a backup file back in a single transaction.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy import JSON, Integer, MetaData, create_engine, func, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.pool import NullPool
+
+from . import backup, models
+from .database import DB_PATH, IS_SQLITE, engine
+
+BATCH_SIZE = 1000
+
+
+def _sqlite_engine(path: str):
+    return create_engine(f"sqlite:///{path}", poolclass=NullPool)
+
+
+def _transfer_tables():
+    """The app tables, with JSON columns keeping SQL NULL as NULL (not 'null')."""
+    metadata = MetaData()
+    for table in models.Base.metadata.sorted_tables:
+        copy = table.to_metadata(metadata)
+        for column in copy.columns:
+            if isinstance(column.type, JSON):
+                column.type = JSON(none_as_null=True)
+    return metadata.sorted_tables
+
+
+def _has_serial_id(table) -> bool:
+    key = list(table.primary_key.columns)
+    return len(key) == 1 and key[0].name == "id" and isinstance(key[0].type, Integer)
+
+
+def _copy_rows(src: Connection, dest: Connection):
+    for table in _transfer_tables():
+        result = src.execution_options(stream_results=True, yield_per=BATCH_SIZE).execute(
+            table.select().order_by(*table.primary_key.columns)
+        )
+        for batch in result.partitions():
+            dest.execute(table.insert(), [dict(row._mapping) for row in batch])
+
+
+def _use_utc(conn: Connection):
+    # SQLite stores timestamps without an offset, so exchange them as UTC
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SET LOCAL TIME ZONE 'UTC'"))
+
+
+def dump_database(conn: Connection, dest_path: str) -> str:
+    """Copy every table visible to conn into a new SQLite file at dest_path.
+
+    Run it inside a REPEATABLE READ transaction (or holding table locks) so
+    all tables come from the same point in time.
+    """
+    _use_utc(conn)
+    target = _sqlite_engine(dest_path)
+    try:
+        models.Base.metadata.create_all(target)
+        with target.begin() as out:
+            _copy_rows(conn, out)
+    finally:
+        target.dispose()
+    return dest_path
+
+
+def load_database(conn: Connection, src_path: str):
+    """Replace every table's rows with those of the SQLite backup at src_path.
+
+    Runs in the caller's transaction; the backup must already be migrated to
+    the current schema.
+    """
+    _use_utc(conn)
+    tables = models.Base.metadata.sorted_tables
+    for table in reversed(tables):
+        conn.execute(table.delete())
+    source = _sqlite_engine(src_path)
+    try:
+        with source.connect() as src:
+            _copy_rows(src, conn)
+    finally:
+        source.dispose()
+    if conn.dialect.name == "postgresql":
+        # Rows keep their original ids, so move each id sequence past them;
+        # tables keyed by other columns (e.g. saved_view_members) have none
+        for table in tables:
+            if not _has_serial_id(table):
+                continue
+            max_id = conn.execute(select(func.max(table.c.id))).scalar() or 0
+            conn.execute(
+                text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :value, :called)"),
+                {"table": table.name, "value": max(max_id, 1), "called": max_id > 0},
+            )
+
+
+def lock_tables(conn: Connection, mode: str):
+    """Take a PostgreSQL table lock on every app table for this transaction."""
+    names = ", ".join(conn.dialect.identifier_preparer.quote(t.name) for t in models.Base.metadata.sorted_tables)
+    conn.execute(text(f"LOCK TABLE {names} IN {mode} MODE"))
+
+
+def snapshot_to_tempfile(dir: Optional[str] = None, db_path: Optional[str] = None) -> str:
+    """Snapshot the live database into a new temporary SQLite file; the caller removes it.
+
+    db_path selects another SQLite database (e.g. a user's, see database.tenant_db_path).
+    """
+    if IS_SQLITE or db_path:
+        return backup.snapshot_to_tempfile(db_path or DB_PATH, dir=dir)
+    fd, tmp_path = tempfile.mkstemp(suffix=".db", prefix="job_tracker_snapshot_", dir=dir)
+    os.close(fd)
+    try:
+        with engine.connect().execution_options(isolation_level="REPEATABLE READ") as conn:
+            with conn.begin():
+                return dump_database(conn, tmp_path)
+    except Exception:
+        os.remove(tmp_path)
+        raise
+
+
+@contextmanager
+def database_file(db_path: Optional[str] = None) -> Iterator[str]:
+    """Path of a SQLite file holding the current data, for read-only use.
+
+    That is the live file itself on SQLite (db_path if given), and a temporary
+    snapshot elsewhere.
+    """
+    if IS_SQLITE or db_path:
+        yield db_path or DB_PATH
+        return
+    path = snapshot_to_tempfile()
+    try:
+        yield path
+    finally:
+        os.remove(path)
@@ -0,0 +1,177 @@
+"""
+Near-duplicate job applications: the same posting saved twice.
+
+Two applications are duplicates when their job URLs are the same posting
+(normalize.job_url_key, stored in the indexed job_url_key column), or when
+they are at the same company and their titles, and job descriptions where
+both have one, are similar enough:
+
+- titles are compared as sets of character trigrams, descriptions as sets
+  of word 3-shingles, both by Jaccard similarity;
+- score = title similarity, or the mean of title and description similarity.
+
+Candidates are blocked by company (company_id, see companies.py), so a
+single check only reads one company's applications. The batch report
+additionally uses prefix filtering within each company: with every title's
+trigrams sorted rarest first, two titles can only reach TITLE_THRESHOLD if
+they share one of the first |t| - ceil(TITLE_THRESHOLD * |t|) + 1 trigrams,
+so only pairs sharing such a rare trigram are ever scored, not every pair.
+"""
+import math
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from . import companies, models, normalize
+
+TITLE_THRESHOLD = 0.5
+DUPLICATE_THRESHOLD = 0.6
+SHINGLE_SIZE = 3
+_ID_CHUNK = 500
+
+_SUMMARY_COLUMNS = (
+    models.JobApplication.id,
+    models.JobApplication.company_id,
+    models.JobApplication.company_name,
+    models.JobApplication.job_title,
+    models.JobApplication.job_url,
+    models.JobApplication.job_url_key,
+    models.JobApplication.status,
+)
+
+
+def title_grams(title: Optional[str]) -> Set[str]:
+    key = normalize.title_key(title)
+    return companies.ngrams(key) if key else set()
+
+
+def description_shingles(text: Optional[str]) -> Set[Tuple[str, ...]]:
+    words = (normalize.title_key(text) or "").split()
+    if len(words) < SHINGLE_SIZE:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set, b: Set) -> float:
+    if not a or not b:
+        return 0.0
+    shared = len(a & b)
+    return shared / (len(a) + len(b) - shared)
+
+
+def score(title_similarity: float, a_description: Set, b_description: Set) -> float:
+    if a_description and b_description:
+        return (title_similarity + jaccard(a_description, b_description)) / 2
+    return title_similarity
+
+
+def _summary(row) -> dict:
+    return {
+        "id": row.id,
+        "company_name": row.company_name,
+        "job_title": row.job_title,
+        "status": row.status,
+        "job_url": row.job_url,
+    }
+
+
+def _descriptions(db: Session, ids: Iterable[int]) -> Dict[int, Set]:
+    """Description shingles of the given applications, loaded in chunks."""
+    ids = list(ids)
+    shingles = {}
+    for start in range(0, len(ids), _ID_CHUNK):
+        rows = db.query(models.JobApplication.id, models.JobApplication.job_description).filter(
+            models.JobApplication.id.in_(ids[start:start + _ID_CHUNK])
+        )
+        for row_id, text in rows:
+            shingles[row_id] = description_shingles(text)
+    return shingles
+
+
+def find_matches(db: Session, company_name: str, job_title: str, job_url: Optional[str] = None,
+                 job_description: Optional[str] = None, exclude_id: Optional[int] = None,
+                 limit: int = 10) -> List[dict]:
+    """Existing applications that look like the same posting, most similar first."""
+    matches: Dict[int, dict] = {}
+    url_key = normalize.job_url_key(job_url)
+    if url_key:
+        for row in db.query(*_SUMMARY_COLUMNS).filter(models.JobApplication.job_url_key == url_key):
+            matches[row.id] = dict(_summary(row), score=1.0, reason="same_url")
+
+    key = normalize.company_key(company_name)
+    company = db.query(models.Company.id).filter(models.Company.normalized_name == key).first() if key else None
+    if company is not None:
+        grams = title_grams(job_title)
+        similar = []
+        for row in db.query(*_SUMMARY_COLUMNS).filter(models.JobApplication.company_id == company.id):
+            similarity = jaccard(grams, title_grams(row.job_title))
+            if row.id not in matches and similarity >= TITLE_THRESHOLD:
+                similar.append((row, similarity))
+        descriptions = _descriptions(db, [row.id for row, _ in similar]) if job_description else {}
+        new_description = description_shingles(job_description)
+        for row, similarity in similar:
+            value = score(similarity, new_description, descriptions.get(row.id, set()))
+            if value >= DUPLICATE_THRESHOLD:
+                matches[row.id] = dict(_summary(row), score=round(value, 3), reason="similar")
+
+    matches.pop(exclude_id, None)
+    return sorted(matches.values(), key=lambda m: (-m["score"], m["id"]))[:limit]
+
+
+def _similar_titles(rows: List) -> List[Tuple[int, int, float]]:
+    """(id, id, title similarity) of the pairs in one company reaching TITLE_THRESHOLD."""
+    grams = {row.id: title_grams(row.job_title) for row in rows}
+    frequency = Counter(gram for gs in grams.values() for gram in gs)
+    index: Dict[str, List[int]] = defaultdict(list)
+    pairs = []
+    for row_id in sorted(grams, key=lambda i: len(grams[i])):
+        ordered = sorted(grams[row_id], key=lambda g: (frequency[g], g))
+        prefix = ordered[:len(ordered) - math.ceil(TITLE_THRESHOLD * len(ordered)) + 1]
+        candidates = {other for gram in prefix for other in index[gram]}
+        for other in candidates:
+            similarity = jaccard(grams[row_id], grams[other])
+            if similarity >= TITLE_THRESHOLD:
+                pairs.append((min(row_id, other), max(row_id, other), similarity))
+        for gram in prefix:
+            index[gram].append(row_id)
+    return pairs
+
+
+def find_all(db: Session, include_archived: bool = True) -> List[dict]:
+    """Every pair of likely duplicate applications, most similar first."""
+    query = db.query(*_SUMMARY_COLUMNS)
+    if not include_archived:
+        query = query.filter(models.JobApplication.is_archived == 0)
+    rows = {row.id: row for row in query}
+
+    found: Dict[Tuple[int, int], dict] = {}
+    by_url = defaultdict(list)
+    by_company = defaultdict(list)
+    for row in rows.values():
+        if row.job_url_key:
+            by_url[row.job_url_key].append(row.id)
+        by_company[row.company_id or normalize.company_key(row.company_name)].append(row)
+
+    for ids in by_url.values():
+        ids.sort()
+        for i, first in enumerate(ids):
+            for second in ids[i + 1:]:
+                found[(first, second)] = {"score": 1.0, "reason": "same_url"}
+
+    similar = []
+    for block in by_company.values():
+        if len(block) > 1:
+            similar.extend(pair for pair in _similar_titles(block) if pair[:2] not in found)
+    descriptions = _descriptions(db, {i for pair in similar for i in pair[:2]})
+    for first, second, similarity in similar:
+        value = score(similarity, descriptions.get(first, set()), descriptions.get(second, set()))
+        if value >= DUPLICATE_THRESHOLD:
+            found[(first, second)] = {"score": round(value, 3), "reason": "similar"}
+
+    pairs = [
+        {"first": _summary(rows[first]), "second": _summary(rows[second]), **result}
+        for (first, second), result in found.items()
+    ]
+    pairs.sort(key=lambda p: (-p["score"], p["first"]["id"], p["second"]["id"]))
+    return pairs
@@ -0,0 +1,169 @@
+"""
+Excel export of applications, cold messages and LinkedIn connections.
+
+pandas and openpyxl are slow to import, so this module is only imported by
+the export endpoint when it is called, keeping them out of worker start-up.
+"""
+import json
+from io import BytesIO
+
+import pandas as pd
+from openpyxl.styles import PatternFill, Font, Alignment
+from sqlalchemy.orm import Session
+
+from . import crud
+
+
+def build_workbook(db: Session) -> BytesIO:
+    """Return the multi-sheet .xlsx export, positioned at the start."""
+    applications = crud.get_all_applications_for_export(db)
+    cold_messages = crud.get_cold_messages(db)
+
+    # ── Sheet 1: Job Applications ────────────────────────────────────────
+    apps_data = []
+    for app in applications:
+        # Derive latest rejection stage from status_history
+        rejection_stage = ""
+        try:
+            history = app.status_history if isinstance(app.status_history, list) else json.loads(app.status_history or "[]")
+            for entry in reversed(history):
+                if entry.get("stage"):
+                    rejection_stage = entry["stage"]
+                    break
+        except Exception:
+            pass
+
+        tags_raw = app.tags
+        if isinstance(tags_raw, str):
+            try:
+                tags_raw = json.loads(tags_raw)
+            except Exception:
+                tags_raw = []
+        tags_str = ", ".join(tags_raw) if tags_raw else ""
+
+        # Networking contacts (JSON list of {name, linkedin_url, ...})
+        net_contacts = app.networking_contacts or []
+        if isinstance(net_contacts, str):
+            try:
+                net_contacts = json.loads(net_contacts)
+            except Exception:
+                net_contacts = []
+        net_contacts_str = "; ".join(
+            f"{c.get('name', '')} ({c.get('linkedin_url', c.get('email', ''))})".strip("()")
+            for c in net_contacts if isinstance(c, dict)
+        ) if net_contacts else ""
+
+        apps_data.append({
+            "ID": app.id,
+            "Company Name": app.company_name,
+            "Job Title": app.job_title,
+            "Domain": app.domain or "",
+            "Location": app.location or "",
+            "Work Type": app.work_type or "",
+            "Applied On (Portal)": app.applied_on or "",
+            "Status": app.status,
+            "Rejection Stage": rejection_stage,
+            "Application Date": app.application_date.strftime("%Y-%m-%d") if app.application_date else "",
+            "Application Deadline": app.application_deadline.strftime("%Y-%m-%d") if app.application_deadline else "",
+            "Interview Date": app.interview_date.strftime("%Y-%m-%d") if app.interview_date else "",
+            "Salary Min": app.salary_min or "",
+            "Salary Max": app.salary_max or "",
+            "Tags": tags_str,
+            "Job URL": app.job_url or "",
+            "Contact Person": app.contact_person or "",
+            "Contact Email": app.contact_email or "",
+            "Contact LinkedIn": app.contact_linkedin or "",
+            "Cold Outreach Sent": "Yes" if app.contact_cold_message_sent else "No",
+            "Cold Outreach Via": app.contact_cold_message_via or "",
+            "Cold Contact Category": app.contact_cold_contact_category or "",
+            "Cold Contact Email": app.contact_cold_contact_email or "",
+            "Cold Message Body": app.contact_cold_message_body or "",
+            "Networking Contacts": net_contacts_str,
+            "References": app.references or "",
+            "CV Uploaded": "Yes" if app.cv_filename else "No",
+            "Cover Letter Uploaded": "Yes" if app.coverletter_filename else "No",
+            "Interview Notes": app.interview_notes or "",
+            "Interview Questions": app.interview_questions or "",
+            "Notes": app.notes or "",
+            "Job Description": app.job_description or "",
+            "Archived": "Yes" if app.is_archived else "No",
+            "Created At": app.created_at.strftime("%Y-%m-%d") if app.created_at else "",
+            "Updated At": app.updated_at.strftime("%Y-%m-%d") if app.updated_at else "",
+        })
+
+    # ── Sheet 2: Cold Messages ───────────────────────────────────────────
+    cm_data = []
+    for msg in cold_messages:
+        cm_data.append({
+            "ID": msg.id,
+            "Contact Name": msg.contact_name,
+            "Company": msg.company_name or "",
+            "Contact Email": msg.contact_email or "",
+            "Contact LinkedIn": msg.contact_linkedin or "",
+            "Via": msg.via,
+            "Category": msg.category or "",
+            "Subject": msg.subject or "",
+            "Message Body": msg.message_body or "",
+            "Sent Date": msg.sent_date.strftime("%Y-%m-%d") if msg.sent_date else "",
+            "Got Reply": "Yes" if msg.got_reply else "No",
+            "Linked Connection ID": msg.connection_id or "",
+            "Notes": msg.notes or "",
+            "Created At": msg.created_at.strftime("%Y-%m-%d") if msg.created_at else "",
+            "Updated At": msg.updated_at.strftime("%Y-%m-%d") if msg.updated_at else "",
+        })
+
+    # ── Build Excel ──────────────────────────────────────────────────────
+    output = BytesIO()
+    header_fill = PatternFill(start_color="1E3A5F", end_color="1E3A5F", fill_type="solid")
+    header_font = Font(color="FFFFFF", bold=True)
+    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
+
+    def style_sheet(ws, df):
+        for idx, col in enumerate(df.columns):
+            col_letter = ws.cell(row=1, column=idx + 1).column_letter
+            cell = ws.cell(row=1, column=idx + 1)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_align
+            max_len = max(df[col].astype(str).apply(len).max() if not df.empty else 0, len(col))
+            ws.column_dimensions[col_letter].width = min(max_len + 3, 60)
+        ws.row_dimensions[1].height = 20
+
+    with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        df_apps = pd.DataFrame(apps_data) if apps_data else pd.DataFrame(columns=list(apps_data[0].keys()) if apps_data else [])
+        df_apps.to_excel(writer, sheet_name='Job Applications', index=False)
+        style_sheet(writer.sheets['Job Applications'], df_apps)
+
+        df_cm = pd.DataFrame(cm_data) if cm_data else pd.DataFrame(columns=["ID","Contact Name","Company","Contact Email","Contact LinkedIn","Via","Category","Subject","Message Body","Sent Date","Got Reply","Linked Connection ID","Notes","Created At","Updated At"])
+        df_cm.to_excel(writer, sheet_name='Cold Messages', index=False)
+        style_sheet(writer.sheets['Cold Messages'], df_cm)
+
+        # ── Sheet 3: LinkedIn Connections ────────────────────────────────────
+        connections = crud.get_all_connections_for_export(db)
+        conn_data = [
+            {
+                "ID": c.id,
+                "Contact Name": c.contact_name,
+                "Company": c.company_name or "",
+                "LinkedIn Profile": c.linkedin_profile_id or "",
+                "Category": c.category or "",
+                "Stage": c.stage or "Requested",
+                "Status": c.connection_status,
+                "Cold Message Sent": "Yes" if c.cold_message_sent else "No",
+                "Linked Cold Message ID": c.cold_message_id or "",
+                "Requested On": c.requested_on.strftime("%Y-%m-%d") if c.requested_on else "",
+                "Accepted On": c.accepted_on.strftime("%Y-%m-%d") if c.accepted_on else "",
+                "Follow Up Date": c.follow_up_date.strftime("%Y-%m-%d") if c.follow_up_date else "",
+                "Notes": c.notes or "",
+                "Created At": c.created_at.strftime("%Y-%m-%d") if c.created_at else "",
+                "Updated At": c.updated_at.strftime("%Y-%m-%d") if c.updated_at else "",
+            }
+            for c in connections
+        ]
+        conn_cols = ["ID","Contact Name","Company","LinkedIn Profile","Category","Stage","Status","Cold Message Sent","Linked Cold Message ID","Requested On","Accepted On","Follow Up Date","Notes","Created At","Updated At"]
+        df_conn = pd.DataFrame(conn_data) if conn_data else pd.DataFrame(columns=conn_cols)
+        df_conn.to_excel(writer, sheet_name='LinkedIn Connections', index=False)
+        style_sheet(writer.sheets['LinkedIn Connections'], df_conn)
+
+    output.seek(0)
+    return output
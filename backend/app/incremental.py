@@ -0,0 +1,391 @@
+"""
+Incremental backups with a row-hash manifest.
+
+Each backup run snapshots the database, hashes every row and compares the
+hashes with the manifest left by the previous run. Only changed / new rows
+(plus the keys of deleted ones) are written to the new backup, and uploaded
+files are stored once in a content-addressed object store. A backup is
+restored by replaying its chain: the last full backup followed by every
+incremental one up to the requested point.
+
+Layout under the backup root (backups/incremental by default):
+
+    state.json.gz              manifest of the newest backup (row + upload hashes)
+    objects/<ab>/<sha256>      uploaded files, stored once per content
+    <backup id>/meta.json      kind, parent, schema, per-table columns and deletions
+    <backup id>/rows.jsonl.gz  changed rows, one JSON list per line
+
+Like backup.py this only needs the standard library, so it can run from
+incremental_backup.py without the app's dependencies.
+"""
+import base64
+import gzip
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from . import backup
+from .backup import quote_identifier as _quote
+
+INCREMENTAL_ROOT = os.path.join("backups", "incremental")
+STATE_FILE = "state.json.gz"
+OBJECTS_DIR = "objects"
+
+
+# ─── Helpers ─────────────────────────────────────────────────────────
+
+def _encode(value):
+    if isinstance(value, bytes):
+        return {"$b64": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def _decode(value):
+    if isinstance(value, dict) and "$b64" in value:
+        return base64.b64decode(value["$b64"])
+    return value
+
+
+def _read_json(path: str):
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data):
+    # Write then rename so a crash never leaves a truncated manifest behind
+    tmp_path = path + ".tmp"
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+def _new_backup_id(root: str) -> str:
+    base = datetime.now().strftime("%Y%m%d_%H%M%S")
+    backup_id, n = base, 1
+    while os.path.exists(os.path.join(root, backup_id)):
+        n += 1
+        backup_id = f"{base}_{n}"
+    return backup_id
+
+
+def _user_tables(conn: sqlite3.Connection) -> Dict[str, List[str]]:
+    """Tables and the columns identifying their rows: id, or else the primary key.
+
+    Tables with neither, and SQLite internals, are skipped.
+    """
+    tables = {}
+    for (name,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+    ):
+        info = list(conn.execute(f"PRAGMA table_info({_quote(name)})"))
+        if any(row[1] == "id" for row in info):
+            tables[name] = ["id"]
+        elif any(row[5] for row in info):
+            # Composite keys, e.g. saved_view_members (view_id, application_id)
+            tables[name] = [row[1] for row in sorted(info, key=lambda row: row[5]) if row[5]]
+    return tables
+
+
+def _row_key(key: List[str], values: list) -> str:
+    # Plain ids stay "123" so manifests written before composite keys still match
+    if key == ["id"]:
+        return str(values[0])
+    return json.dumps([_encode(v) for v in values], separators=(",", ":"))
+
+
+def _schema_sql(conn: sqlite3.Connection) -> List[str]:
+    rows = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%' "
+        "ORDER BY CASE type WHEN 'table' THEN 0 ELSE 1 END, name"
+    )
+    return [sql for (sql,) in rows]
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(backup.CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _object_path(root: str, sha: str) -> str:
+    return os.path.join(root, OBJECTS_DIR, sha[:2], sha)
+
+
+def _iter_upload_files(upload_root: str) -> Iterator[os.DirEntry]:
+    stack = [upload_root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name != ".gitkeep":
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+# ─── Creating backups ────────────────────────────────────────────────
+
+def _diff_uploads(root: str, upload_root: str, previous: Dict[str, Dict]) -> Dict:
+    """Store new upload contents and return the upload manifest and changes."""
+    manifest = {}
+    changed = {}
+    new_objects = 0
+    for entry in _iter_upload_files(upload_root):
+        rel = os.path.relpath(entry.path, upload_root).replace(os.sep, "/")
+        stat = entry.stat()
+        prev = previous.get(rel)
+        if prev and prev["size"] == stat.st_size and prev["mtime"] == stat.st_mtime:
+            sha = prev["sha"]  # unchanged, skip re-hashing
+        else:
+            sha = _file_sha256(entry.path)
+        manifest[rel] = {"sha": sha, "size": stat.st_size, "mtime": stat.st_mtime}
+        if not prev or prev["sha"] != sha:
+            changed[rel] = sha
+        obj = _object_path(root, sha)
+        if not os.path.exists(obj):
+            os.makedirs(os.path.dirname(obj), exist_ok=True)
+            shutil.copy2(entry.path, obj)
+            new_objects += 1
+    removed = sorted(set(previous) - set(manifest))
+    return {"manifest": manifest, "changed": changed, "removed": removed, "new_objects": new_objects}
+
+
+def create_backup(db_path: str, upload_root: Optional[str] = "uploads",
+                  root: str = INCREMENTAL_ROOT, full: bool = False) -> Dict:
+    """Write a new backup containing only what changed since the previous one.
+
+    A full backup is written when full=True or when there is no previous
+    manifest to compare against.
+    """
+    os.makedirs(root, exist_ok=True)
+    state_path = os.path.join(root, STATE_FILE)
+    state = None if full or not os.path.exists(state_path) else _read_json(state_path)
+    kind = "full" if state is None else "incremental"
+    prev_rows = state["tables"] if state else {}
+    prev_uploads = state["uploads"] if state else {}
+
+    backup_id = _new_backup_id(root)
+    backup_dir = os.path.join(root, backup_id)
+    os.makedirs(backup_dir)
+
+    snapshot_path = backup.snapshot_to_tempfile(db_path)
+    try:
+        conn = sqlite3.connect(snapshot_path)
+        backup.register_functions(conn)
+        try:
+            meta_tables = {}
+            new_rows = {}
+            changed_rows = 0
+            with gzip.open(os.path.join(backup_dir, "rows.jsonl.gz"), "wt", encoding="utf-8") as out:
+                for table, key in _user_tables(conn).items():
+                    info = list(conn.execute(f"PRAGMA table_info({_quote(table)})"))
+                    columns = [row[1] for row in info]
+                    key_positions = [columns.index(c) for c in key]
+                    col_list = ", ".join(_quote(c) for c in columns)
+                    previous = prev_rows.get(table, {})
+                    hashes = {}
+                    changed = 0
+                    for row in conn.execute(f"SELECT row_hash({col_list}), {col_list} FROM {_quote(table)}"):
+                        row_hash, values = row[0], row[1:]
+                        row_key = _row_key(key, [values[i] for i in key_positions])
+                        hashes[row_key] = row_hash
+                        if previous.get(row_key) != row_hash:
+                            out.write(json.dumps([table] + [_encode(v) for v in values],
+                                                 separators=(",", ":")) + "\n")
+                            changed += 1
+                    gone = set(previous) - set(hashes)
+                    if key == ["id"]:
+                        deleted = sorted(int(i) for i in gone)
+                    else:
+                        deleted = [[_decode(v) for v in json.loads(k)] for k in sorted(gone)]
+                    meta_tables[table] = {
+                        "sql": conn.execute(
+                            "SELECT sql FROM sqlite_master WHERE type='table' AND name=?", (table,)
+                        ).fetchone()[0],
+                        "columns": [[row[1], row[2]] for row in info],
+                        "key": key,
+                        "changed": changed,
+                        "deleted": deleted,
+                    }
+                    new_rows[table] = hashes
+                    changed_rows += changed + len(deleted)
+            schema = _schema_sql(conn)
+        finally:
+            conn.close()
+    except Exception:
+        shutil.rmtree(backup_dir, ignore_errors=True)
+        raise
+    finally:
+        os.remove(snapshot_path)
+
+    uploads = {"manifest": {}, "changed": {}, "removed": [], "new_objects": 0}
+    if upload_root and os.path.isdir(upload_root):
+        uploads = _diff_uploads(root, upload_root, prev_uploads)
+
+    meta = {
+        "id": backup_id,
+        "kind": kind,
+        "parent": state["head"] if state else None,
+        "created_at": datetime.now().isoformat(),
+        "schema": schema if kind == "full" else [],
+        "tables": meta_tables,
+        "uploads": {"changed": uploads["changed"], "removed": uploads["removed"]},
+        "stats": {
+            "changed_rows": changed_rows,
+            "changed_uploads": len(uploads["changed"]) + len(uploads["removed"]),
+            "new_objects": uploads["new_objects"],
+        },
+    }
+    _write_json(os.path.join(backup_dir, "meta.json"), meta)
+    _write_json(state_path, {"head": backup_id, "tables": new_rows, "uploads": uploads["manifest"]})
+    meta["size_bytes"] = _dir_size(backup_dir)
+    return _summary(meta)
+
+
+def _dir_size(path: str) -> int:
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+def _summary(meta: Dict) -> Dict:
+    return {
+        "id": meta["id"],
+        "kind": meta["kind"],
+        "parent": meta["parent"],
+        "created_at": meta["created_at"],
+        "stats": meta["stats"],
+        "size_bytes": meta.get("size_bytes"),
+    }
+
+
+# ─── Listing and restoring ───────────────────────────────────────────
+
+def load_meta(backup_id: str, root: str = INCREMENTAL_ROOT) -> Dict:
+    if os.sep in backup_id or "/" in backup_id or backup_id.startswith("."):
+        raise LookupError(f"Unknown backup '{backup_id}'")
+    path = os.path.join(root, backup_id, "meta.json")
+    if not os.path.exists(path):
+        raise LookupError(f"Unknown backup '{backup_id}'")
+    return _read_json(path)
+
+
+def list_backups(root: str = INCREMENTAL_ROOT) -> List[Dict]:
+    if not os.path.isdir(root):
+        return []
+    backups = []
+    for entry in os.scandir(root):
+        if entry.is_dir() and os.path.exists(os.path.join(entry.path, "meta.json")):
+            meta = _read_json(os.path.join(entry.path, "meta.json"))
+            meta["size_bytes"] = _dir_size(entry.path)
+            backups.append(_summary(meta))
+    return sorted(backups, key=lambda b: b["id"])
+
+
+def backup_chain(backup_id: str, root: str = INCREMENTAL_ROOT) -> List[Dict]:
+    """Metadata from the last full backup up to backup_id, oldest first."""
+    chain = []
+    current = backup_id
+    while current:
+        meta = load_meta(current, root)
+        chain.append(meta)
+        if meta["kind"] == "full":
+            break
+        current = meta["parent"]
+    else:
+        raise LookupError(f"Backup chain for '{backup_id}' has no full backup")
+    return list(reversed(chain))
+
+
+def materialize(backup_id: str, dest_path: str, root: str = INCREMENTAL_ROOT) -> Dict[str, str]:
+    """Rebuild the database as of backup_id into dest_path by replaying its chain.
+
+    Returns the upload manifest (relative path -> sha256) at that point.
+    """
+    chain = backup_chain(backup_id, root)
+    if os.path.exists(dest_path):
+        os.remove(dest_path)
+    conn = sqlite3.connect(dest_path, isolation_level=None)
+    uploads: Dict[str, str] = {}
+    try:
+        conn.execute("BEGIN")
+        for meta in chain:
+            if meta["kind"] == "full":
+                for sql in meta["schema"]:
+                    conn.execute(sql)
+            for table, info in meta["tables"].items():
+                existing = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+                if not existing:
+                    # Table created after the full backup
+                    conn.execute(info["sql"])
+                    existing = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote(table)})")}
+                for name, col_type in info["columns"]:
+                    if name not in existing:
+                        conn.execute(f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(name)} {col_type}")
+                key = info.get("key", ["id"])
+                if key == ["id"]:
+                    for start in range(0, len(info["deleted"]), 500):
+                        ids = info["deleted"][start:start + 500]
+                        conn.execute(
+                            f"DELETE FROM {_quote(table)} WHERE id IN ({', '.join('?' * len(ids))})", ids
+                        )
+                else:
+                    conn.executemany(
+                        f"DELETE FROM {_quote(table)} WHERE "
+                        + " AND ".join(f"{_quote(c)} = ?" for c in key),
+                        info["deleted"],
+                    )
+            with gzip.open(os.path.join(root, meta["id"], "rows.jsonl.gz"), "rt", encoding="utf-8") as f:
+                columns = {t: [c[0] for c in info["columns"]] for t, info in meta["tables"].items()}
+                for line in f:
+                    record = json.loads(line)
+                    table, values = record[0], [_decode(v) for v in record[1:]]
+                    cols = columns[table]
+                    conn.execute(
+                        f"INSERT OR REPLACE INTO {_quote(table)} ({', '.join(_quote(c) for c in cols)}) "
+                        f"VALUES ({', '.join('?' * len(cols))})",
+                        values,
+                    )
+            for rel in meta["uploads"]["removed"]:
+                uploads.pop(rel, None)
+            uploads.update(meta["uploads"]["changed"])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.close()
+        os.remove(dest_path)
+        raise
+    conn.close()
+    return uploads
+
+
+def restore_uploads(upload_manifest: Dict[str, str], upload_root: Optional[str] = None,
+                    root: str = INCREMENTAL_ROOT) -> int:
+    """Put back any upload from the manifest that is missing or differs on disk.
+
+    upload_root defaults to the app's upload folder (uploads.UPLOAD_ROOT).
+    """
+    if upload_root is None:
+        # Imported here: uploads needs the app's dependencies, the CLI passes its own folder
+        from .uploads import UPLOAD_ROOT as upload_root
+    restored = 0
+    for rel, sha in upload_manifest.items():
+        target = os.path.join(upload_root, *rel.split("/"))
+        if os.path.exists(target) and _file_sha256(target) == sha:
+            continue
+        obj = _object_path(root, sha)
+        if not os.path.exists(obj):
+            print(f"Missing backup object for {rel}")
+            continue
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(obj, target)
+        restored += 1
+    return restored
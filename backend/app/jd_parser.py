@@ -0,0 +1,467 @@
+"""
+Job description parsing on the server.
+
+A port of the heuristics in the frontend's JDParserModal.tsx (parseJD,
+extractCompany, extractSalary, detectSecurityClearance, ...), so stored
+job_description text and imported postings can be parsed without a
+browser. The patterns are compiled once at import; keep them in step with
+the TypeScript versions.
+
+parse_many() fans large batches out over a process pool, one worker per
+core: the parsing is pure CPU work in regexes, which threads wouldn't run
+in parallel. backfill() uses it to fill in the salary, location and work
+type of stored applications that don't have them yet. The pool is started
+once, on first use, with the spawn start method: forking the threaded
+server could leave a child stuck on a lock another thread held.
+"""
+import math
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session
+
+from . import crud, models, typeahead
+
+WORK_TYPE_OPTIONS = ("Remote", "Hybrid", "On-site")
+
+# Fields backfill() may fill in, only where they are empty
+BACKFILL_FIELDS = ("salary_min", "salary_max", "location", "work_type")
+
+# Batches smaller than this are parsed in-process: a round trip to the pool costs more
+POOL_THRESHOLD = 200
+POOL_WORKERS = os.cpu_count() or 1
+BACKFILL_BATCH_SIZE = 2000
+
+# ─── Utility parsers ─────────────────────────────────────────────────
+
+# Lines to skip when scanning for title / company
+_LINKEDIN_SKIP = [re.compile(p, re.I) for p in (
+    r"^company\s+logo",
+    r"^\d+\s+(days?|hours?|weeks?)\s+ago",
+    r"people\s+(clicked|applied)",
+    r"^(promoted|sponsored)\b",
+    r"^(apply|saved|hybrid|remote|on-?site|full[- ]time|part[- ]time|contract)$",
+    r"^use\s+ai\s+to",
+    r"^(tailor|create\s+cover|help\s+me|show\s+(all|match)|school\s+alumni)",
+    r"^about\s+the\s+job$",
+    r"^(responses\s+managed|flexible\s+first|working\s+pattern)",
+)]
+
+_COMPANY_LOGO = re.compile(r"company\s+logo", re.I)
+_COMPANY_LABEL = re.compile(r"^(?:company|employer|organisation|organization)\s*[:\-–]\s*([^\n,|·]+)", re.I | re.M)
+_COMPANY_AT = re.compile(r"\bat\s+([A-Z][A-Za-z0-9&']{1,30}(?:\s[A-Z][A-Za-z0-9&']{1,20}){0,3})(?=\s*[·|,–\n])", re.M)
+_COMPANY_ABOUT = re.compile(r"^About\s+([A-Z][A-Za-z0-9&'\s]{1,40}?)$", re.M)
+
+_TITLE_LABEL = re.compile(r"(?:^|\n)\s*(?:job\s+title|position|role|job\s+opening)\s*[:\-–]\s*([^\n]+)", re.I)
+_CAPITALISED = re.compile(r"^[A-Z]")
+
+_LOCATION_3 = re.compile(r"([A-Z][A-Za-z \t\-]+,[ \t]*[A-Z][A-Za-z \t\-]+,[ \t]*[A-Z][A-Za-z \t\-]+)[ \t]*·")
+_LOCATION_2 = re.compile(r"([A-Z][A-Za-z \t\-]+,[ \t]*[A-Z][A-Za-z \t\-]+)[ \t]*·")
+_LOCATION_LABEL = re.compile(r"(?:^|\n)[ \t]*(?:base[ \t]+)?location[ \t]*[:\-–][ \t]*([^\n,;]+)", re.I)
+_LOCATION_SENTENCE = re.compile(r"\b(you'?ll|will|expected|spend|working|office)\b", re.I)
+_CITY_IN_SENTENCE = re.compile(r"\b([A-Z][a-z]+(?: [A-Z][a-z]+)?(?:,\s*[A-Z][a-z]+(?: [A-Z][a-z]+)?)?)\b")
+_CITY = re.compile(r"\b([A-Z][a-z]+(?:[ \t][A-Z][a-z]+)?,[ \t]*(?:[A-Z]{2}|[A-Z][a-z]+(?:[ \t][A-Z][a-z]+)?))\b")
+
+_SALARY_STRIP = re.compile(r"[,\s£$€]")
+_SALARY_K = re.compile(r"^(\d+(?:\.\d+)?)k$", re.I)
+_LEADING_NUMBER = re.compile(r"^[+-]?(?:\d+(?:\.\d*)?|\.\d+)")
+# Range: £40,000 - £55,000 / $60k–$80k / €45000 to €60000
+_SALARY_RANGE = re.compile(r"[£$€]\s*([\d,]+(?:\.\d+)?k?)\s*(?:[-–—]|to)\s*[£$€]?\s*([\d,]+(?:\.\d+)?k?)", re.I)
+_SALARY_LABELLED = re.compile(r"(?:salary|pay|compensation|package)[^\n£$€]{0,30}[£$€]\s*([\d,]+(?:\.\d+)?k?)", re.I)
+_SALARY_PLAIN = re.compile(r"[£$€]\s*([\d,]+(?:\.\d+)?k?)", re.I)
+
+_HIRING_TEAM = re.compile(r"meet\s+the\s+hiring\s+team", re.I)
+_CONTACT_SKIP = re.compile(r"job\s+poster|recruiter|hiring\s+manager|show\s+all", re.I)
+_BADGE_TICKS = re.compile(r"[✓✔☑]")
+_BADGE_DEGREE = re.compile(r"[·•]\s*(1st|2nd|3rd)\b", re.I)
+_BADGE_DEGREE_SPACED = re.compile(r"\s+(1st|2nd|3rd)\b", re.I)
+
+
+def _lines(text: str) -> List[str]:
+    return [line.strip() for line in text.split("\n") if line.strip()]
+
+
+def extract_company(text: str) -> str:
+    lines = _lines(text)
+
+    # LinkedIn format: "Company logo for, CompanyName." on line 0, "CompanyName" on line 1
+    if len(lines) > 1 and _COMPANY_LOGO.search(lines[0]):
+        raw = re.sub(r"\.$", "", lines[1]).strip()
+        if 0 < len(raw) < 80 and "," not in raw:
+            return raw
+
+    # "Company: Foo" / "Employer: Foo" explicit label (but NOT "Company logo for,…")
+    match = _COMPANY_LABEL.search(text)
+    if match:
+        return match.group(1).strip()
+
+    # "at CompanyName ·" pattern — must be followed by · | ,
+    match = _COMPANY_AT.search(text[:600])
+    if match:
+        return match.group(1).strip()
+
+    # "About SSE" / "About the company" standalone heading line
+    match = _COMPANY_ABOUT.search(text)
+    if match:
+        return match.group(1).strip()
+
+    return ""
+
+
+def extract_title(text: str) -> str:
+    # Explicit label always wins
+    match = _TITLE_LABEL.search(text)
+    if match:
+        return match.group(1).strip()
+
+    company_words = extract_company(text).lower().split()
+    first_word = company_words[0] if company_words else ""
+
+    for line in _lines(text)[:20]:
+        # Skip short/long lines
+        if len(line) < 3 or len(line) > 90:
+            continue
+        # Skip sentences (has a period and is long enough)
+        if line.endswith(".") and len(line) > 40:
+            continue
+        # Skip boilerplate LinkedIn lines
+        if any(p.search(line) for p in _LINKEDIN_SKIP):
+            continue
+        # Skip if the line contains the company name's first word
+        if first_word and first_word in line.lower():
+            continue
+        # Skip lines with · (LinkedIn metadata: location, date)
+        if "·" in line:
+            continue
+        # Must start with a capital letter and have ≤ 8 words
+        if _CAPITALISED.match(line) and len(line.split()) <= 8:
+            return line
+
+    return ""
+
+
+def extract_location(text: str) -> str:
+    # 1. LinkedIn: "City, Region, Country ·" (three-part with middle dot)
+    head = text[:800]
+    match = _LOCATION_3.search(head)
+    if match:
+        return match.group(1).strip()
+
+    # 2. LinkedIn: "City, Region ·" (two-part)
+    match = _LOCATION_2.search(head)
+    if match:
+        return match.group(1).strip()
+
+    # 3. Explicit "Location: City" label
+    match = _LOCATION_LABEL.search(text)
+    if match:
+        raw = match.group(1).strip()
+        if not (_LOCATION_SENTENCE.search(raw) or len(raw) > 50):
+            return raw
+        city = _CITY_IN_SENTENCE.search(raw)
+        if city:
+            return city.group(1).strip()
+
+    # 4. Generic "City, Country" pattern near the top — single line only
+    match = _CITY.search(head)
+    if match:
+        return match.group(1).strip()
+
+    return ""
+
+
+def extract_work_type(text: str) -> str:
+    lower = text.lower()
+    for work_type in WORK_TYPE_OPTIONS:
+        if work_type.lower() in lower:
+            return work_type
+    return ""
+
+
+def _round(value: float) -> int:
+    # Math.round: halves round up
+    return math.floor(value + 0.5)
+
+
+def parse_salary_number(raw: str) -> Optional[int]:
+    cleaned = _SALARY_STRIP.sub("", raw)
+    match = _SALARY_K.match(cleaned)
+    if match:
+        return _round(float(match.group(1)) * 1000)
+    # parseFloat: the longest leading number, if any
+    match = _LEADING_NUMBER.match(cleaned)
+    return _round(float(match.group(0))) if match else None
+
+
+def extract_salary(text: str) -> Dict[str, Optional[int]]:
+    match = _SALARY_RANGE.search(text)
+    if match:
+        return {
+            "salary_min": parse_salary_number(match.group(1)),
+            "salary_max": parse_salary_number(match.group(2)),
+        }
+    # Single amount with a label, else the first currency amount
+    match = _SALARY_LABELLED.search(text) or _SALARY_PLAIN.search(text)
+    if match:
+        value = parse_salary_number(match.group(1))
+        return {"salary_min": value, "salary_max": value}
+    return {}
+
+
+# ─── Description cleanup ─────────────────────────────────────────────
+
+# Lines to strip from the saved JD text (LinkedIn boilerplate)
+_JUNK_LINE_PATTERNS = [re.compile(p, re.I) for p in (
+    r"^company\s+logo",
+    r"^\d+\s+(days?|hours?|weeks?)\s+ago\b",
+    r"\bpeople\s+(clicked|applied)\b",
+    r"^(promoted\s+by|responses\s+managed)",
+    r"^(apply|saved|save|easy\s+apply)$",
+    r"^use\s+ai\s+to\s+assess",
+    r"^(show\s+match\s+details|tailor\s+(my\s+)?resume|create\s+cover\s+letter|help\s+me\s+stand\s+out)",
+    r"^people\s+you\s+can\s+reach\s+out\s+to",  # drop heading, keep content below
+    r"^school\s+alumni\s+from",
+    r"^show\s+all$",
+    r"^message$",                               # LinkedIn "Message" button
+    r"^\s*(premium|sponsored)\s*$",
+    r"^(about\s+the\s+job)$",
+)]
+
+# Block-level sections to drop entirely (start → next heading)
+_JUNK_SECTION_STARTS = [re.compile(r"^use\s+ai\s+to\s+assess", re.I)]
+
+_SECTION_START = re.compile(r"^[A-Z£$€]")
+_META_POSTED = re.compile(r"·\s*\d+\s+(days?|hours?|weeks?)\s+ago", re.I)
+_META_CLICKED = re.compile(r"·\s*\d+\s+people\s+(clicked|applied)\s+apply", re.I)
+_TICK_SPACE = re.compile(r"[✓✔☑]\s*")
+_BLANK_RUNS = re.compile(r"\n{3,}")
+
+
+def clean_jd(text: str) -> str:
+    cleaned = []
+    skip_section = False
+
+    for raw_line in text.split("\n"):
+        line = raw_line.strip()
+
+        if any(p.search(line) for p in _JUNK_SECTION_STARTS):
+            skip_section = True
+            continue
+
+        # A new non-empty, non-junk, capitalised line ends a skipped section
+        if skip_section:
+            if line and _SECTION_START.match(line) and not any(p.search(line) for p in _JUNK_LINE_PATTERNS):
+                skip_section = False
+            else:
+                continue
+
+        if any(p.search(line) for p in _JUNK_LINE_PATTERNS):
+            continue
+
+        # Strip LinkedIn metadata and badges: "· 6 days ago", "Anthony Speed ✓ • 2nd"
+        without_meta = _META_POSTED.sub("", raw_line)
+        without_meta = _META_CLICKED.sub("", without_meta)
+        without_meta = _TICK_SPACE.sub("", without_meta)
+        without_meta = _BADGE_DEGREE.sub("", without_meta)
+        cleaned.append(without_meta.rstrip())
+
+    # Collapse 3+ consecutive blank lines into 2
+    return _BLANK_RUNS.sub("\n\n", "\n".join(cleaned)).strip()
+
+
+# ─── Security clearance detection ────────────────────────────────────
+
+_EDV = re.compile(r"\bedv\b|enhanced\s+dv\b|enhanced\s+developed\s+vetting", re.I)
+_DV = re.compile(r"\bdv\s+clear(ed|ance)?\b|\bdeveloped\s+vetting\b", re.I)
+_SC = re.compile(r"\bsc\s+clear(ed|ance)?\b|\bsecurity\s+clear(ed|ance)\b|\bclearance\s+required\b", re.I)
+_BRITISH_NATIONAL = re.compile(r"\bbritish\s+national\b", re.I)
+_UK_NATIONAL = re.compile(r"\buk\s+national\b", re.I)
+_BRITISH_CITIZEN = re.compile(r"\bbritish\s+citiz", re.I)
+_UK_CITIZEN = re.compile(r"\buk\s+citiz", re.I)
+
+
+def detect_security_clearance(text: str) -> List[str]:
+    """Clearance and nationality requirements mentioned, e.g. ['SC Clearance', 'British National']."""
+    requirements = []
+    if _EDV.search(text):
+        requirements.append("eDV Clearance")
+    elif _DV.search(text):
+        requirements.append("DV Clearance")
+    elif _SC.search(text):
+        requirements.append("SC Clearance")
+
+    if _BRITISH_NATIONAL.search(text):
+        requirements.append("British National")
+    elif _UK_NATIONAL.search(text):
+        requirements.append("UK National")
+
+    if _BRITISH_CITIZEN.search(text):
+        requirements.append("British Citizen")
+    elif _UK_CITIZEN.search(text):
+        requirements.append("UK Citizen")
+    return requirements
+
+
+def extract_contact_person(text: str) -> str:
+    lines = text.split("\n")
+    for i in range(len(lines) - 1):
+        if not _HIRING_TEAM.search(lines[i].strip()):
+            continue
+        for candidate in lines[i + 1:min(i + 5, len(lines))]:
+            candidate = candidate.strip()
+            if len(candidate) < 2:
+                continue
+            # Skip lines that look like job titles / boilerplate
+            if _CONTACT_SKIP.search(candidate):
+                continue
+            cleaned = _BADGE_TICKS.sub("", candidate)
+            cleaned = _BADGE_DEGREE.sub("", cleaned)
+            cleaned = _BADGE_DEGREE_SPACED.sub("", cleaned).strip()
+            if len(cleaned) > 1 and _CAPITALISED.match(cleaned):
+                return cleaned
+    return ""
+
+
+def parse_jd(text: str) -> dict:
+    """Every field the form can be prefilled with, as JDParserModal's parseJD returns them."""
+    return {
+        "company_name": extract_company(text),
+        "job_title": extract_title(text),
+        "location": extract_location(text),
+        "work_type": extract_work_type(text),
+        "salary_min": None,
+        "salary_max": None,
+        **extract_salary(text),
+        "job_description": clean_jd(text),
+        "contact_person": extract_contact_person(text),
+        "security_clearance": detect_security_clearance(text),
+    }
+
+
+# ─── Batches ─────────────────────────────────────────────────────────
+
+def _backfill_values(text: str) -> dict:
+    # Only what backfill() uses, to keep what the workers send back small
+    return {"location": extract_location(text), "work_type": extract_work_type(text), **extract_salary(text)}
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_pool():
+    """Stop the worker processes, e.g. on server shutdown; the next batch starts new ones."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+@contextmanager
+def _mapper(count: int, workers: Optional[int] = None):
+    """A map(func, texts) for count texts: in-process for small batches or
+    workers=1, else over the shared process pool."""
+    if count < POOL_THRESHOLD or POOL_WORKERS == 1 or workers == 1:
+        yield lambda func, texts: [func(text) for text in texts]
+        return
+    workers = min(workers or POOL_WORKERS, POOL_WORKERS)
+
+    def pooled(func, texts: List[str]) -> List[dict]:
+        # Few large chunks: each task costs a round trip to a worker
+        chunksize = max(1, math.ceil(len(texts) / (workers * 4)))
+        try:
+            return list(_get_pool().map(func, texts, chunksize=chunksize))
+        except BrokenProcessPool:
+            shutdown_pool()  # a worker died; start afresh next time
+            raise
+    yield pooled
+
+
+def parse_many(texts: List[str], workers: Optional[int] = None) -> List[dict]:
+    """parse_jd() of every text, in order, spread over a process pool for large batches."""
+    with _mapper(len(texts), workers) as mapper:
+        return mapper(parse_jd, texts)
+
+
+def _is_empty(value) -> bool:
+    return value is None or value == ""
+
+
+def _chunks(rows: List, size: int) -> Iterable[List]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _backfill_chunk(db: Session, mapper, ids: List[int], report: dict):
+    JobApplication = models.JobApplication
+    columns = [getattr(JobApplication, field) for field in BACKFILL_FIELDS]
+    rows = db.query(JobApplication.id, JobApplication.job_description, *columns).filter(
+        JobApplication.id.in_(ids)
+    ).all()
+    parsed = mapper(_backfill_values, [row.job_description for row in rows])
+    updates = []
+    for row, values in zip(rows, parsed):
+        changes = {
+            field: values.get(field) for field in BACKFILL_FIELDS
+            if _is_empty(getattr(row, field)) and not _is_empty(values.get(field))
+        }
+        if changes:
+            for field in changes:
+                report[field] += 1
+            updates.append({"id": row.id, **changes})
+    if updates:
+        db.execute(update(JobApplication), updates)
+        # The bulk UPDATE bypasses crud's saved view upkeep
+        crud.invalidate_saved_views(db)
+        report["updated"] += len(updates)
+
+
+def backfill(db: Session, dry_run: bool = False, batch_size: int = BACKFILL_BATCH_SIZE,
+             workers: Optional[int] = None) -> dict:
+    """Fill empty salary / location / work type fields from each application's job description.
+
+    Only empty fields are written; anything already set is left alone.
+    Descriptions are parsed batch_size at a time over the process pool and
+    each batch is written with one bulk UPDATE, then committed (rolled back
+    with dry_run).
+    """
+    JobApplication = models.JobApplication
+    columns = [getattr(JobApplication, field) for field in BACKFILL_FIELDS]
+    candidates = (
+        db.query(JobApplication.id)
+        .filter(JobApplication.job_description.isnot(None), JobApplication.job_description != "")
+        .filter(or_(*(column.is_(None) for column in columns), JobApplication.location == "",
+                    JobApplication.work_type == ""))
+        .order_by(JobApplication.id)
+    )
+    ids = [row_id for (row_id,) in candidates]
+    report = {"scanned": len(ids), "updated": 0, "dry_run": dry_run, **{field: 0 for field in BACKFILL_FIELDS}}
+
+    with _mapper(len(ids), workers) as mapper:
+        for chunk in _chunks(ids, batch_size):
+            _backfill_chunk(db, mapper, chunk, report)
+            if dry_run:
+                db.rollback()
+            else:
+                db.commit()
+    if report["updated"] and not dry_run:
+        typeahead.invalidate(db)
+    return report
@@ -0,0 +1,199 @@
+"""
+Import of the Connections.csv file from LinkedIn's data export.
+
+The file is read row by row, so its size doesn't matter. Existing connections
+are loaded once into an in-memory index keyed by the normalised columns (see
+normalize.py); every CSV row is matched against it and either fills in a
+known connection or is queued as a new one. Inserts and updates are written
+with bulk statements, one transaction per batch.
+
+Matching: by LinkedIn profile slug when the row has a URL, otherwise by name
+plus company. Rows repeated within the file are only imported once.
+"""
+import codecs
+import csv
+from datetime import datetime
+from typing import BinaryIO, Dict, List, Optional
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from . import companies, models, normalize
+
+BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+
+# Columns of LinkedIn's export; the header follows a few lines of notes
+NAME_COLUMNS = ("First Name", "Last Name")
+URL_COLUMN = "URL"
+COMPANY_COLUMN = "Company"
+POSITION_COLUMN = "Position"
+CONNECTED_ON_COLUMN = "Connected On"
+CONNECTED_ON_FORMATS = ("%d %b %Y", "%Y-%m-%d", "%m/%d/%y", "%m/%d/%Y")
+
+
+class ConnectionIndex:
+    """Existing connections, looked up by profile slug or by name + company."""
+
+    def __init__(self):
+        self.by_slug: Dict[str, dict] = {}
+        self.by_name: Dict[tuple, dict] = {}
+
+    @classmethod
+    def load(cls, db: Session) -> "ConnectionIndex":
+        index = cls()
+        table = models.LinkedInConnection.__table__
+        rows = db.execute(select(
+            table.c.id, table.c.name_key, table.c.company_key, table.c.linkedin_slug,
+            table.c.company_name, table.c.linkedin_profile_id, table.c.connection_status,
+            table.c.stage, table.c.accepted_on,
+        )).mappings()
+        for row in rows:
+            index.add(dict(row))
+        return index
+
+    def add(self, record: dict):
+        if record["linkedin_slug"]:
+            self.by_slug.setdefault(record["linkedin_slug"], record)
+        if record["name_key"]:
+            self.by_name.setdefault((record["name_key"], record["company_key"]), record)
+
+    def find(self, keys: dict) -> Optional[dict]:
+        if keys["linkedin_slug"]:
+            match = self.by_slug.get(keys["linkedin_slug"])
+            if match is not None:
+                return match
+            # A stored record without a URL can still be the same person
+            match = self.by_name.get((keys["name_key"], keys["company_key"]))
+            if match is not None and not match["linkedin_slug"]:
+                return match
+            return None
+        return self.by_name.get((keys["name_key"], keys["company_key"]))
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    value = (value or "").strip()
+    for fmt in CONNECTED_ON_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
+
+def _rows(lines):
+    """Yield (line number, row dict), skipping the notes LinkedIn puts above the header."""
+    reader = csv.reader(lines)
+    header = None
+    for row in reader:
+        if header is None:
+            if all(c in row for c in NAME_COLUMNS):
+                header = [c.strip() for c in row]
+            continue
+        if not any(cell.strip() for cell in row):
+            continue
+        yield reader.line_num, dict(zip(header, row))
+    if header is None:
+        raise ValueError("Not a LinkedIn Connections.csv file: no 'First Name,Last Name,...' header found")
+
+
+def _changes(existing: dict, new: dict) -> dict:
+    """Fields of an existing connection the CSV row adds to."""
+    changes = {}
+    if existing["connection_status"] != "Accepted":
+        changes["connection_status"] = "Accepted"
+    if existing["stage"] == "Need to Connect":
+        changes["stage"] = "Requested"
+    if not existing["accepted_on"] and new["accepted_on"]:
+        changes["accepted_on"] = new["accepted_on"]
+    if not existing["company_name"] and new["company_name"]:
+        changes["company_name"] = new["company_name"]
+        changes["company_key"] = new["company_key"]
+    if not existing["linkedin_profile_id"] and new["linkedin_profile_id"]:
+        changes["linkedin_profile_id"] = new["linkedin_profile_id"]
+        changes["linkedin_slug"] = new["linkedin_slug"]
+    return changes
+
+
+def _flush(db: Session, inserts: List[dict], updates: List[dict], dry_run: bool):
+    if not dry_run:
+        if inserts:
+            db.execute(insert(models.LinkedInConnection), inserts)
+        if updates:
+            # Bulk UPDATE by primary key, grouped by the set of changed columns
+            db.execute(update(models.LinkedInConnection), updates)
+        companies.link_missing(db, tables=("linkedin_connections",))
+        db.commit()
+    inserts.clear()
+    updates.clear()
+
+
+def import_connections_csv(db: Session, fileobj: BinaryIO, batch_size: int = BATCH_SIZE,
+                           dry_run: bool = False) -> Dict:
+    """Import a LinkedIn Connections.csv (binary file object) and return a summary report.
+
+    Batches already written stay written if a later one fails; re-running the
+    import is safe since rows that are already present are matched again.
+    """
+    index = ConnectionIndex.load(db)
+    lines = codecs.getreader("utf-8-sig")(fileobj, errors="replace")
+    report = {"rows": 0, "inserted": 0, "updated": 0, "unchanged": 0, "duplicates": 0, "skipped": 0, "errors": []}
+    inserts: List[dict] = []
+    updates: List[dict] = []
+    now = datetime.now()
+
+    for line, row in _rows(lines):
+        report["rows"] += 1
+        name = " ".join(
+            (row.get(c) or "").strip() for c in NAME_COLUMNS if (row.get(c) or "").strip()
+        )
+        if not name:
+            report["skipped"] += 1
+            if len(report["errors"]) < MAX_REPORTED_ERRORS:
+                report["errors"].append({"line": line, "error": "Missing name"})
+            continue
+
+        url = (row.get(URL_COLUMN) or "").strip() or None
+        company = (row.get(COMPANY_COLUMN) or "").strip() or None
+        connected_on = _parse_date(row.get(CONNECTED_ON_COLUMN))
+        record = {
+            "contact_name": name,
+            "company_name": company,
+            "linkedin_profile_id": url,
+            "accepted_on": connected_on,
+            **normalize.connection_keys(name, company, url),
+        }
+
+        existing = index.find(record)
+        if existing is None:
+            position = (row.get(POSITION_COLUMN) or "").strip()
+            new_row = dict(
+                record,
+                connection_status="Accepted",
+                stage="Requested",
+                requested_on=connected_on or now,
+                cold_message_sent=False,
+                notes=f"Position: {position}" if position else None,
+            )
+            inserts.append(new_row)
+            # Later rows for the same person match this one instead
+            index.add(dict(new_row, id=None))
+            report["inserted"] += 1
+        elif existing["id"] is None:
+            report["duplicates"] += 1  # repeats a row queued earlier in this file
+        else:
+            changes = _changes(existing, record)
+            if changes:
+                existing.update(changes)
+                index.add(existing)
+                updates.append(dict(changes, id=existing["id"]))
+                report["updated"] += 1
+            else:
+                report["unchanged"] += 1
+
+        if len(inserts) + len(updates) >= batch_size:
+            _flush(db, inserts, updates, dry_run)
+
+    _flush(db, inserts, updates, dry_run)
+    report["dry_run"] = dry_run
+    return report
@@ -0,0 +1,76 @@
+"""
+Consistency of the links between cold messages and LinkedIn connections.
+
+A cold message may point at a connection (cold_messages.connection_id), and
+a connection points back at its latest linked message
+(linkedin_connections.cold_message_id) with cold_message_sent set. crud.py
+keeps both sides in step within one transaction; repair_links() restores the
+invariant for whole tables at once, e.g. after a partial restore or for
+databases written by older versions:
+
+- a message's connection_id refers to an existing connection;
+- a connection's cold_message_id refers to a message linked to it, and is
+  set whenever such a message exists (the newest one if it has to be chosen);
+- a connection with a cold_message_id is marked cold_message_sent.
+
+Each rule is a single UPDATE statement, plain SQL that runs on SQLite and
+PostgreSQL alike.
+"""
+from typing import Dict
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+_LINKED_MESSAGES = "FROM cold_messages m WHERE m.connection_id = linkedin_connections.id"
+
+# (report key, statement); order matters, later rules rely on earlier ones
+REPAIR_STATEMENTS = [
+    (
+        "dangling_message_links",
+        "UPDATE cold_messages SET connection_id = NULL"
+        " WHERE connection_id IS NOT NULL"
+        " AND NOT EXISTS (SELECT 1 FROM linkedin_connections c WHERE c.id = cold_messages.connection_id)",
+    ),
+    (
+        "stale_connection_links",
+        f"UPDATE linkedin_connections SET cold_message_id = (SELECT MAX(m.id) {_LINKED_MESSAGES}),"
+        f" cold_message_sent = EXISTS (SELECT 1 {_LINKED_MESSAGES})"
+        " WHERE cold_message_id IS NOT NULL"
+        " AND NOT EXISTS (SELECT 1 FROM cold_messages m"
+        " WHERE m.id = linkedin_connections.cold_message_id AND m.connection_id = linkedin_connections.id)",
+    ),
+    (
+        "missing_connection_links",
+        f"UPDATE linkedin_connections SET cold_message_id = (SELECT MAX(m.id) {_LINKED_MESSAGES}),"
+        " cold_message_sent = TRUE"
+        f" WHERE cold_message_id IS NULL AND EXISTS (SELECT 1 {_LINKED_MESSAGES})",
+    ),
+    (
+        "unflagged_connections",
+        "UPDATE linkedin_connections SET cold_message_sent = TRUE"
+        " WHERE cold_message_id IS NOT NULL AND (cold_message_sent IS NULL OR cold_message_sent = FALSE)",
+    ),
+]
+
+
+def apply_repairs(conn) -> Dict[str, int]:
+    """Run every rule on conn (a SQLAlchemy Connection or Session) without committing."""
+    return {key: conn.execute(text(statement)).rowcount for key, statement in REPAIR_STATEMENTS}
+
+
+def repair_links(db: Session, dry_run: bool = False) -> Dict[str, int]:
+    """Fix every broken link; returns the number of rows each rule changed.
+
+    The changes are committed together, or all rolled back with dry_run (the
+    counts are exact either way).
+    """
+    try:
+        report = apply_repairs(db)
+    except Exception:
+        db.rollback()
+        raise
+    if dry_run:
+        db.rollback()
+    else:
+        db.commit()
+    return report
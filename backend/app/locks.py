@@ -0,0 +1,134 @@
+"""
+Inter-process coordination between API workers: advisory locks on lock files
+for work that must only run in one worker at a time (e.g. schema migrations),
+a shared/exclusive lock that lets a restore wait for every worker's sessions,
+and a generation counter that tells workers when to reopen their pools.
+"""
+import os
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _try_lock(f) -> bool:
+    try:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+
+def _unlock(f):
+    if fcntl is not None:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+    else:
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def file_lock(path: str, timeout: float = 300.0, poll_interval: float = 0.1):
+    """Hold an exclusive lock on path; raises TimeoutError after timeout seconds.
+
+    The lock is released by the OS if the holder dies, so a crashed worker
+    never leaves it stuck. The file itself is left in place.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    with open(path, "a+") as f:
+        while not _try_lock(f):
+            if time.monotonic() >= deadline:
+                raise TimeoutError(f"Timed out waiting for lock {path}")
+            time.sleep(poll_interval)
+        try:
+            yield
+        finally:
+            _unlock(f)
+
+
+class SharedLock:
+    """Shared / exclusive lock on a file, held per process.
+
+    Each instance keeps its own file handle, so two instances conflict even
+    within one process. Shared locks need fcntl; on Windows only exclusive
+    locking is available and the shared side always succeeds, so coordination
+    there is limited to a single worker.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = None
+        self._pid = None
+
+    def _handle(self):
+        # A forked worker must not share its parent's handle (and so its lock)
+        if self._file is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.path, "a+")
+            self._pid = os.getpid()
+        return self._file
+
+    def try_acquire_shared(self) -> bool:
+        if fcntl is None:
+            return True
+        try:
+            fcntl.flock(self._handle().fileno(), fcntl.LOCK_SH | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def try_acquire_exclusive(self) -> bool:
+        return _try_lock(self._handle())
+
+    def acquire_exclusive(self, timeout: float, poll_interval: float = 0.05) -> bool:
+        """Wait up to timeout seconds for the exclusive lock; returns whether it was taken."""
+        deadline = time.monotonic() + timeout
+        while not self.try_acquire_exclusive():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(poll_interval)
+        return True
+
+    def release(self):
+        if self._file is None or self._pid != os.getpid():
+            return
+        try:
+            _unlock(self._file)
+        except OSError:
+            pass  # msvcrt: nothing was locked
+
+
+class GenerationCounter:
+    """Integer stored in a file, bumped by one process and polled by the others."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def read(self) -> int:
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0)
+        except (FileNotFoundError, ValueError):
+            return 0
+
+    def bump(self) -> int:
+        """Increment the counter; callers must hold a lock that serialises bumps."""
+        value = self.read() + 1
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(str(value))
+        os.replace(tmp_path, self.path)
+        return value
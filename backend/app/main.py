@@ -2,24 +2,24 @@ from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Req
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
 from fastapi.exceptions import RequestValidationError
+from starlette.background import BackgroundTask
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+import csv
 import shutil
 import os
 from datetime import datetime
-import pandas as pd
-from io import BytesIO
-import sqlite3
 
-from . import models, schemas, crud, migration
-from .database import engine, get_db
+from . import schemas, crud, async_crud, duplicates, migration, pagination, uploads, backup, dump, restore, incremental, linkedin_import, typeahead, jd_parser
+from . import backup_scheduler as backup_scheduler_module
+from .backup_scheduler import backup_scheduler
+from .database import get_db, get_read_db, get_async_db, get_async_read_db, get_db_path, request_tenant, open_async_engines, dispose_async_engines, all_database_sessions, tenant_databases, tenant_dir, DB_PATH, SQLALCHEMY_DATABASE_URL, DatabaseUnavailable, restore_coordinator_for
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
-
-# Run migrations to add any new columns to existing databases
+# Create / migrate the schema. Only the first worker of a deploy does any work
+# (under a lock file); the others, and every reload, just check the version.
 try:
-    migration.migrate_database()
+    migration.migrate_database(db_url=SQLALCHEMY_DATABASE_URL, lock_file=migration.LOCK_FILE)
 except Exception as e:
     print(f"Migration warning: {e}")
 
@@ -35,6 +35,21 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={"detail": exc.errors()},
     )
 
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable_handler(request: Request, exc: DatabaseUnavailable):
+    return JSONResponse(status_code=503, content={"detail": str(exc)})
+
+@app.on_event("startup")
+async def open_async_pools():
+    await open_async_engines()
+
+@app.on_event("shutdown")
+async def close_async_pools():
+    # aiosqlite runs each connection on its own thread, which would otherwise
+    # keep the process alive after shutdown
+    await dispose_async_engines()
+    await tenant_databases.aclose_all()
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -45,24 +60,30 @@ app.add_middleware(
 )
 
 # Create upload directories
-os.makedirs("uploads/cvs", exist_ok=True)
-os.makedirs("uploads/coverletters", exist_ok=True)
+uploads.ensure_upload_dirs()
 
 @app.get("/")
 def read_root():
     return {"message": "Job Application Manager API", "status": "running"}
 
-@app.post("/applications/", response_model=schemas.JobApplication)
+@app.post("/applications/", response_model=schemas.JobApplicationCreated)
 def create_application(
     application: schemas.JobApplicationCreate,
     db: Session = Depends(get_db)
 ):
     try:
         print(f"Received application data: {application.model_dump()}")
-        return crud.create_application(db=db, application=application)
+        db_application = crud.create_application(db=db, application=application)
     except Exception as e:
         print(f"Error creating application: {str(e)}")
         raise
+    # Saved either way; the client shows these as a warning
+    matches = duplicates.find_matches(
+        db, db_application.company_name, db_application.job_title, db_application.job_url,
+        db_application.job_description, exclude_id=db_application.id,
+    )
+    created = schemas.JobApplication.model_validate(db_application).model_dump()
+    return {**created, "possible_duplicates": matches}
 
 @app.get("/applications/", response_model=List[schemas.JobApplication])
 def read_applications(
@@ -77,7 +98,7 @@ def read_applications(
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
     status_stage: Optional[str] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     applications = crud.get_applications(
         db, skip=skip, limit=limit, status=status, domain=domain,
@@ -87,70 +108,82 @@ def read_applications(
     )
     return applications
 
+@app.post("/applications/check-duplicates", response_model=List[schemas.DuplicateMatch])
+def check_application_duplicates(check: schemas.DuplicateCheck, db: Session = Depends(get_read_db)):
+    """Applications that look like the same posting: same job URL, or same company with a similar title/description."""
+    return duplicates.find_matches(
+        db, check.company_name, check.job_title, check.job_url, check.job_description, exclude_id=check.exclude_id,
+    )
+
+@app.get("/applications/duplicates", response_model=List[schemas.DuplicatePair])
+def find_duplicate_applications(include_archived: bool = True, db: Session = Depends(get_read_db)):
+    """Every pair of likely duplicates across all applications, most similar first."""
+    return duplicates.find_all(db, include_archived=include_archived)
+
 @app.get("/applications/{application_id}", response_model=schemas.JobApplication)
-def read_application(application_id: int, db: Session = Depends(get_db)):
-    db_application = crud.get_application(db, application_id=application_id)
+async def read_application(application_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    db_application = await async_crud.get_application(db, application_id=application_id)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return db_application
 
 @app.put("/applications/{application_id}", response_model=schemas.JobApplication)
-def update_application(
+async def update_application(
     application_id: int,
     application: schemas.JobApplicationUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    db_application = crud.update_application(db, application_id=application_id, application=application)
+    db_application = await async_crud.update_application(db, application_id=application_id, application=application)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return db_application
 
 @app.delete("/applications/{application_id}")
-def delete_application(application_id: int, db: Session = Depends(get_db)):
-    success = crud.delete_application(db, application_id=application_id)
+async def delete_application(application_id: int, db: AsyncSession = Depends(get_async_db)):
+    success = await async_crud.delete_application(db, application_id=application_id)
     if not success:
         raise HTTPException(status_code=404, detail="Application not found")
     return {"message": "Application deleted successfully"}
 
 # Archive/Unarchive endpoints
 @app.put("/applications/{application_id}/archive")
-def archive_application(application_id: int, db: Session = Depends(get_db)):
-    db_application = crud.archive_application(db, application_id=application_id, archive=True)
+async def archive_application(application_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_application = await async_crud.archive_application(db, application_id=application_id, archive=True)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return {"message": "Application archived successfully"}
 
 @app.put("/applications/{application_id}/unarchive")
-def unarchive_application(application_id: int, db: Session = Depends(get_db)):
-    db_application = crud.archive_application(db, application_id=application_id, archive=False)
+async def unarchive_application(application_id: int, db: AsyncSession = Depends(get_async_db)):
+    db_application = await async_crud.archive_application(db, application_id=application_id, archive=False)
     if db_application is None:
         raise HTTPException(status_code=404, detail="Application not found")
     return {"message": "Application unarchived successfully"}
 
 # Bulk operations
 @app.post("/applications/bulk/delete")
-def bulk_delete_applications(application_ids: List[int], db: Session = Depends(get_db)):
-    count = crud.bulk_delete_applications(db, application_ids=application_ids)
+async def bulk_delete_applications(application_ids: List[int], db: AsyncSession = Depends(get_async_db)):
+    count = await async_crud.bulk_delete_applications(db, application_ids=application_ids)
     return {"message": f"Deleted {count} applications successfully"}
 
 @app.post("/applications/bulk/archive")
-def bulk_archive_applications(application_ids: List[int], db: Session = Depends(get_db)):
-    count = crud.bulk_archive_applications(db, application_ids=application_ids, archive=True)
+async def bulk_archive_applications(application_ids: List[int], db: AsyncSession = Depends(get_async_db)):
+    count = await async_crud.bulk_archive_applications(db, application_ids=application_ids, archive=True)
     return {"message": f"Archived {count} applications successfully"}
 
 @app.post("/applications/bulk/unarchive")
-def bulk_unarchive_applications(application_ids: List[int], db: Session = Depends(get_db)):
-    count = crud.bulk_archive_applications(db, application_ids=application_ids, archive=False)
+async def bulk_unarchive_applications(application_ids: List[int], db: AsyncSession = Depends(get_async_db)):
+    count = await async_crud.bulk_archive_applications(db, application_ids=application_ids, archive=False)
     return {"message": f"Unarchived {count} applications successfully"}
 
 @app.post("/applications/bulk/update-status")
-def bulk_update_status(application_ids: List[int], status: str, stage: Optional[str] = None, db: Session = Depends(get_db)):
-    count = crud.bulk_update_status(db, application_ids=application_ids, status=status, stage=stage)
+async def bulk_update_status(application_ids: List[int], status: str, stage: Optional[str] = None, db: AsyncSession = Depends(get_async_db)):
+    count = await async_crud.bulk_update_status(db, application_ids=application_ids, status=status, stage=stage)
     return {"message": f"Updated status for {count} applications successfully"}
 
 # Get all unique tags
 @app.get("/tags/")
-def get_all_tags(db: Session = Depends(get_db)):
+def get_all_tags(db: Session = Depends(get_read_db)):
     tags = crud.get_all_tags(db)
     return tags
 
@@ -174,16 +207,17 @@ async def upload_document(
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"{application_id}_{timestamp}{file_extension}"
     
-    if doc_type == "cv":
-        filepath = f"uploads/cvs/{filename}"
-    else:
-        filepath = f"uploads/coverletters/{filename}"
+    filepath = uploads.sharded_path(doc_type, filename)
     
     with open(filepath, "wb") as buffer:
         shutil.copyfileobj(file.file, buffer)
     
-    # Update database
-    updated_app = crud.update_document(db, application_id, doc_type, file.filename, filepath)
+    # Update database; drop the new file if the row could not be updated
+    try:
+        crud.update_document(db, application_id, doc_type, file.filename, filepath)
+    except Exception:
+        uploads.remove_file(filepath)
+        raise
     
     return {"message": f"{doc_type} uploaded successfully", "filename": file.filename}
 
@@ -191,7 +225,7 @@ async def upload_document(
 def download_document(
     application_id: int,
     doc_type: str,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     db_application = crud.get_application(db, application_id=application_id)
     if db_application is None:
@@ -212,165 +246,16 @@ def download_document(
     return FileResponse(filepath, filename=filename)
 
 @app.get("/statistics/", response_model=schemas.ApplicationStats)
-def get_statistics(db: Session = Depends(get_db)):
+def get_statistics(db: Session = Depends(get_read_db)):
     return crud.get_statistics(db)
 
 @app.get("/export/excel")
-def export_to_excel(db: Session = Depends(get_db)):
+def export_to_excel(db: Session = Depends(get_read_db)):
     """Export all job applications and cold messages to a multi-sheet Excel file"""
-    import json as _json
-    from openpyxl.styles import PatternFill, Font, Alignment
-
-    applications = crud.get_all_applications_for_export(db)
-    cold_messages = crud.get_cold_messages(db)
-
-    # ── Sheet 1: Job Applications ────────────────────────────────────────
-    apps_data = []
-    for app in applications:
-        # Derive latest rejection stage from status_history
-        rejection_stage = ""
-        try:
-            history = app.status_history if isinstance(app.status_history, list) else _json.loads(app.status_history or "[]")
-            for entry in reversed(history):
-                if entry.get("stage"):
-                    rejection_stage = entry["stage"]
-                    break
-        except Exception:
-            pass
-
-        tags_raw = app.tags
-        if isinstance(tags_raw, str):
-            try:
-                tags_raw = _json.loads(tags_raw)
-            except Exception:
-                tags_raw = []
-        tags_str = ", ".join(tags_raw) if tags_raw else ""
-
-        # Networking contacts (JSON list of {name, linkedin_url, ...})
-        net_contacts = app.networking_contacts or []
-        if isinstance(net_contacts, str):
-            try:
-                net_contacts = _json.loads(net_contacts)
-            except Exception:
-                net_contacts = []
-        net_contacts_str = "; ".join(
-            f"{c.get('name', '')} ({c.get('linkedin_url', c.get('email', ''))})".strip("()")
-            for c in net_contacts if isinstance(c, dict)
-        ) if net_contacts else ""
-
-        apps_data.append({
-            "ID": app.id,
-            "Company Name": app.company_name,
-            "Job Title": app.job_title,
-            "Domain": app.domain or "",
-            "Location": app.location or "",
-            "Work Type": app.work_type or "",
-            "Applied On (Portal)": app.applied_on or "",
-            "Status": app.status,
-            "Rejection Stage": rejection_stage,
-            "Application Date": app.application_date.strftime("%Y-%m-%d") if app.application_date else "",
-            "Application Deadline": app.application_deadline.strftime("%Y-%m-%d") if app.application_deadline else "",
-            "Interview Date": app.interview_date.strftime("%Y-%m-%d") if app.interview_date else "",
-            "Salary Min": app.salary_min or "",
-            "Salary Max": app.salary_max or "",
-            "Tags": tags_str,
-            "Job URL": app.job_url or "",
-            "Contact Person": app.contact_person or "",
-            "Contact Email": app.contact_email or "",
-            "Contact LinkedIn": app.contact_linkedin or "",
-            "Cold Outreach Sent": "Yes" if app.contact_cold_message_sent else "No",
-            "Cold Outreach Via": app.contact_cold_message_via or "",
-            "Cold Contact Category": app.contact_cold_contact_category or "",
-            "Cold Contact Email": app.contact_cold_contact_email or "",
-            "Cold Message Body": app.contact_cold_message_body or "",
-            "Networking Contacts": net_contacts_str,
-            "References": app.references or "",
-            "CV Uploaded": "Yes" if app.cv_filename else "No",
-            "Cover Letter Uploaded": "Yes" if app.coverletter_filename else "No",
-            "Interview Notes": app.interview_notes or "",
-            "Interview Questions": app.interview_questions or "",
-            "Notes": app.notes or "",
-            "Job Description": app.job_description or "",
-            "Archived": "Yes" if app.is_archived else "No",
-            "Created At": app.created_at.strftime("%Y-%m-%d") if app.created_at else "",
-            "Updated At": app.updated_at.strftime("%Y-%m-%d") if app.updated_at else "",
-        })
-
-    # ── Sheet 2: Cold Messages ───────────────────────────────────────────
-    cm_data = []
-    for msg in cold_messages:
-        cm_data.append({
-            "ID": msg.id,
-            "Contact Name": msg.contact_name,
-            "Company": msg.company_name or "",
-            "Contact Email": msg.contact_email or "",
-            "Contact LinkedIn": msg.contact_linkedin or "",
-            "Via": msg.via,
-            "Category": msg.category or "",
-            "Subject": msg.subject or "",
-            "Message Body": msg.message_body or "",
-            "Sent Date": msg.sent_date.strftime("%Y-%m-%d") if msg.sent_date else "",
-            "Got Reply": "Yes" if msg.got_reply else "No",
-            "Linked Connection ID": msg.connection_id or "",
-            "Notes": msg.notes or "",
-            "Created At": msg.created_at.strftime("%Y-%m-%d") if msg.created_at else "",
-            "Updated At": msg.updated_at.strftime("%Y-%m-%d") if msg.updated_at else "",
-        })
-
-    # ── Build Excel ──────────────────────────────────────────────────────
-    output = BytesIO()
-    header_fill = PatternFill(start_color="1E3A5F", end_color="1E3A5F", fill_type="solid")
-    header_font = Font(color="FFFFFF", bold=True)
-    header_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-    def style_sheet(ws, df):
-        for idx, col in enumerate(df.columns):
-            col_letter = ws.cell(row=1, column=idx + 1).column_letter
-            cell = ws.cell(row=1, column=idx + 1)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_align
-            max_len = max(df[col].astype(str).apply(len).max() if not df.empty else 0, len(col))
-            ws.column_dimensions[col_letter].width = min(max_len + 3, 60)
-        ws.row_dimensions[1].height = 20
-
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        df_apps = pd.DataFrame(apps_data) if apps_data else pd.DataFrame(columns=list(apps_data[0].keys()) if apps_data else [])
-        df_apps.to_excel(writer, sheet_name='Job Applications', index=False)
-        style_sheet(writer.sheets['Job Applications'], df_apps)
-
-        df_cm = pd.DataFrame(cm_data) if cm_data else pd.DataFrame(columns=["ID","Contact Name","Company","Contact Email","Contact LinkedIn","Via","Category","Subject","Message Body","Sent Date","Got Reply","Linked Connection ID","Notes","Created At","Updated At"])
-        df_cm.to_excel(writer, sheet_name='Cold Messages', index=False)
-        style_sheet(writer.sheets['Cold Messages'], df_cm)
-
-        # ── Sheet 3: LinkedIn Connections ────────────────────────────────────
-        connections = crud.get_all_connections_for_export(db)
-        conn_data = [
-            {
-                "ID": c.id,
-                "Contact Name": c.contact_name,
-                "Company": c.company_name or "",
-                "LinkedIn Profile": c.linkedin_profile_id or "",
-                "Category": c.category or "",
-                "Stage": c.stage or "Requested",
-                "Status": c.connection_status,
-                "Cold Message Sent": "Yes" if c.cold_message_sent else "No",
-                "Linked Cold Message ID": c.cold_message_id or "",
-                "Requested On": c.requested_on.strftime("%Y-%m-%d") if c.requested_on else "",
-                "Accepted On": c.accepted_on.strftime("%Y-%m-%d") if c.accepted_on else "",
-                "Follow Up Date": c.follow_up_date.strftime("%Y-%m-%d") if c.follow_up_date else "",
-                "Notes": c.notes or "",
-                "Created At": c.created_at.strftime("%Y-%m-%d") if c.created_at else "",
-                "Updated At": c.updated_at.strftime("%Y-%m-%d") if c.updated_at else "",
-            }
-            for c in connections
-        ]
-        conn_cols = ["ID","Contact Name","Company","LinkedIn Profile","Category","Stage","Status","Cold Message Sent","Linked Cold Message ID","Requested On","Accepted On","Follow Up Date","Notes","Created At","Updated At"]
-        df_conn = pd.DataFrame(conn_data) if conn_data else pd.DataFrame(columns=conn_cols)
-        df_conn.to_excel(writer, sheet_name='LinkedIn Connections', index=False)
-        style_sheet(writer.sheets['LinkedIn Connections'], df_conn)
-
-    output.seek(0)
+    # Imported here so pandas / openpyxl are only loaded once someone exports
+    from . import export
+
+    output = export.build_workbook(db)
     filename = f"job_tracker_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
 
     return StreamingResponse(
@@ -380,23 +265,37 @@ def export_to_excel(db: Session = Depends(get_db)):
     )
 
 @app.get("/domains/")
-def get_unique_domains(db: Session = Depends(get_db)):
+async def get_unique_domains(db: AsyncSession = Depends(get_async_read_db)):
     """Get list of unique domains from applications"""
-    domains = db.query(models.JobApplication.domain).filter(
-        models.JobApplication.domain.isnot(None)
-    ).distinct().all()
-    return [domain[0] for domain in domains if domain[0]]
+    return await async_crud.get_unique_domains(db)
+
+@app.get("/typeahead", response_model=List[schemas.TypeaheadSuggestion])
+async def typeahead_suggestions(
+    field: str,
+    q: str = "",
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Most used values of an application field with a word starting with q.
+
+    Served from an in-memory index (see typeahead.py), so each keystroke
+    costs a dictionary lookup rather than a query.
+    """
+    if field not in typeahead.FIELDS:
+        raise HTTPException(status_code=400, detail=f"field must be one of: {', '.join(typeahead.FIELDS)}")
+    index = await async_crud.get_typeahead_index(db)
+    return index.suggest(field, q, limit)
 
 
 # ─── Cold Message Endpoints ──────────────────────────────────────────
 
 @app.get("/cold-messages/statistics/", response_model=schemas.ColdMessageStats)
-def get_cold_message_stats(db: Session = Depends(get_db)):
-    return crud.get_cold_message_stats(db)
+async def get_cold_message_stats(db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_cold_message_stats(db)
 
 @app.post("/cold-messages/", response_model=schemas.ColdMessage)
-def create_cold_message(msg: schemas.ColdMessageCreate, db: Session = Depends(get_db)):
-    return crud.create_cold_message(db, msg)
+async def create_cold_message(msg: schemas.ColdMessageCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_cold_message(db, msg)
 
 @app.get("/cold-messages/", response_model=List[schemas.ColdMessage])
 def list_cold_messages(
@@ -405,28 +304,51 @@ def list_cold_messages(
     category: Optional[str] = None,
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return crud.get_cold_messages(db, search=search, via=via, category=category,
                                   sort_by=sort_by, sort_order=sort_order)
 
+@app.get("/cold-messages/page", response_model=schemas.ColdMessagePage)
+async def list_cold_messages_page(
+    search: Optional[str] = None,
+    via: Optional[str] = None,
+    category: Optional[str] = None,
+    sort_by: Optional[str] = "created_at",
+    sort_order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Cold message summaries (no message body / notes), one page at a time.
+
+    Pass the returned next_cursor as cursor to get the following page.
+    """
+    try:
+        return await async_crud.get_cold_message_page(
+            db, search=search, via=via, category=category,
+            sort_by=sort_by, sort_order=sort_order, cursor=cursor, limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/cold-messages/{msg_id}", response_model=schemas.ColdMessage)
-def get_cold_message(msg_id: int, db: Session = Depends(get_db)):
-    msg = crud.get_cold_message(db, msg_id)
+async def get_cold_message(msg_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    msg = await async_crud.get_cold_message(db, msg_id)
     if not msg:
         raise HTTPException(status_code=404, detail="Cold message not found")
     return msg
 
 @app.put("/cold-messages/{msg_id}", response_model=schemas.ColdMessage)
-def update_cold_message(msg_id: int, data: schemas.ColdMessageUpdate, db: Session = Depends(get_db)):
-    msg = crud.update_cold_message(db, msg_id, data)
+async def update_cold_message(msg_id: int, data: schemas.ColdMessageUpdate, db: AsyncSession = Depends(get_async_db)):
+    msg = await async_crud.update_cold_message(db, msg_id, data)
     if not msg:
         raise HTTPException(status_code=404, detail="Cold message not found")
     return msg
 
 @app.delete("/cold-messages/{msg_id}")
-def delete_cold_message(msg_id: int, db: Session = Depends(get_db)):
-    if not crud.delete_cold_message(db, msg_id):
+async def delete_cold_message(msg_id: int, db: AsyncSession = Depends(get_async_db)):
+    if not await async_crud.delete_cold_message(db, msg_id):
         raise HTTPException(status_code=404, detail="Cold message not found")
     return {"message": "Cold message deleted successfully"}
 
@@ -434,23 +356,23 @@ def delete_cold_message(msg_id: int, db: Session = Depends(get_db)):
 # ─── LinkedIn Connection Endpoints ───────────────────────────────────
 
 @app.get("/connections/statistics/", response_model=schemas.LinkedInConnectionStats)
-def get_connection_stats(db: Session = Depends(get_db)):
-    return crud.get_connection_stats(db)
+async def get_connection_stats(db: AsyncSession = Depends(get_async_read_db)):
+    return await async_crud.get_connection_stats(db)
 
 @app.post("/connections/", response_model=schemas.LinkedInConnection)
-def create_connection(data: schemas.LinkedInConnectionCreate, db: Session = Depends(get_db)):
-    return crud.create_connection(db, data)
+async def create_connection(data: schemas.LinkedInConnectionCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_connection(db, data)
 
 
 @app.get("/connections/check-duplicate")
-def check_connection_duplicate(
+async def check_connection_duplicate(
     name: str,
     company: Optional[str] = None,
     linkedin_url: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
 ):
     """Check if a connection already exists by name + company + LinkedIn URL."""
-    existing = crud.check_connection_duplicate(
+    existing = await async_crud.check_connection_duplicate(
         db,
         contact_name=name,
         company_name=company or None,
@@ -460,6 +382,36 @@ def check_connection_duplicate(
         return {"exists": True, "id": existing.id}
     return {"exists": False}
 
+MAX_DUPLICATE_CHECKS = 1000
+
+@app.post("/connections/check-duplicates", response_model=List[schemas.ConnectionDuplicateCheck])
+def check_connection_duplicates(
+    candidates: List[schemas.ConnectionCandidate],
+    db: Session = Depends(get_read_db),
+):
+    """Batch form of check-duplicate: one result per candidate, in order."""
+    if len(candidates) > MAX_DUPLICATE_CHECKS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_DUPLICATE_CHECKS} candidates per request")
+    matches = crud.check_connection_duplicates(db, candidates)
+    return [{"exists": match is not None, "id": match} for match in matches]
+
+@app.post("/connections/import")
+def import_connections(
+    file: UploadFile = File(...),
+    dry_run: bool = False,
+    db: Session = Depends(get_db),
+):
+    """Import the Connections.csv from LinkedIn's data export.
+
+    New people are added as accepted connections; known ones (matched by
+    profile URL, or name + company) are marked accepted. With dry_run the
+    report is computed but nothing is written.
+    """
+    try:
+        return linkedin_import.import_connections_csv(db, file.file, dry_run=dry_run)
+    except (ValueError, csv.Error) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/connections/", response_model=List[schemas.LinkedInConnection])
 def list_connections(
     search: Optional[str] = None,
@@ -469,212 +421,460 @@ def list_connections(
     stage: Optional[str] = None,
     sort_by: Optional[str] = "created_at",
     sort_order: Optional[str] = "desc",
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
 ):
     return crud.get_connections(
         db, search=search, status=status, category=category,
         cold_message_sent=cold_message_sent, stage=stage, sort_by=sort_by, sort_order=sort_order
     )
 
+@app.get("/connections/page", response_model=schemas.LinkedInConnectionPage)
+async def list_connections_page(
+    search: Optional[str] = None,
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    cold_message_sent: Optional[bool] = None,
+    stage: Optional[str] = None,
+    sort_by: Optional[str] = "created_at",
+    sort_order: Optional[str] = "desc",
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Connection summaries (no notes), one page at a time; see /cold-messages/page."""
+    try:
+        return await async_crud.get_connection_page(
+            db, search=search, status=status, category=category,
+            cold_message_sent=cold_message_sent, stage=stage,
+            sort_by=sort_by, sort_order=sort_order, cursor=cursor, limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/connections/{conn_id}", response_model=schemas.LinkedInConnection)
-def get_connection(conn_id: int, db: Session = Depends(get_db)):
-    conn = crud.get_connection(db, conn_id)
+async def get_connection(conn_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    conn = await async_crud.get_connection(db, conn_id)
     if not conn:
         raise HTTPException(status_code=404, detail="Connection not found")
     return conn
 
 @app.put("/connections/{conn_id}", response_model=schemas.LinkedInConnection)
-def update_connection(conn_id: int, data: schemas.LinkedInConnectionUpdate, db: Session = Depends(get_db)):
-    conn = crud.update_connection(db, conn_id, data)
+async def update_connection(conn_id: int, data: schemas.LinkedInConnectionUpdate, db: AsyncSession = Depends(get_async_db)):
+    conn = await async_crud.update_connection(db, conn_id, data)
     if not conn:
         raise HTTPException(status_code=404, detail="Connection not found")
     return conn
 
 @app.delete("/connections/{conn_id}")
-def delete_connection(conn_id: int, db: Session = Depends(get_db)):
-    if not crud.delete_connection(db, conn_id):
+async def delete_connection(conn_id: int, db: AsyncSession = Depends(get_async_db)):
+    if not await async_crud.delete_connection(db, conn_id):
         raise HTTPException(status_code=404, detail="Connection not found")
     return {"message": "Connection deleted successfully"}
 
 
+# ─── Due Queue ───────────────────────────────────────────────────────
+
+@app.get("/due", response_model=schemas.DuePage)
+async def list_due(
+    days: int = 7,
+    overdue: bool = False,
+    cursor: Optional[str] = None,
+    limit: int = pagination.DEFAULT_PAGE_SIZE,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """Application deadlines, interviews and connection follow-ups due from today
+    to `days` ahead (plus earlier ones with overdue), earliest first."""
+    try:
+        return await async_crud.get_due_items(db, days=days, overdue=overdue, cursor=cursor, limit=limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ─── Saved View Endpoints ────────────────────────────────────────────
+# Reads use the write session: a view whose members were invalidated (by a
+# backup merge) is rebuilt when it's next read.
+
+@app.get("/views", response_model=List[schemas.SavedView])
+async def list_saved_views(db: AsyncSession = Depends(get_async_db)):
+    """Saved application views with their match counts, for the sidebar."""
+    return await async_crud.get_saved_views(db)
+
+@app.post("/views", response_model=schemas.SavedView)
+async def create_saved_view(view: schemas.SavedViewCreate, db: AsyncSession = Depends(get_async_db)):
+    return await async_crud.create_saved_view(db, view)
+
+@app.get("/views/{view_id}", response_model=schemas.SavedView)
+async def get_saved_view(view_id: int, db: AsyncSession = Depends(get_async_db)):
+    view = await async_crud.get_saved_view(db, view_id)
+    if view is None:
+        raise HTTPException(status_code=404, detail="Saved view not found")
+    return view
+
+@app.get("/views/{view_id}/applications", response_model=List[schemas.JobApplication])
+async def get_saved_view_applications(
+    view_id: int,
+    skip: int = 0,
+    limit: int = 1000,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """The applications matching a saved view, read from its stored results."""
+    applications = await async_crud.get_saved_view_applications(db, view_id, skip=skip, limit=limit)
+    if applications is None:
+        raise HTTPException(status_code=404, detail="Saved view not found")
+    return applications
+
+@app.put("/views/{view_id}", response_model=schemas.SavedView)
+async def update_saved_view(view_id: int, data: schemas.SavedViewUpdate, db: AsyncSession = Depends(get_async_db)):
+    view = await async_crud.update_saved_view(db, view_id, data)
+    if view is None:
+        raise HTTPException(status_code=404, detail="Saved view not found")
+    return view
+
+@app.delete("/views/{view_id}")
+async def delete_saved_view(view_id: int, db: AsyncSession = Depends(get_async_db)):
+    if not await async_crud.delete_saved_view(db, view_id):
+        raise HTTPException(status_code=404, detail="Saved view not found")
+    return {"message": "Saved view deleted successfully"}
+
+
+# ─── Job Description Parsing ─────────────────────────────────────────
+
+@app.on_event("shutdown")
+def stop_jd_parser_pool():
+    jd_parser.shutdown_pool()
+
+@app.post("/jd/parse", response_model=schemas.ParsedJD)
+def parse_job_description(jd: schemas.JDText):
+    """Prefill fields from a pasted job description (the same heuristics as the JD parser dialog)."""
+    return jd_parser.parse_jd(jd.text)
+
+@app.post("/jd/parse-batch", response_model=List[schemas.ParsedJD])
+def parse_job_descriptions(jds: schemas.JDTexts):
+    """Parse many descriptions at once (up to 1000), in order; large batches use every core."""
+    return jd_parser.parse_many(jds.texts)
+
+@app.post("/jd/backfill", response_model=schemas.JDBackfillReport)
+def backfill_from_job_descriptions(dry_run: bool = False, db: Session = Depends(get_db)):
+    """Fill empty salary, location and work type fields from the stored job descriptions.
+
+    Fields that already have a value are never changed. With dry_run the
+    report is computed but nothing is written.
+    """
+    return jd_parser.backfill(db, dry_run=dry_run)
+
+
+# ─── Skill Analytics ─────────────────────────────────────────────────
+
+@app.get("/skills/top", response_model=List[schemas.SkillGroup])
+async def top_skills(
+    by: str = "status",
+    groups: Optional[str] = None,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_read_db),
+):
+    """The most common skills in job descriptions per status (or domain).
+
+    groups is an optional comma-separated list, e.g. "Interview,Rejected" to
+    compare postings that got an interview with ones that were rejected.
+    """
+    wanted = [g.strip() for g in groups.split(",") if g.strip()] if groups else None
+    try:
+        return await async_crud.top_skills(db, by=by, limit=max(1, min(limit, 50)), groups=wanted)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/skills/applications", response_model=List[schemas.SkillApplication])
+async def applications_with_skill(skill: str, limit: int = 100, db: AsyncSession = Depends(get_async_read_db)):
+    """Applications whose job description mentions a skill, most mentions first."""
+    return await async_crud.applications_with_skill(db, skill, limit=max(1, min(limit, 1000)))
+
+
+# ─── Company Endpoints ───────────────────────────────────────────────
+
+@app.get("/companies/search", response_model=List[schemas.CompanyMatch])
+async def search_companies(q: str, limit: int = 10, db: AsyncSession = Depends(get_async_read_db)):
+    """Companies with names similar to q ("google llc" finds "Google"), best match first."""
+    return await async_crud.search_companies(db, q, limit=max(1, min(limit, 50)))
+
+@app.get("/companies/{company_id}", response_model=schemas.CompanyDetail)
+async def get_company(company_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    """A company with all of its applications, cold messages and connections."""
+    company = await async_crud.get_company(db, company_id)
+    if company is None:
+        raise HTTPException(status_code=404, detail="Company not found")
+    return company
+
+
+# ─── Upload Maintenance ──────────────────────────────────────────────
+
+@app.post("/api/uploads/gc")
+def collect_upload_garbage(
+    dry_run: bool = True,
+    delete: bool = False,
+    min_age_minutes: int = 60,
+):
+    """Find uploaded files no application references and quarantine (or delete) them."""
+    # Uploads are shared between users, so every database's references count
+    with all_database_sessions() as sessions:
+        return uploads.collect_garbage(
+            sessions, dry_run=dry_run, quarantine=not delete, min_age_seconds=min_age_minutes * 60
+        )
+
+@app.post("/api/uploads/reshard")
+def reshard_uploads(db: Session = Depends(get_db)):
+    """Move documents from the old flat upload folders into the sharded layout."""
+    return uploads.reshard_uploads(db)
+
+
 # Backup and Restore endpoints
+# With MULTI_TENANT these act on the requesting user's database (db_path) and
+# keep that user's snapshots and incremental backups in their own folders.
+
+def _safety_copy_path(db_path: Optional[str]) -> str:
+    return f"{db_path or DB_PATH}.bak_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+
 @app.get("/api/backup")
-def backup_database():
-    """Download the current database file backup"""
-    db_path = "job_tracker.db"
-    
-    if not os.path.exists(db_path):
+def backup_database(compression: str = "none", db_path: Optional[str] = Depends(get_db_path)):
+    """Download a consistent snapshot of the database (optionally gzip/zstd compressed)"""
+    try:
+        backup.check_compression(compression)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if db_path and not os.path.exists(db_path):
         raise HTTPException(status_code=404, detail="Database file not found")
+
+    # Snapshot via the SQLite backup API (or a consistent dump on other
+    # backends) so concurrent writes can't tear the copy
+    with restore_coordinator_for(db_path).checkout():
+        snapshot_path = dump.snapshot_to_tempfile(db_path=db_path)
         
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"job_tracker_backup_{timestamp}.db"
+    filename = f"job_tracker_backup_{timestamp}.db{backup.COMPRESSION_SUFFIXES[compression]}"
     
-    return FileResponse(
-        path=db_path,
-        filename=filename,
-        media_type="application/octet-stream"
+    return StreamingResponse(
+        backup.iter_file(snapshot_path, compression),
+        media_type="application/octet-stream",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+        background=BackgroundTask(os.remove, snapshot_path),
     )
 
-@app.post("/api/restore/preview")
-async def preview_restore(file: UploadFile = File(...)):
-    """Compare a backup .db file against the current database and return a diff summary."""
-    import tempfile, os as _os
+# ─── Scheduled Snapshots ─────────────────────────────────────────────
 
-    if not file.filename.endswith('.db'):
-        raise HTTPException(status_code=400, detail="Invalid file format. Please upload a .db file")
+@app.on_event("startup")
+def start_backup_scheduler():
+    backup_scheduler.start()
+
+@app.on_event("shutdown")
+def stop_backup_scheduler():
+    backup_scheduler.stop()
+
+@app.get("/api/backups/snapshots")
+def list_snapshots(tenant: Optional[str] = Depends(request_tenant)):
+    """List scheduled snapshots, newest first."""
+    return backup_scheduler_module.list_snapshots(tenant_dir(backup_scheduler.config.backup_dir, tenant))
 
-    # Save uploaded file to a temp location
-    with tempfile.NamedTemporaryFile(suffix='.db', delete=False) as tmp:
-        tmp_path = tmp.name
-        shutil.copyfileobj(file.file, tmp)
+# get_db_path creates a new user's database before it is snapshotted
+@app.post("/api/backups/snapshots", dependencies=[Depends(get_db_path)])
+def create_snapshot(tenant: Optional[str] = Depends(request_tenant)):
+    """Take a snapshot now and apply the retention policy."""
+    try:
+        return backup_scheduler_module.run_backup_cycle(backup_scheduler.config, tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
+@app.get("/api/backups/snapshots/{name}")
+def download_snapshot(name: str, tenant: Optional[str] = Depends(request_tenant)):
     try:
-        # Validate the backup file
-        try:
-            backup_conn = sqlite3.connect(f"file:{tmp_path}?mode=ro", uri=True)
-            cursor = backup_conn.cursor()
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='job_applications'")
-            if not cursor.fetchone():
-                raise ValueError("Not a valid Job Application Manager database (missing job_applications table).")
-        except sqlite3.DatabaseError:
-            raise ValueError("The uploaded file is not a valid SQLite database.")
-
-        # Read backup applications
-        cursor.execute("""
-            SELECT id, company_name, job_title, status, application_date
-            FROM job_applications
-        """)
-        backup_rows = cursor.fetchall()
-        backup_conn.close()
-
-        # Read current applications
-        current_db_path = "job_tracker.db"
-        current_conn = sqlite3.connect(f"file:{current_db_path}?mode=ro", uri=True)
-        cur2 = current_conn.cursor()
-        cur2.execute("""
-            SELECT id, company_name, job_title, status, application_date
-            FROM job_applications
-        """)
-        current_rows = cur2.fetchall()
-        current_conn.close()
-
-        # Build lookup sets by id
-        backup_by_id = {row[0]: row for row in backup_rows}
-        current_by_id = {row[0]: row for row in current_rows}
-
-        backup_ids = set(backup_by_id.keys())
-        current_ids = set(current_by_id.keys())
-
-        # Applications in backup but not in current = will be "added back"
-        added_ids = backup_ids - current_ids
-        # Applications in current but not in backup = will be removed
-        removed_ids = current_ids - backup_ids
-        # Applications in both
-        unchanged_ids = backup_ids & current_ids
-
-        def row_to_dict(row):
-            return {
-                "id": row[0],
-                "company_name": row[1],
-                "job_title": row[2],
-                "status": row[3],
-                "application_date": row[4],
-            }
+        path = backup_scheduler_module.snapshot_path(tenant_dir(backup_scheduler.config.backup_dir, tenant), name)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return FileResponse(path=path, filename=name, media_type="application/octet-stream")
+
+
+# ─── Incremental Backups ─────────────────────────────────────────────
 
+@app.post("/api/backups/incremental")
+def create_incremental_backup(
+    full: bool = False,
+    tenant: Optional[str] = Depends(request_tenant),
+    db_path: Optional[str] = Depends(get_db_path),
+):
+    """Store only the rows and uploads that changed since the previous backup."""
+    with restore_coordinator_for(db_path).checkout(), dump.database_file(db_path) as db_file:
+        return incremental.create_backup(
+            db_file, uploads.UPLOAD_ROOT, root=tenant_dir(incremental.INCREMENTAL_ROOT, tenant), full=full
+        )
+
+@app.get("/api/backups/incremental")
+def list_incremental_backups(tenant: Optional[str] = Depends(request_tenant)):
+    return incremental.list_backups(root=tenant_dir(incremental.INCREMENTAL_ROOT, tenant))
+
+@app.post("/api/backups/incremental/{backup_id}/restore")
+def restore_incremental_backup(
+    backup_id: str,
+    restore_files: bool = True,
+    tenant: Optional[str] = Depends(request_tenant),
+    db_path: Optional[str] = Depends(get_db_path),
+):
+    """Replay a backup chain into a new database file and swap it in."""
+    temp_path = f"temp_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+    backup_path = _safety_copy_path(db_path)
+    root = tenant_dir(incremental.INCREMENTAL_ROOT, tenant)
+    try:
+        upload_manifest = incremental.materialize(backup_id, temp_path, root=root)
+        restore.check_integrity(temp_path)
+        migration.migrate_database(temp_path)
+        restore.refresh_derived_tables(temp_path)
+        restore.replace_database(temp_path, backup_path, db_path=db_path)
+        restored_files = (
+            incremental.restore_uploads(upload_manifest, uploads.UPLOAD_ROOT, root=root) if restore_files else 0
+        )
         return {
-            "current_count": len(current_rows),
-            "backup_count": len(backup_rows),
-            "to_add": len(added_ids),
-            "to_remove": len(removed_ids),
-            "unchanged": len(unchanged_ids),
-            "added_items": [row_to_dict(backup_by_id[i]) for i in sorted(added_ids)],
-            "removed_items": [row_to_dict(current_by_id[i]) for i in sorted(removed_ids)],
+            "message": f"Database restored to backup {backup_id}. Please refresh the page.",
+            "restored_files": restored_files,
         }
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except DatabaseUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error restoring backup: {str(e)}")
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+@app.post("/api/restore/preview")
+async def preview_restore(file: UploadFile = File(...), db_path: Optional[str] = Depends(get_db_path)):
+    """Compare a backup .db file against the current database and return a diff summary.
+
+    All three tables are compared by per-row content hash. The uploaded file is
+    kept under the returned preview_id so further diff pages can be fetched.
+    """
+    if backup.compression_for_filename(file.filename) is None:
+        raise HTTPException(status_code=400, detail="Invalid file format. Please upload a .db file")
 
+    try:
+        preview_id = restore.store_preview(file.file, file.filename)
+        with dump.database_file(db_path) as current:
+            result = restore.build_preview(current, restore.preview_path(preview_id))
+        result["preview_id"] = preview_id
+        return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Preview failed: {str(e)}")
-    finally:
-        _os.unlink(tmp_path)
+
+
+@app.get("/api/restore/preview/{preview_id}")
+def preview_restore_page(
+    preview_id: str,
+    table: str = "job_applications",
+    kind: str = "modified",
+    offset: int = 0,
+    limit: int = restore.DEFAULT_PAGE_SIZE,
+    db_path: Optional[str] = Depends(get_db_path),
+):
+    """Fetch one page of added / removed / modified rows for a stored restore preview."""
+    try:
+        with dump.database_file(db_path) as current:
+            return restore.preview_diff(current, restore.preview_path(preview_id), table, kind, offset, limit)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@app.delete("/api/restore/preview/{preview_id}")
+def discard_restore_preview(preview_id: str):
+    restore.discard_preview(preview_id)
+    return {"message": "Restore preview discarded"}
+
+
+@app.post("/api/restore/merge")
+def merge_restore(
+    file: Optional[UploadFile] = File(None),
+    preview_id: Optional[str] = Form(None),
+    policy: str = Form("newest"),
+    tables: Optional[str] = Form(None),
+    db_path: Optional[str] = Depends(get_db_path),
+):
+    """Merge rows from a backup into the current database without replacing it.
+
+    Accepts either an uploaded backup or the preview_id of an earlier restore
+    preview. Conflicting rows are resolved by policy: newest, keep_current or
+    keep_backup.
+    """
+    if file is None and not preview_id:
+        raise HTTPException(status_code=400, detail="Upload a backup file or pass a preview_id")
+    if policy not in restore.MERGE_POLICIES:
+        raise HTTPException(status_code=400, detail=f"Unknown merge policy '{policy}'. Use one of: {', '.join(restore.MERGE_POLICIES)}")
+
+    try:
+        if preview_id:
+            backup_path = restore.preview_path(preview_id)
+        else:
+            if backup.compression_for_filename(file.filename) is None:
+                raise ValueError("Invalid file format. Please upload a .db file")
+            preview_id = restore.store_preview(file.file, file.filename)
+            backup_path = restore.preview_path(preview_id)
+
+        # Keep a snapshot of the current DB just in case
+        backup_copy = _safety_copy_path(db_path)
+        table_list = [t.strip() for t in tables.split(",") if t.strip()] if tables else None
+        results = restore.merge_into_database(
+            backup_path, backup_copy, policy=policy, tables=table_list, db_path=db_path
+        )
+        return {"message": "Backup merged successfully. Please refresh the page.", "policy": policy, "tables": results}
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except DatabaseUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error merging backup: {str(e)}")
 
 
 @app.post("/api/restore")
+def restore_database(file: UploadFile = File(...), db_path: Optional[str] = Depends(get_db_path)):
+    """Replace the database with an uploaded backup without downtime.
 
-async def restore_database(file: UploadFile = File(...)):
-    """Restore database from uploaded file with validation"""
-    if not file.filename.endswith('.db'):
+    The upload is validated and migrated on the side; then new requests are
+    held back, in-flight ones drained, and the file swapped in atomically.
+    """
+    if backup.compression_for_filename(file.filename) is None:
         raise HTTPException(status_code=400, detail="Invalid file format. Please upload a .db file")
     
-    db_path = "job_tracker.db"
     temp_path = f"temp_restore_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-    backup_path = f"job_tracker.db.bak_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    backup_path = _safety_copy_path(db_path)
     
     try:
-        # 1. Save uploaded file to a temporary location
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
+        # 1. Save uploaded file (decompressing .gz / .zst backups) next to the live DB
+        backup.save_uploaded_backup(file.file, file.filename, temp_path)
             
         # 2. Validate the database file
-        try:
-            conn = sqlite3.connect(temp_path)
-            cursor = conn.cursor()
-            
-            # Check if it's a valid SQLite DB and has the main table
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='job_applications'")
-            if not cursor.fetchone():
-                conn.close()
-                raise ValueError("The uploaded file does not appear to be a valid Job Application Manager database (missing job_applications table).")
-                
-            conn.close()
-            
-        except sqlite3.DatabaseError:
-            raise ValueError("The uploaded file is not a valid SQLite database.")
-            
-        # 3. Create a backup of the current DB just in case
-        if os.path.exists(db_path):
-            shutil.copy2(db_path, backup_path)
-            
-        # CRITICAL FIX: Close all database connections before swapping the file
-        # On Linux: Prevents reading from the old 'ghost' file handle
-        # On Windows: Prevents PermissionError because the file is locked
-        engine.dispose()
-            
-        # 4. Apply the new database
-        try:
-            shutil.move(temp_path, db_path)
-        except PermissionError:
-            # Retry mechanism for Windows if file is still briefly locked
-            import time
-            time.sleep(0.5)
-            try:
-                 shutil.move(temp_path, db_path)
-            except Exception as e:
-                # If we can't move it, try copy and delete
-                shutil.copy2(temp_path, db_path)
-                os.remove(temp_path)
-
-        # 5. Run migration to ensure schema compatibility
-        try:
-            print("Running post-restore migration...")
-            migration.migrate_database()
-        except Exception as e:
-            print(f"Post-restore migration failed: {e}")
+        restore.validate_backup_file(temp_path)
+        restore.check_integrity(temp_path)
+
+        # 3. Bring its schema up to date before it goes live
+        print("Running pre-swap migration on restored database...")
+        migration.migrate_database(temp_path)
+
+        # 4. Snapshot the current DB and swap the new one in (draining
+        #    sessions on SQLite, in one transaction on other backends)
+        restore.replace_database(temp_path, backup_path, db_path=db_path)
             
         return {"message": "Database restored successfully. Please refresh the page."}
         
     except ValueError as e:
-        # Invalid file - clean up temp and return error
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
         raise HTTPException(status_code=400, detail=str(e))
-        
+    except DatabaseUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        # Unexpected error - try to restore from backup
+        raise HTTPException(status_code=500, detail=f"Error restoring database: {str(e)}")
+    finally:
+        # The live DB is only ever touched by the atomic swap, so cleanup is all that's left
         if os.path.exists(temp_path):
             os.remove(temp_path)
-        if os.path.exists(backup_path) and os.path.exists(db_path):
-            # If we messed up the main DB, try to restore
-             shutil.copy2(backup_path, db_path)
-             
-        raise HTTPException(status_code=500, detail=f"Error restoring database: {str(e)}")
@@ -1,261 +1,372 @@
 """
 Database migration script to add new fields to existing database
 Run this script to update your database schema without losing data
+
+Migrations are versioned: applied steps are recorded in the schema_version
+table, so an up-to-date database costs one query and no probing. Works on
+SQLite and PostgreSQL: schema inspection goes through SQLAlchemy and new
+columns are declared with the models' own types compiled for the target
+database.
 """
-import sqlite3
 import json
 from datetime import datetime
 import os
 
-def migrate_database():
+from sqlalchemy import create_engine, event, func, inspect, select, text
+from sqlalchemy.schema import AddConstraint
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.pool import NullPool
+
+from . import companies, links, models, normalize, skills
+from .database import DB_PATH
+from .locks import file_lock
+
+# Columns added to existing tables over time: (table, column, SQL default)
+ADDED_COLUMNS = [
+    ("job_applications", "status_history", None),
+    ("job_applications", "references", None),
+    ("job_applications", "application_deadline", None),
+    ("job_applications", "job_description", None),
+    ("job_applications", "tags", None),
+    ("job_applications", "is_archived", "0"),
+    ("job_applications", "interview_notes", None),
+    ("job_applications", "interview_questions", None),
+    ("job_applications", "interview_date", None),
+    ("job_applications", "applied_on", None),
+    ("job_applications", "networking_contacts", None),
+    ("job_applications", "contact_linkedin", None),
+    ("job_applications", "contact_cold_message_sent", "FALSE"),
+    ("job_applications", "contact_cold_message_via", None),
+    ("job_applications", "contact_cold_contact_category", None),
+    ("job_applications", "contact_cold_contact_email", None),
+    ("job_applications", "contact_cold_message_body", None),
+    ("cold_messages", "connection_id", None),
+    ("linkedin_connections", "stage", "'Requested'"),
+]
+
+# Tables added after the first release, created from their models when missing
+ADDED_TABLES = [models.ColdMessage.__table__, models.LinkedInConnection.__table__]
+
+
+def _default_db_path():
     # Handle different execution contexts (running as script vs imported)
     db_path = 'job_tracker.db'
     if not os.path.exists(db_path) and os.path.exists(os.path.join('..', db_path)):
-         # If running from app directory
+        # If running from app directory
         db_path = '../job_tracker.db'
     elif not os.path.exists(db_path) and os.path.exists(os.path.join('backend', db_path)):
-         # If running from project root
+        # If running from project root
         db_path = 'backend/job_tracker.db'
-        
-    print(f"Connecting to database at: {db_path}")
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    print("Starting database migration...")
-    
-    # Check if status_history column exists
-    cursor.execute("PRAGMA table_info(job_applications)")
-    columns = [column[1] for column in cursor.fetchall()]
-    
-    # Add status_history column if it doesn't exist
-    if 'status_history' not in columns:
-        print("Adding status_history column...")
-        cursor.execute("ALTER TABLE job_applications ADD COLUMN status_history TEXT")
-        
-        # Initialize status_history for existing records
-        cursor.execute("SELECT id, status, application_date, created_at FROM job_applications WHERE status_history IS NULL")
-        for row in cursor.fetchall():
-            app_id, status, app_date, created_at = row
-            date_to_use = app_date if app_date else created_at
-            initial_history = json.dumps([{
-                "status": status or "Applied",
-                "date": date_to_use if date_to_use else datetime.now().isoformat(),
-                "notes": "Initial status (migrated)"
-            }])
-            cursor.execute("UPDATE job_applications SET status_history = ? WHERE id = ?", (initial_history, app_id))
-        
-        print("STATUS: status_history column added and initialized")
-    else:
-        print("STATUS: status_history column already exists")
-    
-    # Add references column if it doesn't exist
-    if 'references' not in columns:
-        print("Adding references column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN "references" TEXT')
-        print("STATUS: references column added")
-    else:
-        print("STATUS: references column already exists")
-    
-    # Add application_deadline column if it doesn't exist
-    if 'application_deadline' not in columns:
-        print("Adding application_deadline column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN application_deadline TIMESTAMP')
-        print("STATUS: application_deadline column added")
-    else:
-        print("STATUS: application_deadline column already exists")
-    
-    # Add job_description column if it doesn't exist
-    if 'job_description' not in columns:
-        print("Adding job_description column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN job_description TEXT')
-        print("STATUS: job_description column added")
-    else:
-        print("STATUS: job_description column already exists")
-    
-    # Add tags column if it doesn't exist
-    if 'tags' not in columns:
-        print("Adding tags column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN tags JSON')
-        print("STATUS: tags column added")
-    else:
-        print("STATUS: tags column already exists")
-    
-    # Add is_archived column if it doesn't exist
-    if 'is_archived' not in columns:
-        print("Adding is_archived column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN is_archived INTEGER DEFAULT 0')
-        print("STATUS: is_archived column added")
-    else:
-        print("STATUS: is_archived column already exists")
-    
-    # Add interview_notes column if it doesn't exist
-    if 'interview_notes' not in columns:
-        print("Adding interview_notes column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN interview_notes TEXT')
-        print("STATUS: interview_notes column added")
-    else:
-        print("STATUS: interview_notes column already exists")
-    
-    # Add interview_questions column if it doesn't exist
-    if 'interview_questions' not in columns:
-        print("Adding interview_questions column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN interview_questions TEXT')
-        print("STATUS: interview_questions column added")
-    else:
-        print("STATUS: interview_questions column already exists")
-    
-    # Add interview_date column if it doesn't exist
-    if 'interview_date' not in columns:
-        print("Adding interview_date column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN interview_date TIMESTAMP')
-        print("STATUS: interview_date column added")
-    else:
-        print("STATUS: interview_date column already exists")
-    
-    # Add applied_on column if it doesn't exist
-    if 'applied_on' not in columns:
-        print("Adding applied_on column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN applied_on TEXT')
-        print("STATUS: applied_on column added")
-    else:
-        print("STATUS: applied_on column already exists")
-
-    # Add networking_contacts column if it doesn't exist
-    if 'networking_contacts' not in columns:
-        print("Adding networking_contacts column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN networking_contacts JSON')
-        print("STATUS: networking_contacts column added")
-    else:
-        print("STATUS: networking_contacts column already exists")
-
-    # Add contact_linkedin column if it doesn't exist
-    if 'contact_linkedin' not in columns:
-        print("Adding contact_linkedin column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_linkedin TEXT')
-        print("STATUS: contact_linkedin column added")
-    else:
-        print("STATUS: contact_linkedin column already exists")
-
-    # Add contact_cold_message_sent column if it doesn't exist
-    if 'contact_cold_message_sent' not in columns:
-        print("Adding contact_cold_message_sent column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_cold_message_sent BOOLEAN DEFAULT 0')
-        print("STATUS: contact_cold_message_sent column added")
-    else:
-        print("STATUS: contact_cold_message_sent column already exists")
-
-    # Add contact_cold_message_via column if it doesn't exist
-    if 'contact_cold_message_via' not in columns:
-        print("Adding contact_cold_message_via column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_cold_message_via TEXT')
-        print("STATUS: contact_cold_message_via column added")
-    else:
-        print("STATUS: contact_cold_message_via column already exists")
-
-    # Add contact_cold_contact_category column if it doesn't exist
-    if 'contact_cold_contact_category' not in columns:
-        print("Adding contact_cold_contact_category column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_cold_contact_category TEXT')
-        print("STATUS: contact_cold_contact_category column added")
-    else:
-        print("STATUS: contact_cold_contact_category column already exists")
-
-    # Add contact_cold_contact_email column if it doesn't exist
-    if 'contact_cold_contact_email' not in columns:
-        print("Adding contact_cold_contact_email column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_cold_contact_email TEXT')
-        print("STATUS: contact_cold_contact_email column added")
-    else:
-        print("STATUS: contact_cold_contact_email column already exists")
-
-    # Add contact_cold_message_body column if it doesn't exist
-    if 'contact_cold_message_body' not in columns:
-        print("Adding contact_cold_message_body column...")
-        cursor.execute('ALTER TABLE job_applications ADD COLUMN contact_cold_message_body TEXT')
-        print("STATUS: contact_cold_message_body column added")
-    else:
-        print("STATUS: contact_cold_message_body column already exists")
-
-    # ─── Create cold_messages table if it doesn't exist ─────────────────
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='cold_messages'")
-    if not cursor.fetchone():
-        print("Creating cold_messages table...")
-        cursor.execute("""
-            CREATE TABLE cold_messages (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contact_name TEXT NOT NULL,
-                company_name TEXT,
-                contact_email TEXT,
-                contact_linkedin TEXT,
-                via TEXT NOT NULL,
-                category TEXT,
-                subject TEXT,
-                message_body TEXT,
-                sent_date TIMESTAMP,
-                got_reply BOOLEAN DEFAULT 0,
-                notes TEXT,
-                connection_id INTEGER,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP
-            )
-        """)
-        print("STATUS: cold_messages table created")
-    else:
-        print("STATUS: cold_messages table already exists")
-        # Add connection_id column if it doesn't exist yet
-        cursor.execute("PRAGMA table_info(cold_messages)")
-        cm_columns = [col[1] for col in cursor.fetchall()]
-        if 'connection_id' not in cm_columns:
-            print("Adding connection_id column to cold_messages...")
-            cursor.execute("ALTER TABLE cold_messages ADD COLUMN connection_id INTEGER")
-            print("STATUS: connection_id column added to cold_messages")
+    return db_path
+
+
+def _add_column(conn, table: str, column: str, default):
+    model_column = models.Base.metadata.tables[table].c[column]
+    quote = conn.dialect.identifier_preparer.quote
+    ddl = f"ALTER TABLE {quote(table)} ADD COLUMN {quote(column)} {model_column.type.compile(dialect=conn.dialect)}"
+    if default is not None:
+        ddl += f" DEFAULT {default}"
+    conn.execute(text(ddl))
+
+
+def _initialize_status_history(conn):
+    # Seed status_history for existing records from their current status
+    rows = conn.execute(text(
+        "SELECT id, status, application_date, created_at FROM job_applications WHERE status_history IS NULL"
+    )).fetchall()
+    for app_id, status, app_date, created_at in rows:
+        date_to_use = app_date if app_date else created_at
+        initial_history = json.dumps([{
+            "status": status or "Applied",
+            "date": str(date_to_use) if date_to_use else datetime.now().isoformat(),
+            "notes": "Initial status (migrated)"
+        }])
+        conn.execute(
+            text("UPDATE job_applications SET status_history = :history WHERE id = :id"),
+            {"history": initial_history, "id": app_id},
+        )
+
+
+def _legacy_schema(conn):
+    """Columns and tables added before migrations were versioned.
+
+    Databases from that time carry no schema_version rows, so every change is
+    probed for individually.
+    """
+    existing_tables = set(inspect(conn).get_table_names())
+    for table in ADDED_TABLES:
+        if table.name not in existing_tables:
+            print(f"Creating {table.name} table...")
+            table.create(conn)
+            existing_tables.add(table.name)
+            print(f"STATUS: {table.name} table created")
         else:
-            print("STATUS: cold_messages.connection_id already exists")
-
-
-    # ─── Create linkedin_connections table if it doesn't exist ────────────
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='linkedin_connections'")
-    if not cursor.fetchone():
-        print("Creating linkedin_connections table...")
-        cursor.execute("""
-            CREATE TABLE linkedin_connections (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                contact_name TEXT NOT NULL,
-                linkedin_profile_id TEXT,
-                company_name TEXT,
-                category TEXT,
-                connection_status TEXT DEFAULT 'Pending',
-                requested_on TIMESTAMP,
-                accepted_on TIMESTAMP,
-                cold_message_sent BOOLEAN DEFAULT 0,
-                cold_message_id INTEGER,
-                follow_up_date TIMESTAMP,
-                notes TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP
-            )
-        """)
-        print("STATUS: linkedin_connections table created")
-    else:
-        print("STATUS: linkedin_connections table already exists")
-        # Add stage column if it doesn't exist
-        cursor.execute("PRAGMA table_info(linkedin_connections)")
-        lc_columns = [col[1] for col in cursor.fetchall()]
-        if 'stage' not in lc_columns:
-            print("Adding stage column to linkedin_connections...")
-            cursor.execute("ALTER TABLE linkedin_connections ADD COLUMN stage TEXT DEFAULT 'Requested'")
+            print(f"STATUS: {table.name} table already exists")
+
+    columns = {}
+    for table, column, default in ADDED_COLUMNS:
+        if table not in existing_tables:
+            continue
+        if table not in columns:
+            columns[table] = {c["name"] for c in inspect(conn).get_columns(table)}
+        label = column if table == "job_applications" else f"{table}.{column}"
+        if column in columns[table]:
+            print(f"STATUS: {label} column already exists")
+            continue
+        print(f"Adding {label} column...")
+        _add_column(conn, table, column, default)
+        columns[table].add(column)
+        if (table, column) == ("job_applications", "status_history"):
+            _initialize_status_history(conn)
+        elif (table, column) == ("linkedin_connections", "stage"):
             # Existing connections were manually added (request already sent) — set to 'Requested'
-            cursor.execute("UPDATE linkedin_connections SET stage = 'Requested' WHERE stage IS NULL")
-            print("STATUS: stage column added to linkedin_connections")
-        else:
-            print("STATUS: linkedin_connections.stage already exists")
+            conn.execute(text("UPDATE linkedin_connections SET stage = 'Requested' WHERE stage IS NULL"))
+        print(f"STATUS: {label} column added")
+
+
+def _create_indexes(conn, *names: str):
+    """Create model-declared indexes that an existing database lacks."""
+    for table in models.Base.metadata.sorted_tables:
+        for index in table.indexes:
+            if index.name in names:
+                index.create(conn, checkfirst=True)
+                print(f"STATUS: {index.name} index ready")
+
+
+def _outreach_filter_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_cold_messages_via",
+        "ix_cold_messages_category",
+        "ix_linkedin_connections_category",
+        "ix_linkedin_connections_connection_status",
+        "ix_linkedin_connections_stage",
+        "ix_linkedin_connections_cold_message_sent",
+    )
+
+
+def backfill_connection_keys(conn, only_missing: bool = True, batch_size: int = 1000):
+    """Fill the normalised key columns of linkedin_connections from the raw fields."""
+    sql = "SELECT id, contact_name, company_name, linkedin_profile_id FROM linkedin_connections"
+    if only_missing:
+        sql += " WHERE name_key IS NULL"
+    rows = conn.execute(text(sql)).fetchall()
+    update = text(
+        "UPDATE linkedin_connections SET name_key = :name_key, company_key = :company_key,"
+        " linkedin_slug = :linkedin_slug WHERE id = :id"
+    )
+    for start in range(0, len(rows), batch_size):
+        conn.execute(update, [
+            dict(normalize.connection_keys(name, company, linkedin), id=row_id)
+            for row_id, name, company, linkedin in rows[start:start + batch_size]
+        ])
+    return len(rows)
+
+
+def _connection_keys(conn):
+    # Present already if step 1 just created the table from the model
+    existing = {c["name"] for c in inspect(conn).get_columns("linkedin_connections")}
+    for column in ("name_key", "company_key", "linkedin_slug"):
+        if column not in existing:
+            _add_column(conn, "linkedin_connections", column, None)
+    print(f"STATUS: normalised keys filled for {backfill_connection_keys(conn)} connections")
+    _create_indexes(conn, "ix_linkedin_connections_dedupe")
+
+
+def _message_links(conn):
+    """Repair cold message <-> connection links, then index and constrain them.
+
+    SQLite can't add a constraint to an existing table, so there the foreign
+    keys only come with newly created databases; the links are still kept
+    consistent by crud.py and links.repair_links().
+    """
+    report = links.apply_repairs(conn)
+    print(f"STATUS: {sum(report.values())} cold message / connection links repaired")
+    _create_indexes(conn, "ix_cold_messages_connection_id", "ix_linkedin_connections_cold_message_id")
+    _add_foreign_keys(conn, "cold_messages", "linkedin_connections")
+
+
+def _add_foreign_keys(conn, *tables: str):
+    """Add model-declared foreign keys that an existing database lacks (not on SQLite)."""
+    if conn.dialect.name == "sqlite":
+        return
+    for name in tables:
+        table = models.Base.metadata.tables[name]
+        existing = {fk["name"] for fk in inspect(conn).get_foreign_keys(name)}
+        for constraint in table.foreign_key_constraints:
+            if constraint.name not in existing:
+                conn.execute(AddConstraint(constraint))
+                print(f"STATUS: {constraint.name} constraint added")
+
+
+def _companies(conn):
+    """Link applications, cold messages and connections to the companies table.
+
+    The companies and company_ngrams tables were created from the models
+    before the steps ran; the foreign keys are added as in _message_links.
+    """
+    for table in companies.LINKED_TABLES:
+        if "company_id" not in {c["name"] for c in inspect(conn).get_columns(table)}:
+            _add_column(conn, table, "company_id", None)
+    _create_indexes(conn, *(f"ix_{table}_company_id" for table in companies.LINKED_TABLES))
+    print(f"STATUS: {companies.link_missing(conn)} rows linked to companies")
+    _add_foreign_keys(conn, *companies.LINKED_TABLES)
 
-    conn.commit()
-    conn.close()
 
-    
+def _due_indexes(conn):
+    _create_indexes(
+        conn,
+        "ix_job_applications_application_deadline",
+        "ix_job_applications_interview_date",
+        "ix_linkedin_connections_follow_up_date",
+    )
+
+
+def backfill_job_url_keys(conn, only_missing: bool = True, batch_size: int = 1000):
+    """Fill job_applications.job_url_key from job_url."""
+    sql = "SELECT id, job_url FROM job_applications WHERE job_url IS NOT NULL"
+    if only_missing:
+        sql += " AND job_url_key IS NULL"
+    rows = conn.execute(text(sql)).fetchall()
+    update = text("UPDATE job_applications SET job_url_key = :job_url_key WHERE id = :id")
+    for start in range(0, len(rows), batch_size):
+        conn.execute(update, [
+            {"job_url_key": normalize.job_url_key(url), "id": row_id}
+            for row_id, url in rows[start:start + batch_size]
+        ])
+    return len(rows)
+
+
+def _job_url_keys(conn):
+    if "job_url_key" not in {c["name"] for c in inspect(conn).get_columns("job_applications")}:
+        _add_column(conn, "job_applications", "job_url_key", None)
+    print(f"STATUS: job URL keys filled for {backfill_job_url_keys(conn)} applications")
+    _create_indexes(conn, "ix_job_applications_job_url_key")
+
+
+def _saved_views(conn):
+    """Nothing to backfill: saved_views and saved_view_members were created
+    from the models and start out empty."""
+
+
+def _application_skills(conn):
+    print(f"STATUS: skills indexed for {skills.reindex(conn)} job descriptions")
+
+
+def _sort_indexes(conn):
+    _create_indexes(
+        conn,
+        *(f"ix_cold_messages_{key}_id" for key in models.COLD_MESSAGE_SORT_KEYS),
+        *(f"ix_linkedin_connections_{key}_id" for key in models.CONNECTION_SORT_KEYS),
+    )
+
+
+# Ordered migration steps: (version, description, function(conn)). Append new
+# steps with the next version number; never renumber or edit applied ones.
+MIGRATIONS = [
+    (1, "Columns and tables added before versioned migrations", _legacy_schema),
+    (2, "Indexes on the cold message and connection filter columns", _outreach_filter_indexes),
+    (3, "Normalised duplicate-check keys for connections", _connection_keys),
+    (4, "Consistent, indexed cold message / connection links", _message_links),
+    (5, "Companies table linked from applications, messages and connections", _companies),
+    (6, "Indexes on the due dates of deadlines, interviews and follow-ups", _due_indexes),
+    (7, "Canonical job URLs for duplicate detection", _job_url_keys),
+    (8, "Saved views with materialized results", _saved_views),
+    (9, "Skills index over job descriptions", _application_skills),
+    (10, "(sort key, id) indexes for paging messages and connections", _sort_indexes),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# Serialises migrations between workers started at the same time
+LOCK_FILE = os.environ.get("MIGRATION_LOCK_FILE", f"{DB_PATH}.migrate.lock")
+_PG_ADVISORY_LOCK_ID = 4815162342
+
+
+def current_version(engine) -> int:
+    """Highest applied migration, 0 for an unversioned or new database."""
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(func.max(models.SchemaVersion.id))).scalar() or 0
+    except DBAPIError:
+        return 0  # no schema_version table yet
+
+
+def _record(conn, version: int, description: str):
+    conn.execute(models.SchemaVersion.__table__.insert().values(id=version, description=description))
+
+
+def _transactional_ddl(engine):
+    """Make CREATE / ALTER part of the migration's transaction on SQLite.
+
+    pysqlite only opens a transaction before DML, so each DDL statement would
+    otherwise commit on its own and a failing step would leave the schema half
+    migrated under the old schema_version. With the driver's transaction
+    handling off, the BEGIN issued here covers every statement.
+    """
+    @event.listens_for(engine, "connect")
+    def _no_implicit_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def _begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+
+def _apply_pending(engine):
+    with engine.begin() as conn:
+        if conn.dialect.name == "postgresql":
+            # Replicas on other hosts don't share the lock file
+            conn.execute(text("SELECT pg_advisory_xact_lock(:id)"), {"id": _PG_ADVISORY_LOCK_ID})
+        fresh = not inspect(conn).has_table("job_applications")
+        models.Base.metadata.create_all(conn)
+        version = conn.execute(select(func.max(models.SchemaVersion.id))).scalar() or 0
+        if fresh:
+            # Tables were just created from the models, which already match every step
+            for step, description, _ in MIGRATIONS:
+                _record(conn, step, description)
+            print(f"Created a new database at schema version {LATEST_VERSION}")
+            return
+        for step, description, migrate in MIGRATIONS:
+            if step <= version:
+                continue
+            print(f"Applying migration {step}: {description}")
+            migrate(conn)
+            _record(conn, step, description)
+
+
+def migrate_database(db_path=None, db_url=None, lock_file=None):
+    """Bring a database up to LATEST_VERSION.
+
+    Pass db_url for any SQLAlchemy URL (e.g. PostgreSQL), or db_path for a
+    SQLite file; with neither, the local job_tracker.db is located. When the
+    schema is current this is a single query. Otherwise pending steps and
+    their schema_version rows commit in one transaction (or not at all), under
+    lock_file if given so that only one worker migrates.
+    """
+    if db_url is None:
+        db_url = f"sqlite:///{db_path or _default_db_path()}"
+    engine = create_engine(db_url, poolclass=NullPool)
+    if engine.dialect.name == "sqlite":
+        _transactional_ddl(engine)
+    try:
+        if current_version(engine) >= LATEST_VERSION:
+            return False
+
+        print(f"Migrating database at: {db_url}")
+        if lock_file:
+            with file_lock(lock_file):
+                # Another worker may have finished while we waited
+                if current_version(engine) >= LATEST_VERSION:
+                    return False
+                _apply_pending(engine)
+        else:
+            _apply_pending(engine)
+    finally:
+        engine.dispose()
+
     print("\nSUCCESS: Migration completed successfully!")
     print("Your data is safe and the new features are ready to use.")
+    return True
 
 if __name__ == "__main__":
     try:
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, JSON, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, JSON, Boolean, Index, ForeignKey
+from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import Base
 
@@ -7,8 +8,12 @@ class JobApplication(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     company_name = Column(String, index=True, nullable=False)
+    company_id = Column(
+        Integer, ForeignKey("companies.id", name="fk_job_applications_company_id", ondelete="SET NULL"), index=True
+    )  # see companies.py
     job_title = Column(String, nullable=False)
     job_url = Column(String)
+    job_url_key = Column(String, index=True)  # normalize.job_url_key(job_url), for duplicate checks
     location = Column(String)
     work_type = Column(String)  # Remote, Hybrid, On-site
     domain = Column(String)  # Domain/Industry (e.g., Cloud Computing, DevOps, Software Engineering)
@@ -19,7 +24,7 @@ class JobApplication(Base):
     status_history = Column(JSON, default=list)  # Track all status changes with dates
     
     application_date = Column(DateTime(timezone=True))
-    application_deadline = Column(DateTime(timezone=True))  # Deadline to apply
+    application_deadline = Column(DateTime(timezone=True), index=True)  # Deadline to apply
     applied_on = Column(String)  # Where the application was submitted (LinkedIn, Indeed, Company Website, etc.)
     
     cv_filename = Column(String)
@@ -50,31 +55,54 @@ class JobApplication(Base):
     is_archived = Column(Integer, default=0)  # Archive status (0=active, 1=archived)
     interview_notes = Column(Text)  # Interview preparation notes
     interview_questions = Column(Text)  # Questions prepared/asked
-    interview_date = Column(DateTime(timezone=True))  # Scheduled interview date
+    interview_date = Column(DateTime(timezone=True), index=True)  # Scheduled interview date
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
 
+# Sort keys of the paged list endpoints; each has a (column, id) index so a
+# page is read in index order (see pagination.keyset_page)
+COLD_MESSAGE_SORT_KEYS = ("created_at", "sent_date", "contact_name", "company_name")
+CONNECTION_SORT_KEYS = (
+    "created_at", "requested_on", "accepted_on", "follow_up_date", "contact_name", "company_name",
+)
+
+
+def _sort_indexes(table: str, keys) -> tuple:
+    return tuple(Index(f"ix_{table}_{key}_id", key, "id") for key in keys)
+
+
 class ColdMessage(Base):
     __tablename__ = "cold_messages"
 
     id = Column(Integer, primary_key=True, index=True)
     contact_name = Column(String, nullable=False)
     company_name = Column(String)
+    company_id = Column(
+        Integer, ForeignKey("companies.id", name="fk_cold_messages_company_id", ondelete="SET NULL"), index=True
+    )  # see companies.py
     contact_email = Column(String)
     contact_linkedin = Column(String)
-    via = Column(String, nullable=False)  # 'Email', 'LinkedIn Message', 'Other'
-    category = Column(String)  # 'Employee', 'Hiring Manager', 'Recruiter', 'Other'
+    via = Column(String, nullable=False, index=True)  # 'Email', 'LinkedIn Message', 'Other'
+    category = Column(String, index=True)  # 'Employee', 'Hiring Manager', 'Recruiter', 'Other'
     subject = Column(String)
     message_body = Column(Text)
     sent_date = Column(DateTime(timezone=True))
     got_reply = Column(Boolean, default=False)
     notes = Column(Text)
-    connection_id = Column(Integer, nullable=True)  # optional link to linkedin_connections.id
+    # Optional link to a connection; the FKs between the two tables are
+    # deferred so rows can be restored in either order (see links.py)
+    connection_id = Column(
+        Integer,
+        ForeignKey("linkedin_connections.id", name="fk_cold_messages_connection_id",
+                   ondelete="SET NULL", deferrable=True, initially="DEFERRED"),
+        nullable=True, index=True,
+    )
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = _sort_indexes("cold_messages", COLD_MESSAGE_SORT_KEYS)
 
 
 class LinkedInConnection(Base):
@@ -84,15 +112,123 @@ class LinkedInConnection(Base):
     contact_name = Column(String, nullable=False, index=True)
     linkedin_profile_id = Column(String)           # full URL or slug, e.g. linkedin.com/in/johndoe
     company_name = Column(String)
-    category = Column(String)                      # 'Recruiter', 'Hiring Manager', 'Employee', 'Other'
-    connection_status = Column(String, default="Pending")  # 'Pending', 'Accepted', 'Withdrawn'
-    stage = Column(String, default="Requested")  # 'Need to Connect' | 'Requested'
+    company_id = Column(
+        Integer, ForeignKey("companies.id", name="fk_linkedin_connections_company_id", ondelete="SET NULL"), index=True
+    )  # see companies.py
+    category = Column(String, index=True)          # 'Recruiter', 'Hiring Manager', 'Employee', 'Other'
+    connection_status = Column(String, default="Pending", index=True)  # 'Pending', 'Accepted', 'Withdrawn'
+    stage = Column(String, default="Requested", index=True)  # 'Need to Connect' | 'Requested'
     requested_on = Column(DateTime(timezone=True))
     accepted_on = Column(DateTime(timezone=True))
-    cold_message_sent = Column(Boolean, default=False)
-    cold_message_id = Column(Integer, nullable=True)  # optional link to cold_messages.id
-    follow_up_date = Column(DateTime(timezone=True))
+    cold_message_sent = Column(Boolean, default=False, index=True)
+    cold_message_id = Column(
+        Integer,
+        ForeignKey("cold_messages.id", name="fk_linkedin_connections_cold_message_id",
+                   ondelete="SET NULL", deferrable=True, initially="DEFERRED", use_alter=True),
+        nullable=True, index=True,
+    )  # latest linked cold message
+    follow_up_date = Column(DateTime(timezone=True), index=True)
     notes = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Normalised copies of contact_name / company_name / linkedin_profile_id
+    # for duplicate checks (see normalize.connection_keys)
+    name_key = Column(String)
+    company_key = Column(String)
+    linkedin_slug = Column(String)
+
+    __table_args__ = (
+        Index("ix_linkedin_connections_dedupe", "name_key", "company_key", "linkedin_slug"),
+        *_sort_indexes("linkedin_connections", CONNECTION_SORT_KEYS),
+    )
+
+
+class Company(Base):
+    """One row per distinct company, shared by applications, messages and connections.
+
+    normalized_name is normalize.company_key() of the name; name is the
+    spelling it was first seen with.
+    """
+    __tablename__ = "companies"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    normalized_name = Column(String, nullable=False, unique=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    applications = relationship("JobApplication", order_by="JobApplication.id")
+    cold_messages = relationship("ColdMessage", order_by="ColdMessage.id")
+    connections = relationship("LinkedInConnection", order_by="LinkedInConnection.id")
+
+
+class CompanyNgram(Base):
+    """Trigram index of companies.normalized_name for fuzzy lookups (see companies.py)."""
+    __tablename__ = "company_ngrams"
+
+    id = Column(Integer, primary_key=True)
+    ngram = Column(String, nullable=False)
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_company_ngrams_ngram", "ngram", "company_id"),
+    )
+
+
+class SavedView(Base):
+    """A named application filter whose matching ids are kept in saved_view_members.
+
+    filters holds get_applications' keyword arguments. crud updates the
+    members and match_count as applications are written; a NULL match_count
+    means they need rebuilding in full (e.g. after a backup merge).
+    """
+    __tablename__ = "saved_views"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    filters = Column(JSON, nullable=False, default=dict)
+    sort_by = Column(String, default="created_at")
+    sort_order = Column(String, default="desc")
+    match_count = Column(Integer)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class SavedViewMember(Base):
+    __tablename__ = "saved_view_members"
+
+    view_id = Column(Integer, ForeignKey("saved_views.id", ondelete="CASCADE"), primary_key=True)
+    application_id = Column(
+        Integer, ForeignKey("job_applications.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+
+
+class ApplicationSkill(Base):
+    """Inverted index of the skills in job descriptions (see skills.py).
+
+    status and domain are copies of the application's, so the per-status /
+    per-domain report is a GROUP BY on one covering index.
+    """
+    __tablename__ = "application_skills"
+
+    application_id = Column(
+        Integer, ForeignKey("job_applications.id", ondelete="CASCADE"), primary_key=True
+    )
+    skill = Column(String, primary_key=True)
+    mentions = Column(Integer, nullable=False, default=1)
+    status = Column(String)
+    domain = Column(String)
+
+    __table_args__ = (
+        Index("ix_application_skills_skill", "skill", "application_id"),
+        Index("ix_application_skills_status", "status", "skill", "application_id"),
+        Index("ix_application_skills_domain", "domain", "skill", "application_id"),
+    )
+
+
+class SchemaVersion(Base):
+    """One row per applied migration (see migration.py); id is the migration's version."""
+    __tablename__ = "schema_version"
 
+    id = Column(Integer, primary_key=True)
+    description = Column(String)
+    applied_at = Column(DateTime(timezone=True), server_default=func.now())
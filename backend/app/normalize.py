@@ -0,0 +1,128 @@
+"""
+Normalised keys for matching records that were typed in slightly differently.
+
+Connections store these keys in their own indexed columns (name_key,
+company_key, linkedin_slug), so duplicate checks are plain equality lookups
+instead of lower(...) expressions that can't use an index. Any code that
+writes contact_name / company_name / linkedin_profile_id must refresh them
+with connection_keys().
+
+Company names additionally lose punctuation and legal suffixes
+(company_key), so "Google", "google" and "Google LLC" are one company, and
+job posting URLs are stripped of tracking parameters (job_url_key).
+"""
+import re
+import unicodedata
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+_LINKEDIN_PROFILE_RE = re.compile(r"^(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/([^/?#]+)")
+_NON_WORD_RE = re.compile(r"[^\w]+")
+_LINKEDIN_JOB_RE = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)")
+# Query parameters that only track where a link was clicked
+_TRACKING_PARAMS = {
+    "trk", "trkinfo", "refid", "trackingid", "lipi", "ref", "referrer", "source", "src",
+    "gh_src", "lever-origin", "lever-source", "from", "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid",
+}
+# Trailing words that don't tell companies apart
+_LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "llp", "lp", "ltd", "limited", "corp", "corporation",
+    "co", "company", "plc", "gmbh", "ag", "sa", "sas", "bv", "nv", "pty", "pvt", "srl",
+}
+
+
+def text_key(value: Optional[str]) -> Optional[str]:
+    """Case- and whitespace-insensitive form of a name; None for blank values."""
+    if not value:
+        return None
+    key = " ".join(value.split()).casefold()
+    return key or None
+
+
+def linkedin_slug(value: Optional[str]) -> Optional[str]:
+    """Canonical profile id: 'https://www.linkedin.com/in/John-Doe/?trk=x' -> 'john-doe'.
+
+    Values that aren't profile URLs (e.g. a bare slug) are lowercased and
+    stripped of any query string and trailing slashes.
+    """
+    if not value:
+        return None
+    v = value.strip().lower()
+    v = re.sub(r"^https?://", "", v)
+    v = re.sub(r"^www\.", "", v)
+    match = _LINKEDIN_PROFILE_RE.match(v)
+    if match:
+        v = match.group(1)
+    else:
+        v = re.split(r"[?#]", v, maxsplit=1)[0]
+    v = unquote(v).strip().rstrip("/")
+    return v or None
+
+
+def company_key(value: Optional[str]) -> Optional[str]:
+    """Canonical company name: 'Google, LLC.' -> 'google'; None for blank values."""
+    if not value:
+        return None
+    # Drop accents and the dots of abbreviations ("S.A." -> "sa")
+    value = "".join(c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c))
+    value = value.replace(".", "").replace("&", " and ").casefold()
+    words = _NON_WORD_RE.sub(" ", value).split()
+    while len(words) > 1 and words[-1] in _LEGAL_SUFFIXES:
+        words.pop()
+    return " ".join(words) or None
+
+
+def title_key(value: Optional[str]) -> Optional[str]:
+    """Case-, accent- and punctuation-insensitive form of a job title or free text."""
+    if not value:
+        return None
+    value = "".join(c for c in unicodedata.normalize("NFKD", value) if not unicodedata.combining(c))
+    return " ".join(_NON_WORD_RE.sub(" ", value.casefold()).split()) or None
+
+
+def job_url_key(value: Optional[str]) -> Optional[str]:
+    """Canonical job posting URL, without scheme, www, fragment or tracking parameters.
+
+    LinkedIn and Indeed postings reduce to their job id, whichever page or
+    search result they were opened from:
+    'https://www.linkedin.com/jobs/view/engineer-at-acme-123/?trk=x' -> 'linkedin.com/jobs/view/123'.
+    """
+    if not value or not value.strip():
+        return None
+    value = value.strip()
+    if "://" not in value:
+        value = f"https://{value}"
+    parts = urlsplit(value)
+    host = (parts.hostname or "").lower()
+    host = re.sub(r"^(?:www|m|[a-z]{2})\.(?=linkedin\.com$)", "", host)
+    host = re.sub(r"^(?:www\.|m\.)", "", host)
+    params = parse_qsl(parts.query, keep_blank_values=True)
+
+    if host.endswith("linkedin.com"):
+        job_id = dict(params).get("currentJobId")
+        match = _LINKEDIN_JOB_RE.search(parts.path)
+        if job_id or match:
+            return f"linkedin.com/jobs/view/{job_id or match.group(1)}"
+    if re.search(r"(^|\.)indeed\.[a-z.]+$", host):
+        job_id = dict(params).get("jk") or dict(params).get("vjk")
+        if job_id:
+            return f"indeed.com/viewjob?jk={job_id}"
+
+    kept = sorted(
+        (k, v) for k, v in params
+        if k.lower() not in _TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+    key = host + parts.path.rstrip("/")
+    if kept:
+        key += "?" + urlencode(kept)
+    return key
+
+
+def connection_keys(contact_name: Optional[str], company_name: Optional[str],
+                    linkedin_profile_id: Optional[str]) -> Dict[str, Optional[str]]:
+    """Values of the LinkedInConnection key columns for these fields."""
+    return {
+        "name_key": text_key(contact_name),
+        "company_key": text_key(company_name),
+        "linkedin_slug": linkedin_slug(linkedin_profile_id),
+    }
@@ -0,0 +1,115 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+A page is ordered by (sort column, id) and the cursor holds the last row's
+values. Each sort column has a (column, id) index, so the next page is an
+index range scan from the cursor however deep into the list it is, unlike
+OFFSET which re-reads every skipped row. Rows with a NULL sort value come
+last in either direction: they are read by a second, NULL-only query in id
+order once the non-NULL rows run out.
+
+Cursors are opaque url-safe strings; a cursor is only valid with the sort it
+was issued for.
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from sqlalchemy import DateTime, String, literal, tuple_, type_coerce
+from sqlalchemy.orm import Query, Session
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+
+def _is_sqlite(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _cursor_value(db: Session, column):
+    # SQLite keeps timestamps as text, and a bound datetime doesn't always
+    # compare equal to what was stored (e.g. CURRENT_TIMESTAMP has no
+    # microseconds), so the cursor carries the stored text there. Only the
+    # selected value is coerced: filtering and ordering stay on the bare
+    # column so its index is used.
+    return type_coerce(column, String) if _is_sqlite(db) else column
+
+
+def _bound_value(db: Session, column, value):
+    if _is_sqlite(db):
+        return literal(value, String)
+    if isinstance(column.type, DateTime):
+        return datetime.fromisoformat(value)
+    return value
+
+
+def encode_token(values: list) -> str:
+    """Opaque url-safe cursor for a list of JSON values (datetimes as ISO strings)."""
+    values = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_token(cursor: str, length: int) -> list:
+    """The values encoded by encode_token; raises ValueError if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError, binascii.Error):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(sort_by: str, sort_order: str, value, row_id: int) -> str:
+    return encode_token([sort_by, sort_order, value, row_id])
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Tuple[object, int]:
+    """(sort value, id) of the last row of the previous page; raises ValueError if invalid."""
+    cursor_sort, cursor_order, value, row_id = decode_token(cursor, 4)
+    if (cursor_sort, cursor_order) != (sort_by, sort_order) or not isinstance(row_id, int):
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, row_id
+
+
+def keyset_page(db: Session, query: Query, model, sort_by: str, sort_order: str,
+                cursor: Optional[str] = None, limit: int = DEFAULT_PAGE_SIZE) -> Tuple[List, Optional[str]]:
+    """Fetch one page of query, which must select columns including model.id.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    column = getattr(model, sort_by)
+    descending = sort_order != "asc"
+
+    def ordered(expression):
+        return expression.desc() if descending else expression.asc()
+
+    value, row_id = decode_cursor(cursor, sort_by, sort_order) if cursor else (None, None)
+    sort_key = _cursor_value(db, column).label("_sort_key")
+    rows = []
+    if not cursor or value is not None:
+        # Non-NULL values: a range scan of the (column, id) index
+        page = query.filter(column.isnot(None))
+        if cursor:
+            last = tuple_(_bound_value(db, column, value), row_id)
+            page = page.filter(tuple_(column, model.id) < last if descending else tuple_(column, model.id) > last)
+        rows = page.add_columns(sort_key).order_by(ordered(column), ordered(model.id)).limit(limit + 1).all()
+        row_id = None
+    if len(rows) <= limit:
+        # Then the NULLs, in id order
+        page = query.filter(column.is_(None))
+        if row_id is not None:
+            page = page.filter(model.id < row_id if descending else model.id > row_id)
+        rows += page.add_columns(sort_key).order_by(ordered(model.id)).limit(limit + 1 - len(rows)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(sort_by, sort_order, last._sort_key, last.id)
+    return rows, next_cursor
@@ -0,0 +1,514 @@
+"""
+Restore helpers: backup validation and set-based diffing of a backup against
+the live database.
+
+The backup is ATTACHed to a read-only connection on the current database and
+every row is reduced to a content hash in SQL (row_hash over all columns the
+two schemas share), so added / removed / modified counts for all tables come
+from a handful of set-based queries instead of loading both tables into Python.
+"""
+import os
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from . import backup, companies, dump, links, normalize, skills, typeahead
+from .backup import quote_identifier as _quote, register_functions
+from .database import DB_PATH, IS_SQLITE, engine, engines_for_path, restore_coordinator_for
+
+# Tables compared on restore, with the columns shown for added / removed rows
+RESTORE_TABLES = {
+    "job_applications": ["company_name", "job_title", "status", "application_date"],
+    "cold_messages": ["contact_name", "company_name", "via", "sent_date"],
+    "linkedin_connections": ["contact_name", "company_name", "connection_status", "requested_on"],
+}
+DIFF_KINDS = ("added", "removed", "modified")
+
+PREVIEW_DIR = os.path.join(tempfile.gettempdir(), "job_tracker_previews")
+PREVIEW_TTL_SECONDS = 3600
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+_PREVIEW_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+def validate_backup_file(path: str):
+    """Raise ValueError unless path is a SQLite database with the app's main table."""
+    try:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            row = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name='job_applications'"
+            ).fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        raise ValueError("The uploaded file is not a valid SQLite database.")
+    if not row:
+        raise ValueError("The uploaded file does not appear to be a valid Job Application Manager database (missing job_applications table).")
+
+
+def check_integrity(path: str):
+    """Raise ValueError if SQLite's quick_check finds corruption in path."""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        result = conn.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        conn.close()
+    if result != "ok":
+        raise ValueError(f"The uploaded database is corrupted: {result}")
+
+
+def refresh_derived_tables(path: str):
+    """Rebuild (or mark stale) the tables derived from job_applications in a restored file.
+
+    Incremental backup chains written before composite-key tables were
+    tracked don't carry them.
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        if table_columns(conn, "main", "saved_views"):
+            # Saved views rebuild their members when next opened
+            conn.execute("UPDATE saved_views SET match_count = NULL")
+        if table_columns(conn, "main", "application_skills"):
+            rows = conn.execute(
+                "SELECT id, job_description, status, domain FROM job_applications"
+                " WHERE job_description IS NOT NULL"
+            ).fetchall()
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM application_skills")
+            conn.executemany(skills.INSERT_SQL, [r for row in rows for r in skills.index_rows(*row)])
+            conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+
+def open_comparison(current_path: str, backup_path: str) -> sqlite3.Connection:
+    """Open the current DB read-only with the backup attached as schema 'backup'."""
+    conn = sqlite3.connect(f"file:{current_path}?mode=ro", uri=True)
+    conn.execute("ATTACH DATABASE ? AS backup", (f"file:{backup_path}?mode=ro",))
+    register_functions(conn)
+    return conn
+
+
+def table_columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA {schema}.table_info({_quote(table)})")]
+
+
+def common_columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    """Columns present in both copies of a table, in current-schema order."""
+    backup_cols = set(table_columns(conn, "backup", table))
+    return [c for c in table_columns(conn, "main", table) if c in backup_cols]
+
+
+def _hash_expr(alias: str, columns: List[str]) -> str:
+    return "row_hash(" + ", ".join(f"{alias}.{_quote(c)}" for c in columns) + ")"
+
+
+def _diff_sources(conn: sqlite3.Connection, table: str) -> Dict[str, Optional[str]]:
+    """FROM/WHERE fragments selecting each diff kind; None when a side lacks the table."""
+    t = _quote(table)
+    in_main = bool(table_columns(conn, "main", table))
+    in_backup = bool(table_columns(conn, "backup", table))
+    if in_main and in_backup:
+        cols = common_columns(conn, table)
+        return {
+            "added": f"backup.{t} b WHERE NOT EXISTS (SELECT 1 FROM main.{t} c WHERE c.id = b.id)",
+            "removed": f"main.{t} c WHERE NOT EXISTS (SELECT 1 FROM backup.{t} b WHERE b.id = c.id)",
+            "modified": f"main.{t} c JOIN backup.{t} b ON b.id = c.id "
+                        f"WHERE {_hash_expr('c', cols)} <> {_hash_expr('b', cols)}",
+        }
+    return {
+        "added": f"backup.{t} b" if in_backup else None,
+        "removed": f"main.{t} c" if in_main else None,
+        "modified": None,
+    }
+
+
+def _count(conn: sqlite3.Connection, source: Optional[str]) -> int:
+    return conn.execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0] if source else 0
+
+
+def table_summary(conn: sqlite3.Connection, table: str) -> Dict[str, int]:
+    sources = _diff_sources(conn, table)
+    t = _quote(table)
+    counts = {kind: _count(conn, sources[kind]) for kind in DIFF_KINDS}
+    current_count = conn.execute(f"SELECT COUNT(*) FROM main.{t}").fetchone()[0] if sources["removed"] else 0
+    backup_count = conn.execute(f"SELECT COUNT(*) FROM backup.{t}").fetchone()[0] if sources["added"] else 0
+    return {
+        "current_count": current_count,
+        "backup_count": backup_count,
+        "added": counts["added"],
+        "removed": counts["removed"],
+        "modified": counts["modified"],
+        "unchanged": current_count - counts["removed"] - counts["modified"],
+    }
+
+
+def diff_page(conn: sqlite3.Connection, table: str, kind: str,
+              offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> List[Dict]:
+    """One page of added / removed rows (summary columns) or modified rows (changed fields)."""
+    source = _diff_sources(conn, table)[kind]
+    if source is None:
+        return []
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+
+    if kind in ("added", "removed"):
+        alias = "b" if kind == "added" else "c"
+        schema = "backup" if kind == "added" else "main"
+        available = set(table_columns(conn, schema, table))
+        columns = ["id"] + [c for c in RESTORE_TABLES[table] if c in available]
+        select = ", ".join(f"{alias}.{_quote(c)}" for c in columns)
+        rows = conn.execute(
+            f"SELECT {select} FROM {source} ORDER BY {alias}.id LIMIT ? OFFSET ?", (limit, offset)
+        ).fetchall()
+        return [dict(zip(columns, row)) for row in rows]
+
+    columns = common_columns(conn, table)
+    select = ", ".join([f"c.{_quote(c)}" for c in columns] + [f"b.{_quote(c)}" for c in columns])
+    rows = conn.execute(
+        f"SELECT {select} FROM {source} ORDER BY c.id LIMIT ? OFFSET ?", (limit, offset)
+    ).fetchall()
+    items = []
+    n = len(columns)
+    for row in rows:
+        current, backed_up = row[:n], row[n:]
+        changes = {
+            col: {"current": cur, "backup": bak}
+            for col, cur, bak in zip(columns, current, backed_up)
+            if cur != bak or type(cur) is not type(bak)
+        }
+        item = {"id": current[columns.index("id")], "changes": changes}
+        for col in RESTORE_TABLES[table]:
+            if col in columns:
+                item[col] = current[columns.index(col)]
+        items.append(item)
+    return items
+
+
+# ─── Merge restore ───────────────────────────────────────────────────
+
+MERGE_POLICIES = ("newest", "keep_current", "keep_backup")
+
+
+def _merge_table(conn: sqlite3.Connection, table: str, policy: str) -> Dict[str, int]:
+    t = _quote(table)
+    columns = common_columns(conn, table)
+    col_list = ", ".join(_quote(c) for c in columns)
+    to_insert = _count(conn, _diff_sources(conn, table)["added"])
+
+    # "WHERE true" keeps SQLite from parsing ON CONFLICT as part of the SELECT
+    sql = f"INSERT INTO main.{t} ({col_list}) SELECT {col_list} FROM backup.{t} WHERE true ON CONFLICT(id) DO "
+    updates = ", ".join(f"{_quote(c)} = excluded.{_quote(c)}" for c in columns if c != "id")
+    if policy == "keep_current" or not updates:
+        sql += "NOTHING"
+    else:
+        sql += f"UPDATE SET {updates}"
+        if policy == "newest":
+            # Rows that were never edited fall back to their creation time
+            sql += (f" WHERE COALESCE(excluded.updated_at, excluded.created_at)"
+                    f" > COALESCE({t}.updated_at, {t}.created_at)")
+        else:
+            # Skip identical rows so they are not counted as updates
+            sql += f" WHERE {_hash_expr('excluded', columns)} <> {_hash_expr(t, columns)}"
+
+    changed = conn.execute(sql).rowcount
+    return {"inserted": to_insert, "updated": max(changed - to_insert, 0)}
+
+
+def _refresh_connection_keys(conn: sqlite3.Connection):
+    """Recompute the normalised key columns for rows merged from a backup that predates them."""
+    if not {"name_key", "company_key", "linkedin_slug"} <= set(table_columns(conn, "main", "linkedin_connections")):
+        return
+    if "name_key" in table_columns(conn, "backup", "linkedin_connections"):
+        return  # copied along with the rows
+    rows = conn.execute(
+        "SELECT id, contact_name, company_name, linkedin_profile_id FROM main.linkedin_connections"
+        " WHERE id IN (SELECT id FROM backup.linkedin_connections)"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE main.linkedin_connections SET name_key = :name_key, company_key = :company_key,"
+        " linkedin_slug = :linkedin_slug WHERE id = :id",
+        [dict(normalize.connection_keys(name, company, linkedin), id=row_id) for row_id, name, company, linkedin in rows],
+    )
+
+
+def _refresh_job_url_keys(conn: sqlite3.Connection):
+    """Same as _refresh_connection_keys, for job_applications.job_url_key."""
+    if "job_url_key" not in table_columns(conn, "main", "job_applications"):
+        return
+    if "job_url_key" in table_columns(conn, "backup", "job_applications"):
+        return
+    rows = conn.execute(
+        "SELECT id, job_url FROM main.job_applications"
+        " WHERE id IN (SELECT id FROM backup.job_applications)"
+    ).fetchall()
+    conn.executemany(
+        "UPDATE main.job_applications SET job_url_key = :job_url_key WHERE id = :id",
+        [{"job_url_key": normalize.job_url_key(url), "id": row_id} for row_id, url in rows],
+    )
+
+
+def _refresh_application_skills(conn: sqlite3.Connection):
+    """Re-index the skills of every merged job application (see skills.py)."""
+    if not table_columns(conn, "main", "application_skills"):
+        return
+    conn.execute("DELETE FROM main.application_skills"
+                 " WHERE application_id IN (SELECT id FROM backup.job_applications)")
+    rows = conn.execute(
+        "SELECT id, job_description, status, domain FROM main.job_applications"
+        " WHERE id IN (SELECT id FROM backup.job_applications)"
+    ).fetchall()
+    conn.executemany(skills.INSERT_SQL, [r for row in rows for r in skills.index_rows(*row)])
+
+
+def merge_backup(current_path: str, backup_path: str, policy: str = "newest",
+                 tables: Optional[List[str]] = None) -> Dict[str, Dict[str, int]]:
+    """Upsert rows from a backup into the live DB in a single transaction.
+
+    Rows missing from the current DB are inserted with their original ids.
+    Rows present in both are resolved by policy: 'newest' keeps whichever
+    side has the later updated_at, 'keep_current' never overwrites, and
+    'keep_backup' always takes the backed-up version. Nothing is deleted.
+    """
+    tables = _merge_tables_for(policy, tables)
+    with restore_coordinator_for(current_path).checkout():
+        return _merge_tables(current_path, backup_path, policy, tables)
+
+
+def _merge_tables_for(policy: str, tables: Optional[List[str]]) -> List[str]:
+    """The tables a merge covers; raises ValueError for an unknown policy or table."""
+    if policy not in MERGE_POLICIES:
+        raise ValueError(f"Unknown merge policy '{policy}'. Use one of: {', '.join(MERGE_POLICIES)}")
+    tables = tables or list(RESTORE_TABLES)
+    for table in tables:
+        if table not in RESTORE_TABLES:
+            raise ValueError(f"Unknown table '{table}'")
+    return tables
+
+
+def _merge_tables(current_path: str, backup_path: str, policy: str,
+                  tables: List[str]) -> Dict[str, Dict[str, int]]:
+    conn = sqlite3.connect(current_path, timeout=30, isolation_level=None)
+    try:
+        conn.execute("ATTACH DATABASE ? AS backup", (f"file:{backup_path}?mode=ro",))
+        register_functions(conn)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            results = {}
+            merged = []
+            for table in tables:
+                if not table_columns(conn, "backup", table) or not table_columns(conn, "main", table):
+                    results[table] = {"inserted": 0, "updated": 0}
+                    continue
+                results[table] = _merge_table(conn, table, policy)
+                merged.append(table)
+                if table == "linkedin_connections":
+                    _refresh_connection_keys(conn)
+                elif table == "job_applications":
+                    _refresh_job_url_keys(conn)
+                    _refresh_application_skills(conn)
+            # The backup's company ids don't match this database's
+            # companies table, so relink every merged row by name
+            linked = [t for t in merged if t in companies.LINKED_TABLES
+                      and "company_id" in table_columns(conn, "main", t)]
+            for table in linked:
+                conn.execute(f"UPDATE main.{_quote(table)} SET company_id = NULL"
+                             f" WHERE id IN (SELECT id FROM backup.{_quote(table)})")
+            if linked:
+                companies.link_missing(conn, tables=linked)
+            if "job_applications" in tables and table_columns(conn, "main", "saved_views"):
+                # Saved views rebuild their members when next opened
+                conn.execute("UPDATE main.saved_views SET match_count = NULL")
+            if {"cold_messages", "linkedin_connections"} & set(tables):
+                # Merging only one side, or rows resolved differently per
+                # table, can leave the links between them one-sided
+                for _, statement in links.REPAIR_STATEMENTS:
+                    conn.execute(statement)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return results
+    finally:
+        conn.close()
+
+
+def merge_into_database(backup_path: str, safety_copy: str, policy: str = "newest",
+                        tables: Optional[List[str]] = None,
+                        db_path: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+    """Merge a backup into the live database after writing a safety copy.
+
+    SQLite (the default database or the user's db_path) is merged in place.
+    Other backends are dumped under a write lock, merged as a SQLite file and
+    loaded back in the same transaction.
+    """
+    if IS_SQLITE or db_path:
+        db_path = db_path or DB_PATH
+        with restore_coordinator_for(db_path).checkout():
+            backup.snapshot_database(db_path, safety_copy)
+        results = merge_backup(db_path, backup_path, policy=policy, tables=tables)
+        typeahead.invalidate_all()
+        return results
+
+    tables = _merge_tables_for(policy, tables)
+    with engine.begin() as conn:
+        # EXCLUSIVE holds back writers on every replica but still allows reads
+        dump.lock_tables(conn, "EXCLUSIVE")
+        dump.dump_database(conn, safety_copy)
+        working_path = f"{safety_copy}.merge"
+        shutil.copyfile(safety_copy, working_path)
+        try:
+            # A private copy: there are no sessions on it to coordinate with
+            results = _merge_tables(working_path, backup_path, policy, tables)
+            dump.load_database(conn, working_path)
+        finally:
+            os.remove(working_path)
+    typeahead.invalidate_all()
+    return results
+
+
+# ─── Replace restore ─────────────────────────────────────────────────
+
+def swap_database(new_path: str, db_path: str, backup_path: str, drain_timeout: float = 30.0):
+    """Replace the contents of db_path with an already validated and migrated new_path.
+
+    New sessions are paused and active ones drained first, in every worker,
+    so no request ever sees a half-restored database. The data is copied in
+    through SQLite (see backup.copy_into_database) rather than by swapping the
+    file, because other workers' pooled connections would otherwise keep the
+    old file, and its WAL, open under the new one's name.
+    """
+    with restore_coordinator_for(db_path).exclusive(drain_timeout):
+        # Snapshot while drained so the safety copy includes every last write
+        if os.path.exists(db_path):
+            backup.snapshot_database(db_path, backup_path)
+        engines = engines_for_path(db_path)
+        if engines is not None:
+            engines.dispose()
+        try:
+            backup.copy_into_database(new_path, db_path)
+        finally:
+            # Other workers reopen theirs when they see the new restore generation
+            if engines is not None:
+                engines.reopen()
+            typeahead.invalidate_all()
+
+
+def replace_database(new_path: str, backup_path: str, db_path: Optional[str] = None):
+    """Make the validated and migrated SQLite file new_path the live data.
+
+    SQLite copies it into db_path (default DB_PATH, see swap_database).
+    Other backends reload every table in one transaction: readers keep seeing
+    the old rows until it commits, and the current data is dumped to
+    backup_path first.
+    """
+    if IS_SQLITE or db_path:
+        swap_database(new_path, db_path or DB_PATH, backup_path)
+        return
+    with engine.begin() as conn:
+        dump.lock_tables(conn, "EXCLUSIVE")
+        dump.dump_database(conn, backup_path)
+        dump.load_database(conn, new_path)
+    typeahead.invalidate_all()
+
+
+# ─── Stored previews ─────────────────────────────────────────────────
+# An uploaded backup is kept for a while after preview so the diff can be
+# paged through (and merged) without re-uploading it.
+
+def prune_previews(max_age_seconds: int = PREVIEW_TTL_SECONDS):
+    if not os.path.isdir(PREVIEW_DIR):
+        return
+    cutoff = time.time() - max_age_seconds
+    with os.scandir(PREVIEW_DIR) as it:
+        for entry in it:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+def store_preview(fileobj, filename: str) -> str:
+    """Save and validate an uploaded backup, returning its preview id."""
+    prune_previews()
+    os.makedirs(PREVIEW_DIR, exist_ok=True)
+    preview_id = uuid.uuid4().hex
+    path = os.path.join(PREVIEW_DIR, f"{preview_id}.db")
+    try:
+        backup.save_uploaded_backup(fileobj, filename, path)
+        validate_backup_file(path)
+    except Exception:
+        if os.path.exists(path):
+            os.remove(path)
+        raise
+    return preview_id
+
+
+def preview_path(preview_id: str) -> str:
+    """Path of a stored preview; raises LookupError if it is unknown or expired."""
+    if not _PREVIEW_ID_RE.match(preview_id or ""):
+        raise LookupError("Unknown restore preview")
+    path = os.path.join(PREVIEW_DIR, f"{preview_id}.db")
+    if not os.path.exists(path):
+        raise LookupError("Restore preview not found or expired. Please upload the backup again.")
+    os.utime(path)  # keep previews that are still being looked at
+    return path
+
+
+def discard_preview(preview_id: str):
+    try:
+        os.remove(preview_path(preview_id))
+    except LookupError:
+        pass
+
+
+def build_preview(current_path: str, backup_path: str, page_size: int = DEFAULT_PAGE_SIZE) -> Dict:
+    """Per-table counts plus the first page of every diff for job_applications."""
+    conn = open_comparison(current_path, backup_path)
+    try:
+        tables = {table: table_summary(conn, table) for table in RESTORE_TABLES}
+        apps = tables["job_applications"]
+        return {
+            # Top-level fields describe job_applications (kept for existing clients)
+            "current_count": apps["current_count"],
+            "backup_count": apps["backup_count"],
+            "to_add": apps["added"],
+            "to_remove": apps["removed"],
+            "to_modify": apps["modified"],
+            "unchanged": apps["unchanged"],
+            "added_items": diff_page(conn, "job_applications", "added", 0, page_size),
+            "removed_items": diff_page(conn, "job_applications", "removed", 0, page_size),
+            "modified_items": diff_page(conn, "job_applications", "modified", 0, page_size),
+            "tables": tables,
+        }
+    finally:
+        conn.close()
+
+
+def preview_diff(current_path: str, backup_path: str, table: str, kind: str,
+                 offset: int = 0, limit: int = DEFAULT_PAGE_SIZE) -> Dict:
+    if table not in RESTORE_TABLES:
+        raise ValueError(f"Unknown table '{table}'")
+    if kind not in DIFF_KINDS:
+        raise ValueError(f"Unknown diff kind '{kind}'. Use one of: {', '.join(DIFF_KINDS)}")
+    offset = max(0, offset)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    conn = open_comparison(current_path, backup_path)
+    try:
+        total = _count(conn, _diff_sources(conn, table)[kind])
+        return {
+            "table": table,
+            "kind": kind,
+            "total": total,
+            "offset": offset,
+            "limit": limit,
+            "items": diff_page(conn, table, kind, offset, limit),
+        }
+    finally:
+        conn.close()
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
 from typing import Optional, List, Dict
 
@@ -80,6 +80,7 @@ class JobApplicationUpdate(BaseModel):
 
 class JobApplication(JobApplicationBase):
     id: int
+    company_id: Optional[int] = None
     status_history: List[Dict] = []
     application_deadline: Optional[datetime] = None
     cv_filename: Optional[str] = None
@@ -135,12 +136,36 @@ class ColdMessageUpdate(BaseModel):
 
 class ColdMessage(ColdMessageBase):
     id: int
+    company_id: Optional[int] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class ColdMessageSummary(BaseModel):
+    """List view of a cold message, without the long text fields (message_body, notes)."""
+    id: int
+    contact_name: str
+    company_name: Optional[str] = None
+    contact_email: Optional[str] = None
+    contact_linkedin: Optional[str] = None
+    via: str
+    category: Optional[str] = None
+    subject: Optional[str] = None
+    sent_date: Optional[datetime] = None
+    got_reply: Optional[bool] = False
+    connection_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class ColdMessagePage(BaseModel):
+    items: List[ColdMessageSummary]
+    next_cursor: Optional[str] = None  # pass back as cursor for the next page; None on the last one
+
 class ColdMessageStats(BaseModel):
     total: int
     by_via: Dict[str, int]
@@ -183,12 +208,47 @@ class LinkedInConnectionUpdate(BaseModel):
 
 class LinkedInConnection(LinkedInConnectionBase):
     id: int
+    company_id: Optional[int] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class LinkedInConnectionSummary(BaseModel):
+    """List view of a connection: notes are cut to a short preview."""
+    id: int
+    contact_name: str
+    linkedin_profile_id: Optional[str] = None
+    company_name: Optional[str] = None
+    category: Optional[str] = None
+    connection_status: str = "Pending"
+    stage: Optional[str] = "Requested"
+    requested_on: Optional[datetime] = None
+    accepted_on: Optional[datetime] = None
+    cold_message_sent: Optional[bool] = False
+    cold_message_id: Optional[int] = None
+    follow_up_date: Optional[datetime] = None
+    notes_preview: Optional[str] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
 
+class LinkedInConnectionPage(BaseModel):
+    items: List[LinkedInConnectionSummary]
+    next_cursor: Optional[str] = None
+
+class ConnectionCandidate(BaseModel):
+    name: str
+    company: Optional[str] = None
+    linkedin_url: Optional[str] = None
+
+class ConnectionDuplicateCheck(BaseModel):
+    exists: bool
+    id: Optional[int] = None
+
 class LinkedInConnectionStats(BaseModel):
     total: int
     need_to_connect: int
@@ -199,4 +259,140 @@ class LinkedInConnectionStats(BaseModel):
     accepted_no_message: int
     acceptance_rate: float
 
+class TypeaheadSuggestion(BaseModel):
+    value: str
+    count: int
+
+class CompanyMatch(BaseModel):
+    id: int
+    name: str
+    similarity: float
+
+class Company(BaseModel):
+    id: int
+    name: str
+    normalized_name: str
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class CompanyDetail(Company):
+    applications: List[JobApplication] = []
+    cold_messages: List[ColdMessage] = []
+    connections: List[LinkedInConnection] = []
 
+class DueItem(BaseModel):
+    kind: str  # 'deadline', 'follow_up' or 'interview'
+    due: datetime
+    id: int  # application id, or connection id for follow-ups
+    title: str
+    company_name: Optional[str] = None
+    company_id: Optional[int] = None
+    detail: Optional[str] = None  # application status / connection status
+
+class DuePage(BaseModel):
+    items: List[DueItem]
+    next_cursor: Optional[str] = None
+
+class DuplicateCheck(BaseModel):
+    company_name: str
+    job_title: str
+    job_url: Optional[str] = None
+    job_description: Optional[str] = None
+    exclude_id: Optional[int] = None  # the application being edited
+
+class DuplicateApplication(BaseModel):
+    id: int
+    company_name: str
+    job_title: str
+    status: Optional[str] = None
+    job_url: Optional[str] = None
+
+class DuplicateMatch(DuplicateApplication):
+    score: float
+    reason: str  # 'same_url' or 'similar'
+
+class DuplicatePair(BaseModel):
+    first: DuplicateApplication
+    second: DuplicateApplication
+    score: float
+    reason: str
+
+class JobApplicationCreated(JobApplication):
+    possible_duplicates: List[DuplicateMatch] = []
+
+class SavedViewFilters(BaseModel):
+    """The GET /applications/ filters a saved view applies."""
+    status: Optional[str] = None
+    domain: Optional[str] = None
+    search: Optional[str] = None
+    work_type: Optional[str] = None
+    tags: Optional[str] = None  # comma-separated, all must match
+    include_archived: bool = False
+    status_stage: Optional[str] = None
+
+class SavedViewCreate(BaseModel):
+    name: str
+    filters: SavedViewFilters = SavedViewFilters()
+    sort_by: str = "created_at"
+    sort_order: str = "desc"
+
+class SavedViewUpdate(BaseModel):
+    name: Optional[str] = None
+    filters: Optional[SavedViewFilters] = None
+    sort_by: Optional[str] = None
+    sort_order: Optional[str] = None
+
+class SavedView(SavedViewCreate):
+    id: int
+    match_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
+
+class JDText(BaseModel):
+    text: str
+
+MAX_JD_BATCH = 1000
+
+class JDTexts(BaseModel):
+    texts: List[str] = Field(max_length=MAX_JD_BATCH)
+
+class ParsedJD(BaseModel):
+    company_name: str
+    job_title: str
+    location: str
+    work_type: str
+    salary_min: Optional[float] = None
+    salary_max: Optional[float] = None
+    job_description: str
+    contact_person: str
+    security_clearance: List[str] = []
+
+class JDBackfillReport(BaseModel):
+    scanned: int
+    updated: int
+    dry_run: bool
+    salary_min: int
+    salary_max: int
+    location: int
+    work_type: int
+
+class SkillCount(BaseModel):
+    skill: str
+    applications: int
+    share: float
+
+class SkillGroup(BaseModel):
+    group: Optional[str] = None
+    applications: int
+    skills: List[SkillCount]
+
+class SkillApplication(BaseModel):
+    id: int
+    company_name: str
+    job_title: str
+    status: Optional[str] = None
+    mentions: int
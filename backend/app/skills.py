@@ -0,0 +1,178 @@
+"""
+Skills mentioned in job descriptions, as an inverted index.
+
+application_skills has one row per (application, skill) with the number
+of mentions. Skills come from the SKILLS vocabulary (canonical name ->
+spellings), matched by a single compiled regex; a skill has to stand
+alone, so "java" doesn't match inside "javascript".
+
+Each row also carries its application's status and domain, so the
+per-status / per-domain report is a GROUP BY over the (status, skill) or
+(domain, skill) index instead of re-reading every description. crud keeps
+the rows in step: they're rebuilt when a description changes and their
+status / domain updated when only those change.
+"""
+import re
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Canonical name -> other spellings found in postings. Names that are also
+# ordinary words ("go", "rest", "spring") are left out or only matched in
+# an unambiguous form.
+SKILLS = {
+    "Python": [], "Java": [], "JavaScript": ["js"], "TypeScript": ["ts"], "C++": ["cpp"],
+    "C#": ["csharp"], ".NET": ["dotnet", "asp.net"], "Golang": [], "Rust": [], "Ruby": [],
+    "Rails": ["ruby on rails"], "PHP": [], "Kotlin": [], "Swift": [], "Scala": [], "Bash": ["shell scripting"],
+    "PowerShell": [], "SQL": [], "PostgreSQL": ["postgres"], "MySQL": [], "SQL Server": ["mssql"],
+    "Oracle": [], "MongoDB": ["mongo"], "Redis": [], "Elasticsearch": ["elastic search"],
+    "Cassandra": [], "DynamoDB": [], "Snowflake": [], "BigQuery": [], "Databricks": [],
+    "Spark": ["apache spark", "pyspark"], "Kafka": ["apache kafka"], "Airflow": ["apache airflow"],
+    "Hadoop": [], "dbt": [], "ETL": [], "Pandas": [], "NumPy": [], "scikit-learn": ["sklearn"],
+    "TensorFlow": [], "PyTorch": [], "Machine Learning": ["ml"], "Deep Learning": [], "NLP": [],
+    "Computer Vision": [], "LLM": ["llms", "large language models"], "Data Analysis": [],
+    "Statistics": [], "Tableau": [], "Power BI": ["powerbi"], "Excel": [], "React": ["react.js", "reactjs"],
+    "Angular": [], "Vue": ["vue.js", "vuejs"], "Node.js": ["node", "nodejs"], "Next.js": ["nextjs"],
+    "Django": [], "Flask": [], "FastAPI": [], "Spring Boot": [], "GraphQL": [],
+    "REST APIs": ["rest api", "restful"], "gRPC": [], "Microservices": [], "HTML": [], "CSS": [],
+    "Tailwind": ["tailwind css"], "AWS": ["amazon web services"], "Azure": ["microsoft azure"],
+    "GCP": ["google cloud", "google cloud platform"], "Docker": [], "Kubernetes": ["k8s"],
+    "Helm": [], "OpenShift": [], "Terraform": [], "CloudFormation": [], "Ansible": [], "Puppet": [],
+    "Chef": [], "Pulumi": [], "Jenkins": [], "GitHub Actions": [], "GitLab CI": ["gitlab"],
+    "Azure DevOps": [], "CI/CD": ["ci / cd", "continuous integration"], "Git": [], "Linux": [],
+    "Windows Server": [], "Networking": ["tcp/ip"], "Prometheus": [], "Grafana": [], "Datadog": [],
+    "Splunk": [], "ELK": [], "Serverless": ["lambda"], "SRE": ["site reliability"], "DevOps": [],
+    "DevSecOps": [], "Security": ["cyber security", "cybersecurity", "information security"],
+    "IAM": [], "OAuth": [], "SIEM": [], "Penetration Testing": ["pen testing"], "ISO 27001": [],
+    "Agile": [], "Scrum": [], "Kanban": [], "Jira": [], "TDD": ["test driven development"],
+    "Unit Testing": [], "Selenium": [], "Cypress": [], "Playwright": [], "Figma": [],
+    "Stakeholder Management": [], "Project Management": [], "Communication": ["communication skills"],
+    "Leadership": [],
+}
+
+_CANONICAL = {spelling.lower(): name for name, spellings in SKILLS.items() for spelling in [name, *spellings]}
+# Longest first, so "node.js" wins over "node" and "google cloud platform" over "google cloud"
+_SKILL_RE = re.compile(
+    r"(?<![a-z0-9+#])("
+    + "|".join(re.escape(s) for s in sorted(_CANONICAL, key=len, reverse=True))
+    + r")(?![a-z0-9+#])",
+    re.I,
+)
+
+INSERT_SQL = (
+    "INSERT INTO application_skills (application_id, skill, mentions, status, domain)"
+    " VALUES (:application_id, :skill, :mentions, :status, :domain)"
+)
+GROUP_BY = ("status", "domain")
+
+
+def extract(description: Optional[str]) -> Dict[str, int]:
+    """Mentions of each known skill in a description, by canonical name."""
+    mentions: Dict[str, int] = {}
+    for match in _SKILL_RE.finditer(description or ""):
+        name = _CANONICAL[match.group(1).lower()]
+        mentions[name] = mentions.get(name, 0) + 1
+    return mentions
+
+
+def index_rows(application_id: int, description: Optional[str], status: Optional[str],
+               domain: Optional[str]) -> List[dict]:
+    """The application_skills rows for one application."""
+    return [
+        {"application_id": application_id, "skill": skill, "mentions": count, "status": status, "domain": domain}
+        for skill, count in extract(description).items()
+    ]
+
+
+def indexed_values(application: models.JobApplication) -> tuple:
+    """What the index depends on: compare before and after a write."""
+    return application.job_description, application.status, application.domain
+
+
+def sync(db: Session, application: models.JobApplication, before: Optional[tuple] = None):
+    """Bring an application's rows up to date after a write; joins the caller's transaction.
+
+    before is indexed_values() from before the write, None for a new application.
+    """
+    description, status, domain = indexed_values(application)
+    if before is not None and before == (description, status, domain):
+        return
+    rows = db.query(models.ApplicationSkill).filter(models.ApplicationSkill.application_id == application.id)
+    if before is not None and before[0] == description:
+        rows.update({"status": status, "domain": domain}, synchronize_session=False)
+        return
+    rows.delete(synchronize_session=False)
+    new_rows = index_rows(application.id, description, status, domain)
+    if new_rows:
+        db.execute(text(INSERT_SQL), new_rows)
+
+
+def remove(db: Session, application_id: int):
+    db.query(models.ApplicationSkill).filter(models.ApplicationSkill.application_id == application_id).delete(
+        synchronize_session=False
+    )
+
+
+def reindex(conn, batch_size: int = 1000) -> int:
+    """Rebuild application_skills for every application; returns how many have a description."""
+    conn.execute(text("DELETE FROM application_skills"))
+    rows = conn.execute(text(
+        "SELECT id, job_description, status, domain FROM job_applications WHERE job_description IS NOT NULL"
+    )).fetchall()
+    for start in range(0, len(rows), batch_size):
+        batch = [r for row in rows[start:start + batch_size] for r in index_rows(*row)]
+        if batch:
+            conn.execute(text(INSERT_SQL), batch)
+    return len(rows)
+
+
+def top_skills(db: Session, by: str = "status", limit: int = 10,
+               groups: Optional[List[str]] = None) -> List[dict]:
+    """The most common skills in each status (or domain), largest group first.
+
+    For each skill: how many of the group's applications mention it, and
+    that as a share of the group's applications that mention any skill.
+    """
+    if by not in GROUP_BY:
+        raise ValueError(f"by must be one of: {', '.join(GROUP_BY)}")
+    Skill = models.ApplicationSkill
+    group = getattr(Skill, by)
+    counts = db.query(group, Skill.skill, func.count()).group_by(group, Skill.skill)
+    totals = db.query(group, func.count(func.distinct(Skill.application_id))).group_by(group)
+    if groups:
+        counts = counts.filter(group.in_(groups))
+        totals = totals.filter(group.in_(groups))
+
+    by_group: Dict[Optional[str], List[tuple]] = {}
+    for value, skill, count in counts:
+        by_group.setdefault(value, []).append((skill, count))
+    report = []
+    for value, total in totals:
+        ranked = sorted(by_group.get(value, []), key=lambda s: (-s[1], s[0]))[:limit]
+        report.append({
+            "group": value,
+            "applications": total,
+            "skills": [
+                {"skill": skill, "applications": count, "share": round(count / total, 3)}
+                for skill, count in ranked
+            ],
+        })
+    report.sort(key=lambda g: (-g["applications"], g["group"] or ""))
+    return report
+
+
+def applications_with(db: Session, skill: str, limit: int = 100) -> List[dict]:
+    """Applications mentioning a skill (any known spelling), most mentions first."""
+    name = _CANONICAL.get(skill.strip().lower(), skill.strip())
+    rows = (
+        db.query(models.JobApplication.id, models.JobApplication.company_name, models.JobApplication.job_title,
+                 models.JobApplication.status, models.ApplicationSkill.mentions)
+        .join(models.ApplicationSkill, models.ApplicationSkill.application_id == models.JobApplication.id)
+        .filter(models.ApplicationSkill.skill == name)
+        .order_by(models.ApplicationSkill.mentions.desc(), models.JobApplication.id.desc())
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
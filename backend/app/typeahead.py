@@ -0,0 +1,209 @@
+"""
+Typeahead suggestions for the free-text application fields.
+
+Every keystroke in the form asks for the most used values of one field
+starting with what has been typed so far. Rather than a LIKE scan per
+keystroke, each database gets an in-memory index built once from five
+GROUP BY queries:
+
+- per field, a count of every distinct value (compared case-insensitively
+  via normalize.text_key, shown in its most common spelling);
+- a sorted array of (term, value) entries, where the terms are the value
+  and each of its word suffixes, so "eng" finds "Senior Engineer" too;
+  a prefix lookup is two bisects into that array;
+- the top values for each prefix asked for are cached until a value with
+  that prefix changes.
+
+crud keeps the index current on create / update / delete in this worker.
+Restores and merges drop it, and it is rebuilt after TTL_SECONDS so that
+writes made by other workers show up too.
+"""
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from . import models, normalize
+
+FIELDS = ("company_name", "job_title", "location", "domain", "applied_on")
+
+TTL_SECONDS = 300
+MAX_LIMIT = 20
+MAX_INDEXES = 32
+_MAX_CACHED_PREFIXES = 4096
+
+
+class PrefixIndex:
+    """Distinct values of one field with their counts, searchable by word prefix."""
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.spellings: Dict[str, Dict[str, int]] = {}
+        self.terms: List[Tuple[str, str]] = []
+        self._cache: Dict[str, List[Tuple[str, int]]] = {}
+
+    @staticmethod
+    def _terms(key: str) -> List[str]:
+        words = key.split(" ")
+        return [" ".join(words[i:]) for i in range(len(words))]
+
+    def add(self, value: Optional[str], count: int = 1):
+        key = normalize.text_key(value)
+        if key is None:
+            return
+        spellings = self.spellings.setdefault(key, {})
+        spellings[value.strip()] = spellings.get(value.strip(), 0) + count
+        if key not in self.counts:
+            self.counts[key] = 0
+            for term in self._terms(key):
+                insort(self.terms, (term, key))
+        self.counts[key] += count
+        self._invalidate(key)
+
+    def remove(self, value: Optional[str]):
+        key = normalize.text_key(value)
+        if key not in self.counts:
+            return
+        spellings = self.spellings[key]
+        spelling = value.strip()
+        if spelling in spellings:
+            spellings[spelling] -= 1
+            if spellings[spelling] <= 0:
+                del spellings[spelling]
+        self.counts[key] -= 1
+        if self.counts[key] <= 0:
+            del self.counts[key]
+            del self.spellings[key]
+            for term in self._terms(key):
+                i = bisect_left(self.terms, (term, key))
+                del self.terms[i]
+        self._invalidate(key)
+
+    def _invalidate(self, key: str):
+        for term in self._terms(key):
+            for end in range(len(term) + 1):
+                self._cache.pop(term[:end], None)
+
+    def _display(self, key: str) -> str:
+        spellings = self.spellings.get(key)
+        return max(spellings, key=lambda s: (spellings[s], s)) if spellings else key
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Up to limit (value, count) pairs with a word starting with prefix, most used first."""
+        prefix = normalize.text_key(prefix) or ""
+        top = self._cache.get(prefix)
+        if top is None:
+            start = bisect_left(self.terms, (prefix,))
+            end = bisect_left(self.terms, (prefix + "\U0010ffff",), start)
+            keys = {key for _, key in self.terms[start:end]}
+            # Most used first; then values that start with the prefix, then A-Z
+            best = heapq.nsmallest(
+                MAX_LIMIT, keys,
+                key=lambda k: (-self.counts[k], not k.startswith(prefix), k),
+            )
+            top = [(self._display(key), self.counts[key]) for key in best]
+            if len(self._cache) >= _MAX_CACHED_PREFIXES:
+                self._cache.clear()
+            self._cache[prefix] = top
+        return top[:limit]
+
+
+class TypeaheadIndex:
+    """A PrefixIndex for every field in FIELDS, for one database."""
+
+    def __init__(self):
+        self.fields = {field: PrefixIndex() for field in FIELDS}
+        self.built_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() - self.built_at > TTL_SECONDS
+
+    def apply(self, before: Optional[dict], after: Optional[dict]):
+        """Account for an application going from the before values to the after values."""
+        with self.lock:
+            for field, index in self.fields.items():
+                old = before.get(field) if before else None
+                new = after.get(field) if after else None
+                if old == new:
+                    continue
+                index.remove(old)
+                index.add(new)
+
+    def suggest(self, field: str, prefix: str, limit: int = 10) -> List[dict]:
+        with self.lock:
+            matches = self.fields[field].suggest(prefix, max(1, min(limit, MAX_LIMIT)))
+        return [{"value": value, "count": count} for value, count in matches]
+
+
+_indexes: "OrderedDict[str, TypeaheadIndex]" = OrderedDict()
+_indexes_lock = threading.Lock()
+
+
+def _database_key(db: Session) -> str:
+    # Backend and database name only, so the read replica and the primary
+    # (same data, different host) share one index
+    url = db.get_bind().url
+    return f"{url.get_backend_name()}:{url.database}"
+
+
+def values(application: models.JobApplication) -> dict:
+    return {field: getattr(application, field) for field in FIELDS}
+
+
+def cached(db: Session) -> Optional[TypeaheadIndex]:
+    """The database's index if it's built and fresh; doesn't touch the database."""
+    key = _database_key(db)
+    with _indexes_lock:
+        index = _indexes.get(key)
+        if index is None or index.expired:
+            return None
+        _indexes.move_to_end(key)
+        return index
+
+
+def load(db: Session) -> TypeaheadIndex:
+    """The database's index, (re)built from one GROUP BY query per field if needed."""
+    index = cached(db)
+    if index is not None:
+        return index
+    index = TypeaheadIndex()
+    for field in FIELDS:
+        column = getattr(models.JobApplication, field)
+        rows = db.query(column, func.count()).filter(column.isnot(None)).group_by(column)
+        for value, count in rows:
+            index.fields[field].add(value, count)
+    with _indexes_lock:
+        _indexes[_database_key(db)] = index
+        while len(_indexes) > MAX_INDEXES:
+            _indexes.popitem(last=False)
+    return index
+
+
+def application_changed(db: Session, before: Optional[dict], after: Optional[dict]):
+    """Update the database's index, if it has one, after a committed write.
+
+    before is None for a new application, after is None for a deleted one.
+    """
+    with _indexes_lock:
+        index = _indexes.get(_database_key(db))
+    if index is not None:
+        index.apply(before, after)
+
+
+def invalidate(db: Session):
+    """Drop the database's index, after a bulk write that bypassed application_changed()."""
+    with _indexes_lock:
+        _indexes.pop(_database_key(db), None)
+
+
+def invalidate_all():
+    """Drop every index, e.g. after a restore replaced the data underneath them."""
+    with _indexes_lock:
+        _indexes.clear()
@@ -0,0 +1,178 @@
+"""
+Upload storage helpers: sharded file layout and orphaned file garbage collection.
+
+Uploaded documents live under uploads/<cvs|coverletters>/<shard>/<filename>,
+where <shard> is the first two hex digits of the filename's hash. This keeps
+every directory small (256 shards per document type) no matter how many
+files accumulate.
+"""
+import hashlib
+import os
+import shutil
+import time
+from datetime import datetime
+from typing import Dict, Iterator, List, Set
+
+from sqlalchemy.orm import Session
+
+from . import models
+
+UPLOAD_ROOT = "uploads"
+UPLOAD_DIRS = {
+    "cv": os.path.join(UPLOAD_ROOT, "cvs"),
+    "coverletter": os.path.join(UPLOAD_ROOT, "coverletters"),
+}
+# Kept outside UPLOAD_ROOT so backups that copy uploads/ never pick it up
+QUARANTINE_ROOT = "uploads_quarantine"
+
+# Files younger than this are never collected: an upload writes the file
+# before the row pointing at it is committed.
+DEFAULT_MIN_AGE_SECONDS = 3600
+
+
+def ensure_upload_dirs():
+    for path in UPLOAD_DIRS.values():
+        os.makedirs(path, exist_ok=True)
+
+
+def _shard_for(filename: str) -> str:
+    return hashlib.md5(filename.encode("utf-8")).hexdigest()[:2]
+
+
+def sharded_path(doc_type: str, filename: str) -> str:
+    """Return the storage path for a new upload, creating its shard directory."""
+    shard_dir = os.path.join(UPLOAD_DIRS[doc_type], _shard_for(filename))
+    os.makedirs(shard_dir, exist_ok=True)
+    return os.path.join(shard_dir, filename)
+
+
+def remove_file(filepath: str):
+    """Best-effort delete of an upload; a leftover file is picked up by the GC."""
+    if filepath and os.path.exists(filepath):
+        try:
+            os.remove(filepath)
+        except OSError as e:
+            print(f"Could not remove {filepath}: {e}")
+
+
+def _normalize(path: str) -> str:
+    return os.path.normpath(path)
+
+
+def referenced_paths(db: Session, batch_size: int = 1000) -> Set[str]:
+    """Stream every document path referenced by job_applications."""
+    referenced = set()
+    rows = db.query(
+        models.JobApplication.cv_filepath,
+        models.JobApplication.coverletter_filepath,
+    ).filter(
+        (models.JobApplication.cv_filepath.isnot(None))
+        | (models.JobApplication.coverletter_filepath.isnot(None))
+    ).yield_per(batch_size)
+    for cv_path, cl_path in rows:
+        if cv_path:
+            referenced.add(_normalize(cv_path))
+        if cl_path:
+            referenced.add(_normalize(cl_path))
+    return referenced
+
+
+def iter_upload_files(root: str = UPLOAD_ROOT) -> Iterator[os.DirEntry]:
+    """Walk the upload tree with os.scandir, yielding regular files."""
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False) and entry.name != ".gitkeep":
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def collect_garbage(sessions: List[Session], dry_run: bool = True, quarantine: bool = True,
+                    min_age_seconds: int = DEFAULT_MIN_AGE_SECONDS) -> Dict:
+    """Find upload files no application references and quarantine or delete them.
+
+    The upload folder is shared, so sessions must cover every database that
+    can reference it (the default one and each user's, see
+    database.all_database_sessions). With dry_run=True nothing is touched and
+    the report lists what would be collected. Quarantined files are moved to uploads_quarantine/<timestamp>/
+    keeping their relative path, so they can be put back by hand.
+    """
+    referenced = set()
+    for db in sessions:
+        referenced |= referenced_paths(db)
+    cutoff = time.time() - min_age_seconds
+    quarantine_dir = os.path.join(QUARANTINE_ROOT, datetime.now().strftime("%Y%m%d_%H%M%S"))
+
+    scanned = 0
+    skipped_recent = 0
+    orphans = []
+    reclaimed_bytes = 0
+    for entry in iter_upload_files():
+        scanned += 1
+        path = _normalize(entry.path)
+        if path in referenced:
+            continue
+        stat = entry.stat(follow_symlinks=False)
+        if stat.st_mtime > cutoff:
+            skipped_recent += 1
+            continue
+        orphans.append(path)
+        reclaimed_bytes += stat.st_size
+        if dry_run:
+            continue
+        if quarantine:
+            target = os.path.join(quarantine_dir, os.path.relpath(path, UPLOAD_ROOT))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+        else:
+            remove_file(path)
+
+    return {
+        "dry_run": dry_run,
+        "action": "quarantine" if quarantine else "delete",
+        "scanned": scanned,
+        "referenced": len(referenced),
+        "orphaned": len(orphans),
+        "skipped_recent": skipped_recent,
+        "reclaimed_bytes": reclaimed_bytes,
+        "quarantine_dir": quarantine_dir if quarantine and orphans and not dry_run else None,
+        "orphaned_files": orphans,
+    }
+
+
+def reshard_uploads(db: Session) -> Dict:
+    """Move files stored in the old flat layout into shards and update their paths."""
+    moved = 0
+    missing = 0
+    columns = {
+        "cv": models.JobApplication.cv_filepath,
+        "coverletter": models.JobApplication.coverletter_filepath,
+    }
+    for doc_type, column in columns.items():
+        flat_dir = _normalize(UPLOAD_DIRS[doc_type])
+        rows = db.query(models.JobApplication.id, column).filter(column.isnot(None)).all()
+        for app_id, current in rows:
+            if _normalize(os.path.dirname(current)) != flat_dir:
+                continue  # already sharded
+            if not os.path.exists(current):
+                missing += 1
+                continue
+            target = sharded_path(doc_type, os.path.basename(current))
+            os.replace(current, target)
+            try:
+                db.query(models.JobApplication).filter(
+                    models.JobApplication.id == app_id
+                ).update({column: target}, synchronize_session=False)
+                db.commit()
+            except Exception:
+                db.rollback()
+                os.replace(target, current)
+                raise
+            moved += 1
+    return {"moved": moved, "missing": missing}
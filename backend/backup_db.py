@@ -0,0 +1,52 @@
+"""
+Database snapshot script
+Writes a transactionally consistent copy of job_tracker.db using the SQLite
+backup API, so it is safe to run while the app is serving requests.
+
+With DATABASE_URL pointing at PostgreSQL, the tables are dumped into a
+SQLite file instead, so backups have the same format on every backend.
+
+Usage (from the backend directory):
+    python backup_db.py <destination> [--compression none|gzip|zstd]
+"""
+import argparse
+import shutil
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import backup
+
+DB_PATH = "job_tracker.db"
+
+
+def snapshot_to_tempfile(db_path):
+    if not os.environ.get("DATABASE_URL", "sqlite").startswith("sqlite"):
+        from app import dump  # needs SQLAlchemy and the database driver
+        return dump.snapshot_to_tempfile()
+    return backup.snapshot_to_tempfile(db_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Take a consistent snapshot of the database")
+    parser.add_argument("destination", help="file to write the snapshot to")
+    parser.add_argument("--compression", default="none", choices=list(backup.COMPRESSION_SUFFIXES))
+    parser.add_argument("--db", default=DB_PATH, help="database to snapshot (default: job_tracker.db)")
+    args = parser.parse_args()
+
+    try:
+        backup.check_compression(args.compression)
+        snapshot_path = snapshot_to_tempfile(args.db)
+        try:
+            if args.compression == "none":
+                shutil.move(snapshot_path, args.destination)
+            else:
+                backup.write_compressed(snapshot_path, args.destination, args.compression)
+        finally:
+            if os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+        print(f"Snapshot written to {args.destination}")
+    except Exception as e:
+        print(f"\nERROR: Snapshot failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,81 @@
+"""
+Import-time check for the API workers
+Imports app.main in fresh interpreters with `python -X importtime` and fails
+if the import takes longer than the budget, or if it pulls in modules that
+only rarely used endpoints need (pandas / openpyxl for the Excel export).
+
+Runs against a throwaway database so the real one is never touched; the
+first import creates it, the measured ones hit the "schema is current" path
+every worker start takes.
+
+Usage (from the backend directory):
+    python check_import_time.py [--budget-ms 1500] [--runs 3]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+MODULE = "app.main"
+# Must stay lazily imported (see app/export.py)
+FORBIDDEN_MODULES = ("pandas", "openpyxl", "numpy")
+DEFAULT_BUDGET_MS = 1500
+
+
+def import_once(env) -> dict:
+    """Import MODULE in a new interpreter; return {module: cumulative microseconds}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {MODULE}"],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {MODULE} failed:\n{result.stderr}")
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            timings[name.strip()] = int(cumulative)
+        except ValueError:
+            continue  # header line
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check how long importing the API takes")
+    parser.add_argument("--budget-ms", type=int, default=int(os.environ.get("IMPORT_BUDGET_MS", DEFAULT_BUDGET_MS)))
+    parser.add_argument("--runs", type=int, default=3, help="measured imports; the fastest one counts")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            DB_PATH=os.path.join(tmp, "job_tracker.db"),
+            MIGRATION_LOCK_FILE=os.path.join(tmp, "migrate.lock"),
+        )
+        env.pop("DATABASE_URL", None)
+        env.pop("DATABASE_READ_URL", None)
+        try:
+            import_once(env)  # creates the schema
+            runs = [import_once(env) for _ in range(max(args.runs, 1))]
+        except RuntimeError as e:
+            print(f"\nERROR: {e}")
+            sys.exit(1)
+
+    best_ms = min(run[MODULE] for run in runs) / 1000
+    loaded = sorted(m for m in FORBIDDEN_MODULES if any(m in run for run in runs))
+    print(f"import {MODULE}: {best_ms:.0f} ms (budget {args.budget_ms} ms, best of {len(runs)})")
+
+    failed = False
+    if loaded:
+        print(f"FAIL: {', '.join(loaded)} imported at start-up; import them lazily where they are used")
+        failed = True
+    if best_ms > args.budget_ms:
+        print(f"FAIL: import took {best_ms:.0f} ms, over the {args.budget_ms} ms budget")
+        failed = True
+    if failed:
+        sys.exit(1)
+    print("OK")
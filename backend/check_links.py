@@ -0,0 +1,41 @@
+"""
+Cold message <-> connection link check
+Finds cold messages linked to deleted connections and connections whose
+cold_message_id / cold_message_sent disagree with the messages linked to
+them, and repairs them (see app/links.py). With MULTI_TENANT, every user's
+database is checked.
+
+Usage (from the backend directory):
+    python check_links.py             # repair broken links
+    python check_links.py --check     # only report, exit code 1 if any are broken
+"""
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import all_database_sessions
+from app import links
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check and repair cold message / connection links")
+    parser.add_argument("--check", action="store_true", help="report only, change nothing")
+    args = parser.parse_args()
+
+    try:
+        broken = 0
+        with all_database_sessions() as sessions:
+            for db in sessions:
+                report = links.repair_links(db, dry_run=args.check)
+                for rule, count in report.items():
+                    if count:
+                        print(f"  {rule}: {count}")
+                broken += sum(report.values())
+        verb = "Found" if args.check else "Repaired"
+        print(f"{verb} {broken} broken cold message / connection links")
+        if args.check and broken:
+            sys.exit(1)
+    except Exception as e:
+        print(f"\nERROR: Link check failed: {str(e)}")
+        sys.exit(1)
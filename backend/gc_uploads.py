@@ -0,0 +1,53 @@
+"""
+Upload garbage collection script
+Finds uploaded CVs / cover letters that no application references any more
+and moves them to uploads_quarantine/ (or deletes them with --delete).
+With MULTI_TENANT, every user's database counts as a reference.
+
+Usage (from the backend directory):
+    python gc_uploads.py              # quarantine orphaned files
+    python gc_uploads.py --dry-run    # only report what would be collected
+    python gc_uploads.py --delete     # delete orphaned files instead
+    python gc_uploads.py --reshard    # move flat-layout files into shards first
+"""
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import all_database_sessions
+from app import uploads
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Clean up orphaned upload files")
+    parser.add_argument("--dry-run", action="store_true", help="report only, change nothing")
+    parser.add_argument("--delete", action="store_true", help="delete instead of quarantining")
+    parser.add_argument("--reshard", action="store_true", help="move flat-layout files into shards")
+    parser.add_argument("--min-age-minutes", type=int, default=60,
+                        help="skip files modified more recently than this (default: 60)")
+    args = parser.parse_args()
+
+    try:
+        with all_database_sessions() as sessions:
+            if args.reshard and not args.dry_run:
+                for db in sessions:
+                    result = uploads.reshard_uploads(db)
+                    print(f"Resharded {result['moved']} files ({result['missing']} referenced files missing)")
+
+            report = uploads.collect_garbage(
+                sessions,
+                dry_run=args.dry_run,
+                quarantine=not args.delete,
+                min_age_seconds=args.min_age_minutes * 60,
+            )
+        for path in report["orphaned_files"]:
+            print(f"  orphan: {path}")
+        verb = "Would collect" if args.dry_run else ("Deleted" if args.delete else "Quarantined")
+        print(f"Scanned {report['scanned']} files, {report['referenced']} referenced")
+        print(f"{verb} {report['orphaned']} orphaned files ({report['reclaimed_bytes']} bytes)")
+        if report["quarantine_dir"]:
+            print(f"Quarantine folder: {report['quarantine_dir']}")
+    except Exception as e:
+        print(f"\nERROR: Upload cleanup failed: {str(e)}")
+        sys.exit(1)
@@ -0,0 +1,55 @@
+"""
+Incremental backup script
+Stores only the rows and uploaded files that changed since the previous
+backup, next to a row-hash manifest. See app/incremental.py for the layout.
+
+Usage (from the backend directory):
+    python incremental_backup.py create [--full]
+    python incremental_backup.py list
+    python incremental_backup.py restore <backup id> <destination .db> [--uploads DIR]
+"""
+import argparse
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app import incremental
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Incremental database and upload backups")
+    parser.add_argument("--root", default=incremental.INCREMENTAL_ROOT, help="backup folder")
+    parser.add_argument("--db", default="job_tracker.db", help="database to back up")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    create = sub.add_parser("create", help="write a new backup")
+    create.add_argument("--full", action="store_true", help="start a new chain with a full backup")
+    create.add_argument("--uploads", default="uploads", help="upload folder to include")
+
+    sub.add_parser("list", help="list backups")
+
+    restore = sub.add_parser("restore", help="rebuild a database file from a backup chain")
+    restore.add_argument("backup_id")
+    restore.add_argument("destination")
+    restore.add_argument("--uploads", help="also restore missing upload files into this folder")
+
+    args = parser.parse_args()
+    try:
+        if args.command == "create":
+            result = incremental.create_backup(args.db, args.uploads, args.root, full=args.full)
+            stats = result["stats"]
+            print(f"{result['kind'].capitalize()} backup {result['id']} written to {args.root}")
+            print(f"  {stats['changed_rows']} changed rows, {stats['changed_uploads']} changed uploads, "
+                  f"{result['size_bytes']} bytes")
+        elif args.command == "list":
+            for b in incremental.list_backups(args.root):
+                print(f"{b['id']}  {b['kind']:<11}  {b['stats']['changed_rows']:>7} rows  {b['size_bytes']:>10} bytes")
+        else:
+            uploads = incremental.materialize(args.backup_id, args.destination, args.root)
+            print(f"Database as of {args.backup_id} written to {args.destination}")
+            if args.uploads:
+                restored = incremental.restore_uploads(uploads, args.uploads, args.root)
+                print(f"Restored {restored} upload files into {args.uploads}")
+    except Exception as e:
+        print(f"\nERROR: {str(e)}")
+        sys.exit(1)
@@ -9,20 +9,22 @@ import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 try:
-    from app.migration import migrate_database
+    from app.migration import LOCK_FILE, migrate_database
 except ImportError:
     # Fallback if running from a different context where 'app' is not a package
     # This copies the logic just in case, or we can just try to add CWD to path
     try:
         sys.path.append(os.getcwd())
-        from app.migration import migrate_database
+        from app.migration import LOCK_FILE, migrate_database
     except ImportError:
         print("Could not import migration logic. Please ensure you are running from the backend directory.")
         sys.exit(1)
 
 if __name__ == "__main__":
     try:
-        migrate_database()
+        # DATABASE_URL selects another backend (e.g. PostgreSQL); default is job_tracker.db
+        if not migrate_database(db_url=os.environ.get("DATABASE_URL"), lock_file=LOCK_FILE):
+            print("Database schema is already up to date.")
     except Exception as e:
         print(f"\nERROR: Migration failed: {str(e)}")
         print("Please check the error and try again.")
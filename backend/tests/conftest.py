@@ -0,0 +1,37 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Point the app at a scratch database before anything imports app.database
+_SCRATCH = tempfile.mkdtemp(prefix="job_tracker_tests_")
+os.environ.setdefault("DB_PATH", os.path.join(_SCRATCH, "job_tracker.db"))
+os.environ.setdefault("BACKUP_INTERVAL_MINUTES", "0")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import NullPool  # noqa: E402
+
+from app import migration  # noqa: E402
+
+
+def migrated_engine(path: str):
+    """Engine for a new SQLite file at path, migrated to the current schema."""
+    migration.migrate_database(db_path=path)
+    return create_engine(f"sqlite:///{path}", poolclass=NullPool)
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = migrated_engine(str(tmp_path / "job_tracker.db"))
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
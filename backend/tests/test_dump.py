@@ -0,0 +1,43 @@
+from sqlalchemy import text
+
+from app import crud, dump, schemas
+
+from conftest import migrated_engine
+
+
+def _rows(engine, table: str, columns: str = "*"):
+    with engine.connect() as conn:
+        return sorted(tuple(row) for row in conn.execute(text(f"SELECT {columns} FROM {table}")))
+
+
+def test_dump_and_load_keep_saved_views_and_skills(engine, db, tmp_path):
+    crud.create_application(db, schemas.JobApplicationCreate(
+        company_name="Acme", job_title="Data Engineer", status="Interview",
+        job_description="Python, SQL and AWS; more Python",
+    ))
+    crud.create_application(db, schemas.JobApplicationCreate(
+        company_name="Globex", job_title="Developer", status="Applied",
+    ))
+    crud.create_saved_view(db, schemas.SavedViewCreate(
+        name="Interviews", filters=schemas.SavedViewFilters(status="Interview"),
+    ))
+
+    dumped = str(tmp_path / "dump.db")
+    with engine.connect() as conn:
+        dump.dump_database(conn, dumped)
+
+    restored = migrated_engine(str(tmp_path / "restored.db"))
+    try:
+        with restored.begin() as conn:
+            dump.load_database(conn, dumped)
+        for table, columns in (
+            ("job_applications", "id, company_name, status, job_description"),
+            ("saved_views", "id, name, match_count"),
+            ("saved_view_members", "*"),
+            ("application_skills", "*"),
+        ):
+            assert _rows(restored, table, columns) == _rows(engine, table, columns)
+        assert len(_rows(restored, "saved_view_members")) == 1
+        assert _rows(restored, "application_skills", "skill, mentions") == [("AWS", 1), ("Python", 2), ("SQL", 1)]
+    finally:
+        restored.dispose()
@@ -0,0 +1,24 @@
+import pytest
+from sqlalchemy import inspect, text
+
+from app import migration
+
+
+def _failing_step(conn):
+    conn.execute(text("CREATE TABLE half_migrated (id INTEGER PRIMARY KEY)"))
+    conn.execute(text("ALTER TABLE job_applications ADD COLUMN half_migrated TEXT"))
+    raise RuntimeError("step failed")
+
+
+def test_failed_migration_rolls_back_its_schema_changes(engine, monkeypatch):
+    version = migration.LATEST_VERSION
+    monkeypatch.setattr(migration, "MIGRATIONS", migration.MIGRATIONS + [(version + 1, "Fails", _failing_step)])
+    monkeypatch.setattr(migration, "LATEST_VERSION", version + 1)
+
+    with pytest.raises(RuntimeError):
+        migration.migrate_database(db_path=engine.url.database)
+
+    assert migration.current_version(engine) == version
+    schema = inspect(engine)
+    assert not schema.has_table("half_migrated")
+    assert "half_migrated" not in {c["name"] for c in schema.get_columns("job_applications")}
@@ -0,0 +1,57 @@
+from sqlalchemy import event, text
+
+from app import crud, schemas
+
+COMPANIES = ["Acme", None, "Globex", "Acme", None, "Initech", "Globex", "Acme"]
+
+
+def _add_messages(db):
+    for i, company in enumerate(COMPANIES):
+        crud.create_cold_message(db, schemas.ColdMessageCreate(
+            contact_name=f"Contact {i}", company_name=company, via="Email",
+        ))
+
+
+def _all_pages(db, sort_by, sort_order, limit):
+    ids, cursor = [], None
+    while True:
+        page = crud.get_cold_message_page(db, sort_by=sort_by, sort_order=sort_order, cursor=cursor, limit=limit)
+        ids += [row.id for row in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_pages_cover_ties_and_nulls_in_both_directions(db):
+    _add_messages(db)
+    rows = [(company, i + 1) for i, company in enumerate(COMPANIES)]
+    named = [row for row in rows if row[0] is not None]
+    nulls = [row[1] for row in rows if row[0] is None]
+    ascending = [row_id for _, row_id in sorted(named)] + nulls
+    descending = [row_id for _, row_id in sorted(named, reverse=True)] + nulls[::-1]
+
+    for limit in (1, 2, 3, 50):
+        assert _all_pages(db, "company_name", "asc", limit) == ascending
+        assert _all_pages(db, "company_name", "desc", limit) == descending
+
+
+def test_next_page_is_an_index_range_scan(engine, db):
+    _add_messages(db)
+    first = crud.get_cold_message_page(db, sort_by="created_at", sort_order="desc", limit=2)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        crud.get_cold_message_page(db, sort_by="created_at", sort_order="desc", cursor=first["next_cursor"], limit=2)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    statement, parameters = next(s for s in statements if "cold_messages" in s[0])
+    with engine.connect() as conn:
+        plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters))
+    assert "ix_cold_messages_created_at_id" in plan
+    assert "TEMP B-TREE" not in plan
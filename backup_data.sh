@@ -5,6 +5,18 @@ echo "Backing Up Job Application Data"
 echo "===================================="
 echo ""
 
+# Incremental mode: only store what changed since the previous incremental backup
+if [ "$1" = "--incremental" ]; then
+    echo "Creating incremental backup in backups/incremental ..."
+    if python3 backend/incremental_backup.py --db backend/job_tracker.db --root backups/incremental create --uploads backend/uploads; then
+        echo "[OK] Incremental backup complete"
+    else
+        echo "[ERROR] Incremental backup failed"
+        exit 1
+    fi
+    exit 0
+fi
+
 # Create backup folder with timestamp
 timestamp=$(date +"%Y%m%d_%H%M%S")
 backup_folder="backups/backup_$timestamp"
@@ -12,12 +24,22 @@ backup_folder="backups/backup_$timestamp"
 echo "Creating backup folder: $backup_folder"
 mkdir -p "$backup_folder"
 
-# Backup database
+# Backup database (consistent snapshot via the SQLite backup API, safe while the app is running)
 echo "Backing up database..."
-if cp backend/job_tracker.db "$backup_folder/job_tracker.db" 2>/dev/null; then
-    echo "[OK] Database backed up"
+if command -v python3 >/dev/null 2>&1; then
+    # A failed snapshot (locked database, full disk, ...) must not fall back
+    # to copying the live file, which can capture a half-written database
+    if python3 backend/backup_db.py "$backup_folder/job_tracker.db" --db backend/job_tracker.db >/dev/null; then
+        echo "[OK] Database backed up"
+    else
+        echo "[ERROR] Database snapshot failed"
+        exit 1
+    fi
+elif cp backend/job_tracker.db "$backup_folder/job_tracker.db" 2>/dev/null; then
+    echo "[WARN] python3 unavailable, copied database file directly (stop the app first for a consistent copy)"
 else
     echo "[ERROR] Failed to backup database"
+    exit 1
 fi
 
 # Backup uploads folder
@@ -4,6 +4,7 @@ import { ApplicationList } from './components/ApplicationList';
 import { ColdMessages } from './components/ColdMessages';
 import { ConnectionRequests } from './components/ConnectionRequests';
 import { Sidebar } from './components/Sidebar';
+import { SavedView } from './types';
 import { useTheme } from './contexts/ThemeContext';
 import { ToastProvider } from './context/ToastContext';
 import './index.css';
@@ -18,7 +19,8 @@ function AppContent() {
   });
 
 
-  const [initialFilter, setInitialFilter] = useState<{ type: string; value: string; timestamp?: number } | null>(null);
+  const [initialFilter, setInitialFilter] = useState<{ type: string; value: string; label?: string; timestamp?: number } | null>(null);
+  const [viewsVersion, setViewsVersion] = useState(0);
   const { isDark, toggleTheme } = useTheme();
 
   // Sync state to URL and handle back button
@@ -50,6 +52,11 @@ function AppContent() {
     setActiveTab('applications');
   };
 
+  const handleOpenView = (view: SavedView) => {
+    setInitialFilter({ type: 'view', value: String(view.id), label: view.name, timestamp: Date.now() });
+    setActiveTab('applications');
+  };
+
   return (
     <div className={`min-h-screen flex ${isDark ? 'dark bg-gray-900' : 'bg-gray-50'}`}>
       <Sidebar
@@ -57,6 +64,8 @@ function AppContent() {
         setActiveTab={setActiveTab}
         isDark={isDark}
         toggleTheme={toggleTheme}
+        onOpenView={handleOpenView}
+        viewsVersion={viewsVersion}
       />
 
       {/* Main Content Area */}
@@ -68,7 +77,7 @@ function AppContent() {
             </div>
           ) : activeTab === 'applications' ? (
             <div className="animate-slideUp">
-              <ApplicationList initialFilter={initialFilter} />
+              <ApplicationList initialFilter={initialFilter} onViewsChange={() => setViewsVersion(v => v + 1)} />
             </div>
           ) : activeTab === 'connection-requests' ? (
             <div className="animate-slideUp">
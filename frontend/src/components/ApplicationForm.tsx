@@ -1,5 +1,5 @@
 import { useState, FormEvent, useEffect } from 'react';
-import { JobApplicationCreate, JobApplication, STATUS_OPTIONS, WORK_TYPE_OPTIONS, APPLIED_ON_OPTIONS, REJECTION_STAGE_OPTIONS, NetworkingContact, COLD_MESSAGE_VIA_OPTIONS, COLD_CONTACT_CATEGORY_OPTIONS } from '../types';
+import { JobApplicationCreate, JobApplication, STATUS_OPTIONS, WORK_TYPE_OPTIONS, APPLIED_ON_OPTIONS, REJECTION_STAGE_OPTIONS, NetworkingContact, COLD_MESSAGE_VIA_OPTIONS, COLD_CONTACT_CATEGORY_OPTIONS, DuplicateMatch, TypeaheadField } from '../types';
 import { applicationApi, connectionApi } from '../services/api';
 import { FaTimes, FaLinkedin, FaPlus, FaTrash, FaEnvelope, FaChevronDown, FaChevronUp } from 'react-icons/fa';
 import { TagsInput } from './TagsInput';
@@ -48,11 +48,12 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
   const [coverLetterFile, setCoverLetterFile] = useState<File | null>(null);
   const [submitting, setSubmitting] = useState(false);
   const [availableTags, setAvailableTags] = useState<string[]>([]);
-  const [possibleDuplicates, setPossibleDuplicates] = useState<any[]>([]);
+  const [possibleDuplicates, setPossibleDuplicates] = useState<DuplicateMatch[]>([]);
   const [showDuplicateWarning, setShowDuplicateWarning] = useState(false);
   const [customAppliedOn, setCustomAppliedOn] = useState('');
   const [isCustomAppliedOn, setIsCustomAppliedOn] = useState(false);
   const [autoAddToast, setAutoAddToast] = useState<string | null>(null);
+  const [suggestions, setSuggestions] = useState<Partial<Record<TypeaheadField, string[]>>>({});
 
   // Cold email — main contact — multi-email state
   const [contactEmailInput, setContactEmailInput] = useState('');
@@ -107,7 +108,7 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
     }
   };
 
-  // Check for duplicates when company or job title changes
+  // Check for duplicates when company, job title, URL or description changes
   useEffect(() => {
     const checkDuplicates = async () => {
       if (!formData.company_name || !formData.job_title) {
@@ -117,20 +118,13 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
       }
 
       try {
-        // Search for similar applications
-        const allApps = await applicationApi.getAll({
-          search: formData.company_name,
-        });
-
-        const duplicates = allApps.filter(app => {
+        const duplicates = await applicationApi.checkDuplicates({
+          company_name: formData.company_name,
+          job_title: formData.job_title,
+          job_url: formData.job_url || undefined,
+          job_description: formData.job_description || undefined,
           // Exclude the current application if editing/continuing
-          if (isEdit && initialData && app.id === initialData.id) {
-            return false;
-          }
-          const companyMatch = app.company_name.toLowerCase() === formData.company_name.toLowerCase();
-          const titleSimilar = app.job_title.toLowerCase().includes(formData.job_title.toLowerCase()) ||
-            formData.job_title.toLowerCase().includes(app.job_title.toLowerCase());
-          return companyMatch && titleSimilar;
+          exclude_id: isEdit && initialData ? initialData.id : undefined,
         });
 
         setPossibleDuplicates(duplicates);
@@ -142,10 +136,20 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
 
     const debounceTimer = setTimeout(checkDuplicates, 500);
     return () => clearTimeout(debounceTimer);
-  }, [formData.company_name, formData.job_title, isEdit, initialData]);
+  }, [formData.company_name, formData.job_title, formData.job_url, formData.job_description, isEdit, initialData]);
+
+  // Autocomplete from the values already used in other applications
+  const loadSuggestions = (field: TypeaheadField, q: string) => {
+    applicationApi.suggest(field, q)
+      .then(items => setSuggestions(prev => ({ ...prev, [field]: items.map(item => item.value) })))
+      .catch(error => console.error('Error loading suggestions:', error));
+  };
 
   const handleInputChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement | HTMLSelectElement>) => {
     const { name, value } = e.target;
+    if (e.target.getAttribute('list')) {
+      loadSuggestions(name as TypeaheadField, value);
+    }
 
     if (name === 'applied_on') {
       if (value === 'Other') {
@@ -244,11 +248,24 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
 
     if (contacts.length === 0) return;
 
+    let checks: { exists: boolean }[];
+    try {
+      checks = await connectionApi.checkDuplicates(
+        contacts.map(c => ({ name: c.name, company: c.company, linkedin_url: c.linkedin }))
+      );
+    } catch (err) {
+      console.error('Failed to check contacts for duplicates:', err);
+      return;
+    }
+
     let addedCount = 0;
-    for (const c of contacts) {
+    const seen = new Set<string>();
+    for (let i = 0; i < contacts.length; i++) {
+      const c = contacts[i];
+      const key = `${c.name.toLowerCase()}|${(c.company || '').toLowerCase()}|${(c.linkedin || '').toLowerCase()}`;
+      if (checks[i]?.exists || seen.has(key)) continue; // skip duplicate
+      seen.add(key);
       try {
-        const check = await connectionApi.checkDuplicate(c.name, c.company, c.linkedin);
-        if (check.exists) continue; // skip duplicate
         await connectionApi.create({
           contact_name: c.name,
           company_name: c.company || undefined,
@@ -404,7 +421,12 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
                 required
                 className="w-full px-3 py-2 border border-slate-300 dark:border-slate-600 rounded-md focus:ring-2 focus:ring-blue-500 focus:border-transparent bg-white dark:bg-slate-700 text-slate-900 dark:text-white placeholder-slate-400 dark:placeholder-slate-400"
                 placeholder="e.g., Google, Microsoft"
+                list="company_name-suggestions"
+                onFocus={() => loadSuggestions('company_name', formData.company_name)}
               />
+              <datalist id="company_name-suggestions">
+                {suggestions.company_name?.map(value => <option key={value} value={value} />)}
+              </datalist>
             </div>
 
             <div>
@@ -419,7 +441,12 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
                 required
                 className="w-full px-3 py-2 border border-slate-300 dark:border-slate-600 rounded-md focus:ring-2 focus:ring-blue-500 focus:border-transparent bg-white dark:bg-slate-700 text-slate-900 dark:text-white placeholder-slate-400 dark:placeholder-slate-400"
                 placeholder="e.g., Cloud Engineer"
+                list="job_title-suggestions"
+                onFocus={() => loadSuggestions('job_title', formData.job_title)}
               />
+              <datalist id="job_title-suggestions">
+                {suggestions.job_title?.map(value => <option key={value} value={value} />)}
+              </datalist>
             </div>
           </div>
 
@@ -441,7 +468,7 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
                     <ul className="list-disc list-inside mt-1 space-y-1">
                       {possibleDuplicates.map(dup => (
                         <li key={dup.id}>
-                          {dup.company_name} - {dup.job_title} ({dup.status})
+                          {dup.company_name} - {dup.job_title} ({dup.status}){dup.reason === 'same_url' && ' · same job link'}
                         </li>
                       ))}
                     </ul>
@@ -469,7 +496,12 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
                 onChange={handleInputChange}
                 className="w-full px-3 py-2 border border-slate-300 dark:border-slate-600 rounded-md focus:ring-2 focus:ring-blue-500 focus:border-transparent bg-white dark:bg-slate-700 text-slate-900 dark:text-white placeholder-slate-400 dark:placeholder-slate-400"
                 placeholder="e.g., Cloud Computing, DevOps"
+                list="domain-suggestions"
+                onFocus={() => loadSuggestions('domain', formData.domain || '')}
               />
+              <datalist id="domain-suggestions">
+                {suggestions.domain?.map(value => <option key={value} value={value} />)}
+              </datalist>
             </div>
 
             <div>
@@ -481,7 +513,12 @@ export const ApplicationForm = ({ onSuccess, onCancel, initialData, isEdit = fal
                 onChange={handleInputChange}
                 className="w-full px-3 py-2 border border-slate-300 dark:border-slate-600 rounded-md focus:ring-2 focus:ring-blue-500 focus:border-transparent bg-white dark:bg-slate-700 text-slate-900 dark:text-white placeholder-slate-400 dark:placeholder-slate-400"
                 placeholder="e.g., London, UK"
+                list="location-suggestions"
+                onFocus={() => loadSuggestions('location', formData.location || '')}
               />
+              <datalist id="location-suggestions">
+                {suggestions.location?.map(value => <option key={value} value={value} />)}
+              </datalist>
             </div>
 
             <div>
@@ -1,7 +1,7 @@
 import { useEffect, useState, useRef } from 'react';
-import { FaPlus, FaTimes, FaChevronDown, FaMagic } from 'react-icons/fa';
+import { FaPlus, FaTimes, FaChevronDown, FaMagic, FaBookmark, FaFillDrip } from 'react-icons/fa';
 import { JobApplication, FilterState, JobApplicationCreate } from '../types';
-import { applicationApi } from '../services/api';
+import { applicationApi, viewApi, jdApi } from '../services/api';
 import { ApplicationCard } from './ApplicationCard';
 import { ApplicationForm } from './ApplicationForm';
 import { SearchFilterBar } from './SearchFilterBar';
@@ -11,10 +11,11 @@ import { EmptyState } from './EmptyState';
 import { JDParserModal } from './JDParserModal';
 
 interface ApplicationListProps {
-  initialFilter?: { type: string; value: string; timestamp?: number } | null;
+  initialFilter?: { type: string; value: string; label?: string; timestamp?: number } | null;
+  onViewsChange?: () => void;
 }
 
-export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
+export const ApplicationList = ({ initialFilter, onViewsChange }: ApplicationListProps) => {
   const [applications, setApplications] = useState<JobApplication[]>([]);
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
@@ -26,6 +27,10 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
   const [domains, setDomains] = useState<string[]>([]);
   const [tags, setTags] = useState<string[]>([]);
   const [selectedIds, setSelectedIds] = useState<number[]>([]);
+  // Saved view opened from the sidebar; its results come from the server as stored
+  const [viewId, setViewId] = useState<number | null>(
+    initialFilter?.type === 'view' ? Number(initialFilter.value) : null
+  );
   // const searchInputRef = useRef<HTMLInputElement>(null);
   const [filters, setFilters] = useState<FilterState>(() => {
     const defaultFilters = {
@@ -83,6 +88,7 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
     // (first render handled by useState)
     if (initialFilter && initialFilter !== prevInitialFilterRef.current) {
       prevInitialFilterRef.current = initialFilter;
+      setViewId(initialFilter.type === 'view' ? Number(initialFilter.value) : null);
 
       if (initialFilter.type === 'status') {
         setFilters(prev => ({ ...prev, status: initialFilter.value }));
@@ -154,7 +160,7 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
   // Load applications whenever filters change or on mount
   useEffect(() => {
     loadApplications();
-  }, [filters]);
+  }, [filters, viewId]);
 
   // Keyboard shortcuts
   useKeyboardShortcuts({
@@ -174,6 +180,11 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
     try {
       setLoading(true);
 
+      if (viewId !== null) {
+        setApplications(await viewApi.getApplications(viewId));
+        return;
+      }
+
       // Check if status filter has multiple statuses (comma-separated)
       const hasMultipleStatuses = filters.status && filters.status.includes(',');
 
@@ -299,6 +310,46 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
     }
   };
 
+  const handleSaveView = async () => {
+    if (filters.status.includes(',')) {
+      alert('Saved views can filter on a single status only.');
+      return;
+    }
+    const name = window.prompt('Name for this view (e.g. "Remote interviews")');
+    if (!name || !name.trim()) return;
+    try {
+      await viewApi.create({
+        name: name.trim(),
+        filters: {
+          search: filters.search || undefined,
+          status: filters.status || undefined,
+          status_stage: filters.rejectionStage || undefined,
+          domain: filters.domain || undefined,
+          work_type: filters.workType || undefined,
+          tags: filters.tags.length > 0 ? filters.tags.join(',') : undefined,
+          include_archived: filters.includeArchived,
+        },
+        sort_by: filters.sortBy,
+        sort_order: filters.sortOrder,
+      });
+      onViewsChange?.();
+    } catch (error) {
+      console.error('Error saving view:', error);
+    }
+  };
+
+  const handleBackfill = async () => {
+    setShowAddMenu(false);
+    if (!window.confirm("Fill in missing salary, location and work type from each application's job description? Existing values are kept.")) return;
+    try {
+      const report = await jdApi.backfill();
+      alert(`Updated ${report.updated} of ${report.scanned} applications with missing fields.`);
+      loadApplications();
+    } catch (error) {
+      console.error('Error filling fields from job descriptions:', error);
+    }
+  };
+
   const handleBulkSuccess = () => {
     setSelectedIds([]);
     loadApplications();
@@ -333,9 +384,11 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
                 {initialFilter.type === 'workType' && `Work Type - ${initialFilter.value}`}
                 {initialFilter.type === 'applied' && 'Applied Jobs'}
                 {initialFilter.type === 'all' && 'All Applications'}
+                {initialFilter.type === 'view' && `Saved View - ${initialFilter.label}`}
               </span>
               <button
                 onClick={() => {
+                  setViewId(null);
                   setFilters({
                     search: '',
                     status: '',
@@ -357,6 +410,16 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
           )}
         </div>
         <div className="flex gap-2 items-center">
+          {viewId === null && (
+            <button
+              onClick={handleSaveView}
+              className="flex items-center gap-2 px-4 py-2 bg-slate-200 dark:bg-slate-700 text-slate-700 dark:text-slate-200 rounded-lg hover:bg-slate-300 dark:hover:bg-slate-600 transition-colors font-medium"
+              title="Save the current filters as a view in the sidebar"
+            >
+              <FaBookmark />
+              Save View
+            </button>
+          )}
           {applications.length > 0 && (
             <button
               onClick={toggleSelectAll}
@@ -416,6 +479,19 @@ export const ApplicationList = ({ initialFilter }: ApplicationListProps) => {
                     <p className="text-xs text-gray-400 dark:text-gray-500">Auto-extract from job post</p>
                   </div>
                 </button>
+                <div className="h-px bg-gray-100 dark:bg-slate-700" />
+                <button
+                  onClick={handleBackfill}
+                  className="w-full flex items-center gap-3 px-4 py-3 text-sm text-gray-700 dark:text-gray-200 hover:bg-gray-50 dark:hover:bg-slate-700 transition-colors text-left"
+                >
+                  <div className="p-1.5 bg-emerald-100 dark:bg-emerald-900/40 rounded-lg">
+                    <FaFillDrip className="text-emerald-600 dark:text-emerald-400 text-xs" />
+                  </div>
+                  <div>
+                    <p className="font-medium">Fill From JDs</p>
+                    <p className="text-xs text-gray-400 dark:text-gray-500">Missing salary, location, work type</p>
+                  </div>
+                </button>
               </div>
             )}
           </div>
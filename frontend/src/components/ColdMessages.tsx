@@ -236,6 +236,8 @@ const ColdMessageForm = ({ onSuccess, onCancel, initialData, connections }: Cold
 
 export const ColdMessages = () => {
   const [messages, setMessages] = useState<ColdMessage[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [stats, setStats] = useState<ColdMessageStats | null>(null);
   const [connections, setConnections] = useState<LinkedInConnection[]>([]);
   const [loading, setLoading] = useState(true);
@@ -249,18 +251,21 @@ export const ColdMessages = () => {
   // Lookup map: connection_id → connection name display
   const connMap = Object.fromEntries(connections.map(c => [c.id, c]));
 
+  const filters = () => ({
+    search: search || undefined,
+    via: filterVia || undefined,
+    category: filterCategory || undefined,
+  });
+
   const loadData = async () => {
     try {
-      const [msgs, st, conns] = await Promise.all([
-        coldMessageApi.getAll({
-          search: search || undefined,
-          via: filterVia || undefined,
-          category: filterCategory || undefined,
-        }),
+      const [page, st, conns] = await Promise.all([
+        coldMessageApi.getPage(filters()),
         coldMessageApi.getStatistics(),
         connectionApi.getAll(),
       ]);
-      setMessages(msgs);
+      setMessages(page.items);
+      setNextCursor(page.next_cursor);
       setStats(st);
       setConnections(conns);
     } catch (err) {
@@ -272,6 +277,31 @@ export const ColdMessages = () => {
 
   useEffect(() => { loadData(); }, [search, filterVia, filterCategory]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await coldMessageApi.getPage(filters(), nextCursor);
+      setMessages(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Error loading more cold messages:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The list only holds summaries, so fetch the message body and notes on open
+  const openMessage = async (msg: ColdMessage) => {
+    setSelectedMsg(msg);
+    setSelectedMsg(await coldMessageApi.getOne(msg.id));
+  };
+
+  const editMessage = async (msg: ColdMessage) => {
+    setEditingMsg(await coldMessageApi.getOne(msg.id));
+    setShowForm(true);
+  };
+
   const handleDelete = async (id: number) => {
     if (!confirm('Delete this cold message?')) return;
     await coldMessageApi.delete(id);
@@ -471,7 +501,7 @@ export const ColdMessages = () => {
             return (
               <div 
                 key={msg.id} 
-                onClick={() => setSelectedMsg(msg)}
+                onClick={() => openMessage(msg)}
                 className="glass-card rounded-2xl overflow-hidden transition-all duration-300 hover:translate-y-[-4px] hover:shadow-xl p-5 flex flex-col cursor-pointer h-full border-l-4"
                 style={{ borderLeftColor: msg.got_reply ? '#22c55e' : (msg.via === 'Email' ? '#6366f1' : '#3b82f6') }}
               >
@@ -516,11 +546,11 @@ export const ColdMessages = () => {
 
                 {/* Actions */}
                 <div className="flex flex-wrap gap-2 pt-3 border-t border-gray-100/50 dark:border-gray-700/50 mt-2" onClick={e => e.stopPropagation()}>
-                  <button onClick={() => setSelectedMsg(msg)}
+                  <button onClick={() => openMessage(msg)}
                     className="flex-1 flex items-center justify-center gap-1.5 btn-secondary text-sm" title="View details">
                     <FaEye className="text-blue-500" /> View
                   </button>
-                  <button onClick={() => { setEditingMsg(msg); setShowForm(true); }}
+                  <button onClick={() => editMessage(msg)}
                     className="flex items-center justify-center gap-1.5 btn-secondary text-sm px-3" title="Edit">
                     <FaEdit className="text-indigo-500" />
                   </button>
@@ -535,6 +565,14 @@ export const ColdMessages = () => {
         </div>
       )}
 
+      {nextCursor && (
+        <div className="flex justify-center mt-6">
+          <button onClick={loadMore} disabled={loadingMore} className="btn-secondary text-sm px-6 py-2">
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+
       {/* Detail Modal */}
       {selectedMsg && (
         <div className="fixed inset-0 bg-black bg-opacity-50 flex items-center justify-center z-50 p-4" onClick={() => setSelectedMsg(null)}>
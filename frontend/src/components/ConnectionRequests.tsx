@@ -1,9 +1,9 @@
-import { useState, useEffect, FormEvent, useMemo } from 'react';
+import { useState, useEffect, FormEvent, useMemo, useRef, ChangeEvent } from 'react';
 import {
   FaUserPlus, FaLinkedin, FaPlus, FaTimes, FaSearch,
   FaTrash, FaEdit, FaChevronDown, FaChevronUp, FaEnvelope,
   FaUsers, FaClock, FaCheckCircle, FaPaperPlane, FaExternalLinkAlt, FaBell,
-  FaBuilding, FaCheck, FaTimesCircle,
+  FaBuilding, FaCheck, FaTimesCircle, FaFileImport,
 } from 'react-icons/fa';
 import {
   LinkedInConnection, LinkedInConnectionCreate, LinkedInConnectionStats,
@@ -330,8 +330,8 @@ const ConnectionCard = ({ conn, onEdit, onDelete, onMarkSent, isNTC }: Connectio
               Follow-up: {formatDate(conn.follow_up_date)} {overdue && '(Overdue)'}
             </p>
           )}
-          {conn.notes && (
-            <p className="text-gray-400 dark:text-gray-500 line-clamp-2 mt-1 italic">"{conn.notes}"</p>
+          {(conn.notes || conn.notes_preview) && (
+            <p className="text-gray-400 dark:text-gray-500 line-clamp-2 mt-1 italic">"{conn.notes || conn.notes_preview}"</p>
           )}
         </div>
 
@@ -386,6 +386,9 @@ interface ConnectionRequestsProps {
 export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
   const [connections, setConnections] = useState<LinkedInConnection[]>([]);
   const [needToConnect, setNeedToConnect] = useState<LinkedInConnection[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [ntcNextCursor, setNtcNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [stats, setStats] = useState<LinkedInConnectionStats | null>(null);
   const [loading, setLoading] = useState(true);
   const [showForm, setShowForm] = useState(false);
@@ -397,20 +400,25 @@ export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
   // active stat card filter (for visual highlight)
   const [activeFilter, setActiveFilter] = useState<string>('all');
 
+  const requestedFilters = () => ({
+    search: search || undefined,
+    status: filterStatus || undefined,
+    category: filterCategory || undefined,
+    stage: 'Requested',
+  });
+  const ntcFilters = { stage: 'Need to Connect' };
+
   const loadData = async () => {
     try {
       const [requested, ntc, st] = await Promise.all([
-        connectionApi.getAll({
-          search: search || undefined,
-          status: filterStatus || undefined,
-          category: filterCategory || undefined,
-          stage: 'Requested',
-        }),
-        connectionApi.getAll({ stage: 'Need to Connect' }),
+        connectionApi.getPage(requestedFilters()),
+        connectionApi.getPage(ntcFilters),
         connectionApi.getStatistics(),
       ]);
-      setConnections(requested);
-      setNeedToConnect(ntc);
+      setConnections(requested.items);
+      setNextCursor(requested.next_cursor);
+      setNeedToConnect(ntc.items);
+      setNtcNextCursor(ntc.next_cursor);
       setStats(st);
     } catch (err) {
       console.error('Error loading connections:', err);
@@ -421,6 +429,63 @@ export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
 
   useEffect(() => { loadData(); }, [search, filterStatus, filterCategory]);
 
+  const loadMore = async (ntc: boolean) => {
+    const cursor = ntc ? ntcNextCursor : nextCursor;
+    if (!cursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await connectionApi.getPage(ntc ? ntcFilters : requestedFilters(), cursor);
+      if (ntc) {
+        setNeedToConnect(prev => [...prev, ...page.items]);
+        setNtcNextCursor(page.next_cursor);
+      } else {
+        setConnections(prev => [...prev, ...page.items]);
+        setNextCursor(page.next_cursor);
+      }
+    } catch (err) {
+      console.error('Error loading more connections:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The list only holds summaries, so fetch the full notes before editing
+  const editConnection = async (conn: LinkedInConnection) => {
+    setEditingConn(await connectionApi.getOne(conn.id));
+    setShowForm(true);
+  };
+
+  const loadMoreButton = (ntc: boolean) => (
+    <div className="flex justify-center mt-4">
+      <button onClick={() => loadMore(ntc)} disabled={loadingMore} className="btn-secondary text-sm px-6 py-2">
+        {loadingMore ? 'Loading...' : 'Load more'}
+      </button>
+    </div>
+  );
+
+  // LinkedIn data export → Connections.csv
+  const importInput = useRef<HTMLInputElement>(null);
+  const [importing, setImporting] = useState(false);
+
+  const handleImport = async (e: ChangeEvent<HTMLInputElement>) => {
+    const file = e.target.files?.[0];
+    e.target.value = '';
+    if (!file) return;
+    setImporting(true);
+    try {
+      const report = await connectionApi.importCsv(file);
+      alert(
+        `Imported ${report.rows} rows: ${report.inserted} new, ${report.updated} updated, ` +
+        `${report.unchanged + report.duplicates} already known, ${report.skipped} skipped`
+      );
+      loadData();
+    } catch (err: any) {
+      alert(err.response?.data?.detail || 'Import failed');
+    } finally {
+      setImporting(false);
+    }
+  };
+
   const handleDelete = async (id: number) => {
     if (!confirm('Delete this connection request?')) return;
     await connectionApi.delete(id);
@@ -474,12 +539,23 @@ export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
             {connections.length} active · {needToConnect.length} need to connect
           </p>
         </div>
-        <button
-          onClick={() => { setEditingConn(undefined); setShowForm(true); }}
-          className="flex items-center gap-2 px-5 py-2.5 bg-gradient-to-r from-blue-600 to-indigo-600 text-white rounded-xl hover:from-blue-700 hover:to-indigo-700 font-semibold transition-all shadow-lg shadow-blue-500/25 hover:shadow-blue-500/40 hover:scale-[1.02]"
-        >
-          <FaPlus /> Add Connection
-        </button>
+        <div className="flex items-center gap-3">
+          <input ref={importInput} type="file" accept=".csv" onChange={handleImport} className="hidden" />
+          <button
+            onClick={() => importInput.current?.click()}
+            disabled={importing}
+            title="Import Connections.csv from your LinkedIn data export"
+            className="flex items-center gap-2 px-5 py-2.5 border border-gray-300 dark:border-slate-600 rounded-xl text-gray-700 dark:text-gray-300 hover:bg-gray-50 dark:hover:bg-slate-800 font-semibold transition-colors disabled:opacity-50"
+          >
+            <FaFileImport /> {importing ? 'Importing...' : 'Import CSV'}
+          </button>
+          <button
+            onClick={() => { setEditingConn(undefined); setShowForm(true); }}
+            className="flex items-center gap-2 px-5 py-2.5 bg-gradient-to-r from-blue-600 to-indigo-600 text-white rounded-xl hover:from-blue-700 hover:to-indigo-700 font-semibold transition-all shadow-lg shadow-blue-500/25 hover:shadow-blue-500/40 hover:scale-[1.02]"
+          >
+            <FaPlus /> Add Connection
+          </button>
+        </div>
       </div>
 
       {/* ── Stat Cards (act as filters) ── */}
@@ -691,13 +767,14 @@ export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
                   key={conn.id}
                   conn={conn}
                   isNTC
-                  onEdit={() => { setEditingConn(conn); setShowForm(true); }}
+                  onEdit={() => editConnection(conn)}
                   onDelete={() => handleDelete(conn.id)}
                   onMarkSent={() => handleMarkSent(conn)}
                 />
               ))}
             </div>
           )}
+          {!ntcCollapsed && ntcNextCursor && loadMoreButton(true)}
         </div>
       )}
 
@@ -744,12 +821,13 @@ export const ConnectionRequests = ({ onNavigate }: ConnectionRequestsProps) => {
               <ConnectionCard
                 key={conn.id}
                 conn={conn}
-                onEdit={() => { setEditingConn(conn); setShowForm(true); }}
+                onEdit={() => editConnection(conn)}
                 onDelete={() => handleDelete(conn.id)}
               />
             ))}
           </div>
         )}
+        {nextCursor && loadMoreButton(false)}
       </div>
 
       {/* ── Add/Edit Modal ── */}
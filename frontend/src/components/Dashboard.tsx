@@ -4,6 +4,8 @@ import { ApplicationStats } from '../types';
 import { applicationApi, RestorePreview } from '../services/api';
 import { useToast } from '../context/ToastContext';
 import { EmptyState } from './EmptyState';
+import { DueSoon } from './DueSoon';
+import { SkillsBreakdown } from './SkillsBreakdown';
 
 interface DashboardProps {
   onCardClick?: (filterType: string, filterValue: string) => void;
@@ -216,13 +218,16 @@ export const Dashboard = ({ onCardClick }: DashboardProps) => {
 
                 <p className="text-sm text-gray-500 dark:text-gray-400 text-center">
                   Current DB: <strong className="text-gray-700 dark:text-gray-200">{previewData.current_count}</strong> applications &rarr; Backup: <strong className="text-gray-700 dark:text-gray-200">{previewData.backup_count}</strong> applications
+                  {previewData.to_modify > 0 && (
+                    <> &middot; <strong className="text-amber-600 dark:text-amber-400">{previewData.to_modify}</strong> will be reverted to their backed-up version</>
+                  )}
                 </p>
 
                 {/* Applications to remove */}
                 {previewData.removed_items.length > 0 && (
                   <div>
                     <h3 className="text-sm font-semibold text-red-600 dark:text-red-400 mb-2 flex items-center gap-1.5">
-                      <FaMinus className="text-xs" /> Applications that will be removed ({previewData.removed_items.length})
+                      <FaMinus className="text-xs" /> Applications that will be removed ({previewData.to_remove})
                     </h3>
                     <div className="space-y-1.5 max-h-44 overflow-y-auto pr-1">
                       {previewData.removed_items.map(item => (
@@ -242,7 +247,7 @@ export const Dashboard = ({ onCardClick }: DashboardProps) => {
                 {previewData.added_items.length > 0 && (
                   <div>
                     <h3 className="text-sm font-semibold text-green-600 dark:text-green-400 mb-2 flex items-center gap-1.5">
-                      <FaPlus className="text-xs" /> Applications that will be restored ({previewData.added_items.length})
+                      <FaPlus className="text-xs" /> Applications that will be restored ({previewData.to_add})
                     </h3>
                     <div className="space-y-1.5 max-h-44 overflow-y-auto pr-1">
                       {previewData.added_items.map(item => (
@@ -258,7 +263,7 @@ export const Dashboard = ({ onCardClick }: DashboardProps) => {
                   </div>
                 )}
 
-                {previewData.to_add === 0 && previewData.to_remove === 0 && (
+                {previewData.to_add === 0 && previewData.to_remove === 0 && previewData.to_modify === 0 && (
                   <div className="text-center py-4 text-gray-500 dark:text-gray-400 text-sm">
                     ✅ This backup is identical to your current database. No changes will be made.
                   </div>
@@ -417,6 +422,12 @@ export const Dashboard = ({ onCardClick }: DashboardProps) => {
         </div>
       </div>
 
+      {/* Upcoming deadlines, interviews and follow-ups */}
+      <DueSoon />
+
+      {/* Skills asked for in postings, per status or domain */}
+      <SkillsBreakdown />
+
       {/* Status Breakdown */}
       <div className="glass-card p-6 rounded-2xl animate-slideUp" style={{ animationDelay: '400ms', animationFillMode: 'both' }}>
         <div className="flex items-center gap-3 mb-6">
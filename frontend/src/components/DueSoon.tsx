@@ -0,0 +1,101 @@
+import { ReactNode, useEffect, useState } from 'react';
+import { FaCalendarAlt, FaHourglassHalf, FaUserClock, FaComments } from 'react-icons/fa';
+import { DueItem } from '../types';
+import { dueApi } from '../services/api';
+
+const KIND_CONFIG: Record<DueItem['kind'], { label: string; icon: ReactNode; badge: string }> = {
+  deadline: {
+    label: 'Deadline',
+    icon: <FaHourglassHalf />,
+    badge: 'bg-red-100 dark:bg-red-900/40 text-red-700 dark:text-red-300',
+  },
+  interview: {
+    label: 'Interview',
+    icon: <FaComments />,
+    badge: 'bg-purple-100 dark:bg-purple-900/40 text-purple-700 dark:text-purple-300',
+  },
+  follow_up: {
+    label: 'Follow-up',
+    icon: <FaUserClock />,
+    badge: 'bg-blue-100 dark:bg-blue-900/40 text-blue-700 dark:text-blue-300',
+  },
+};
+
+const formatDue = (d: string) =>
+  new Date(d).toLocaleDateString('en-GB', { weekday: 'short', day: 'numeric', month: 'short' });
+
+// Morning review: everything due in the next week (and anything overdue)
+export const DueSoon = ({ days = 7 }: { days?: number }) => {
+  const [items, setItems] = useState<DueItem[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [overdue, setOverdue] = useState(false);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  useEffect(() => {
+    dueApi.getPage(days, overdue)
+      .then(page => {
+        setItems(page.items);
+        setNextCursor(page.next_cursor);
+      })
+      .catch(err => console.error('Error loading due items:', err));
+  }, [days, overdue]);
+
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await dueApi.getPage(days, overdue, nextCursor);
+      setItems(prev => [...prev, ...page.items]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error('Error loading more due items:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  return (
+    <div className="glass-card p-6 rounded-2xl">
+      <div className="flex items-center justify-between gap-3 mb-4">
+        <div className="flex items-center gap-3">
+          <div className="p-2 bg-gradient-to-br from-amber-500 to-orange-600 rounded-lg shadow-md">
+            <FaCalendarAlt className="text-lg text-white" />
+          </div>
+          <h3 className="text-xl font-semibold text-gray-900 dark:text-white">Due in the Next {days} Days</h3>
+        </div>
+        <label className="flex items-center gap-2 text-sm text-gray-600 dark:text-gray-400 cursor-pointer">
+          <input type="checkbox" checked={overdue} onChange={e => setOverdue(e.target.checked)} />
+          Include overdue
+        </label>
+      </div>
+      {items.length === 0 ? (
+        <p className="text-sm text-gray-500 dark:text-gray-400">Nothing due.</p>
+      ) : (
+        <ul className="divide-y divide-gray-100 dark:divide-slate-800">
+          {items.map(item => {
+            const config = KIND_CONFIG[item.kind];
+            return (
+              <li key={`${item.kind}-${item.id}`} className="flex items-center gap-3 py-2.5">
+                <span className="w-28 shrink-0 text-sm font-medium text-gray-700 dark:text-gray-300">{formatDue(item.due)}</span>
+                <span className={`flex items-center gap-1.5 px-2 py-0.5 rounded-md text-xs font-semibold ${config.badge}`}>
+                  {config.icon} {config.label}
+                </span>
+                <span className="truncate text-sm text-gray-900 dark:text-white">
+                  {item.title}
+                  {item.company_name && <span className="text-gray-500 dark:text-gray-400"> · {item.company_name}</span>}
+                </span>
+              </li>
+            );
+          })}
+        </ul>
+      )}
+      {nextCursor && (
+        <div className="flex justify-center mt-4">
+          <button onClick={loadMore} disabled={loadingMore} className="btn-secondary text-sm px-6 py-2">
+            {loadingMore ? 'Loading...' : 'Load more'}
+          </button>
+        </div>
+      )}
+    </div>
+  );
+};
@@ -19,6 +19,7 @@ interface JDParserModalProps {
 }
 
 // ─── Utility parsers ─────────────────────────────────────────────────────────
+// Mirrored by backend/app/jd_parser.py for batch parsing; keep the two in step
 
 // Lines to skip when scanning for title / company
 const LINKEDIN_SKIP = [
@@ -1,5 +1,7 @@
-import { useState } from 'react';
-import { FaChartBar, FaBriefcase, FaSun, FaMoon, FaBars, FaTimes, FaRocket, FaEnvelope, FaUserPlus } from 'react-icons/fa';
+import { useEffect, useState } from 'react';
+import { FaChartBar, FaBriefcase, FaSun, FaMoon, FaBars, FaTimes, FaRocket, FaEnvelope, FaUserPlus, FaBookmark } from 'react-icons/fa';
+import { SavedView } from '../types';
+import { viewApi } from '../services/api';
 
 
 interface SidebarProps {
@@ -7,11 +9,21 @@ interface SidebarProps {
       setActiveTab: (tab: 'dashboard' | 'applications' | 'cold-messages' | 'connection-requests') => void;
       isDark: boolean;
       toggleTheme: () => void;
+      onOpenView: (view: SavedView) => void;
+      viewsVersion: number;
 }
 
 
-export const Sidebar = ({ activeTab, setActiveTab, isDark, toggleTheme }: SidebarProps) => {
+export const Sidebar = ({ activeTab, setActiveTab, isDark, toggleTheme, onOpenView, viewsVersion }: SidebarProps) => {
       const [isOpen, setIsOpen] = useState(false);
+      const [views, setViews] = useState<SavedView[]>([]);
+
+      // Counts are kept up to date by the server, so refreshing them is cheap
+      useEffect(() => {
+            viewApi.getAll()
+                  .then(setViews)
+                  .catch(err => console.error('Error loading saved views:', err));
+      }, [activeTab, viewsVersion]);
 
       const toggleSidebar = () => setIsOpen(!isOpen);
 
@@ -95,6 +107,29 @@ export const Sidebar = ({ activeTab, setActiveTab, isDark, toggleTheme }: Sideba
                                                 <span className="relative z-10 font-medium tracking-wide">{item.label}</span>
                                           </button>
                                     ))}
+
+                                    {/* Saved Views */}
+                                    {views.length > 0 && (
+                                          <div className="pt-6">
+                                                <p className="px-4 mb-2 text-xs font-semibold uppercase tracking-wider text-gray-400 dark:text-gray-500">Saved Views</p>
+                                                {views.map((view) => (
+                                                      <button
+                                                            key={view.id}
+                                                            onClick={() => {
+                                                                  onOpenView(view);
+                                                                  setIsOpen(false);
+                                                            }}
+                                                            className="w-full flex items-center gap-3 px-4 py-2.5 rounded-xl text-sm text-gray-600 dark:text-gray-400 hover:bg-gray-50 dark:hover:bg-slate-800/50 hover:text-gray-900 dark:hover:text-white transition-colors"
+                                                      >
+                                                            <FaBookmark className="text-gray-400" />
+                                                            <span className="flex-1 truncate text-left">{view.name}</span>
+                                                            <span className="px-2 py-0.5 rounded-full text-xs font-semibold bg-blue-100 dark:bg-blue-900/40 text-blue-700 dark:text-blue-300">
+                                                                  {view.match_count ?? 0}
+                                                            </span>
+                                                      </button>
+                                                ))}
+                                          </div>
+                                    )}
                               </nav>
 
                               {/* Bottom Actions */}
@@ -0,0 +1,64 @@
+import { useEffect, useState } from 'react';
+import { FaTools } from 'react-icons/fa';
+import { SkillGroup } from '../types';
+import { skillApi } from '../services/api';
+
+type GroupBy = 'status' | 'domain';
+
+// Which skills show up in the postings behind each status (or domain)
+export const SkillsBreakdown = ({ limit = 8 }: { limit?: number }) => {
+  const [by, setBy] = useState<GroupBy>('status');
+  const [groups, setGroups] = useState<SkillGroup[]>([]);
+
+  useEffect(() => {
+    skillApi.getTop(by, undefined, limit)
+      .then(setGroups)
+      .catch(err => console.error('Error loading skills:', err));
+  }, [by, limit]);
+
+  return (
+    <div className="glass-card p-6 rounded-2xl">
+      <div className="flex items-center justify-between gap-3 mb-4">
+        <div className="flex items-center gap-3">
+          <div className="p-2 bg-gradient-to-br from-teal-500 to-cyan-600 rounded-lg shadow-md">
+            <FaTools className="text-lg text-white" />
+          </div>
+          <h3 className="text-xl font-semibold text-gray-900 dark:text-white">Skills in Job Descriptions</h3>
+        </div>
+        <select
+          value={by}
+          onChange={e => setBy(e.target.value as GroupBy)}
+          className="text-sm rounded-lg border border-gray-200 dark:border-slate-700 bg-white dark:bg-slate-800 text-gray-700 dark:text-gray-300 px-2 py-1"
+        >
+          <option value="status">By status</option>
+          <option value="domain">By domain</option>
+        </select>
+      </div>
+      {groups.length === 0 ? (
+        <p className="text-sm text-gray-500 dark:text-gray-400">No job descriptions with known skills yet.</p>
+      ) : (
+        <ul className="divide-y divide-gray-100 dark:divide-slate-800">
+          {groups.map(group => (
+            <li key={group.group ?? ''} className="py-3">
+              <div className="text-sm font-medium text-gray-700 dark:text-gray-300 mb-2">
+                {group.group ?? 'Not set'}
+                <span className="text-gray-500 dark:text-gray-400"> · {group.applications} postings</span>
+              </div>
+              <div className="flex flex-wrap gap-1.5">
+                {group.skills.map(skill => (
+                  <span
+                    key={skill.skill}
+                    title={`${skill.applications} of ${group.applications} postings`}
+                    className="px-2 py-0.5 rounded-md text-xs font-semibold bg-teal-100 dark:bg-teal-900/40 text-teal-700 dark:text-teal-300"
+                  >
+                    {skill.skill} {Math.round(skill.share * 100)}%
+                  </span>
+                ))}
+              </div>
+            </li>
+          ))}
+        </ul>
+      )}
+    </div>
+  );
+};
@@ -1,15 +1,43 @@
 import axios from 'axios';
-import { JobApplication, JobApplicationCreate, ApplicationStats, ColdMessage, ColdMessageCreate, ColdMessageStats, LinkedInConnection, LinkedInConnectionCreate, LinkedInConnectionStats } from '../types';
+import { JobApplication, JobApplicationCreate, ApplicationStats, ColdMessage, ColdMessageCreate, ColdMessageStats, LinkedInConnection, LinkedInConnectionCreate, LinkedInConnectionStats, ConnectionImportReport, DueItem, DuplicateMatch, Page, TypeaheadField, TypeaheadSuggestion, SavedView, SavedViewCreate, JDBackfillReport, SkillGroup } from '../types';
 
 
+export interface RestoreTableSummary {
+  current_count: number;
+  backup_count: number;
+  added: number;
+  removed: number;
+  modified: number;
+  unchanged: number;
+}
+
+export interface RestoreModifiedItem {
+  id: number;
+  changes: Record<string, { current: unknown; backup: unknown }>;
+  [column: string]: unknown;
+}
+
 export interface RestorePreview {
+  preview_id: string;
   current_count: number;
   backup_count: number;
   to_add: number;
   to_remove: number;
+  to_modify: number;
   unchanged: number;
   added_items: { id: number; company_name: string; job_title: string; status: string; application_date: string | null }[];
   removed_items: { id: number; company_name: string; job_title: string; status: string; application_date: string | null }[];
+  modified_items: RestoreModifiedItem[];
+  tables: Record<string, RestoreTableSummary>;
+}
+
+export interface RestoreDiffPage {
+  table: string;
+  kind: 'added' | 'removed' | 'modified';
+  total: number;
+  offset: number;
+  limit: number;
+  items: Record<string, unknown>[];
 }
 
 
@@ -19,6 +47,18 @@ const api = axios.create({
   baseURL: API_BASE_URL,
 });
 
+// When the backend runs with MULTI_TENANT, the user whose database to use
+// (set with localStorage.setItem('user', '<name>'))
+export const getCurrentUser = (): string | null => localStorage.getItem('user');
+
+api.interceptors.request.use((config) => {
+  const user = getCurrentUser();
+  if (user) {
+    config.headers['X-User'] = user;
+  }
+  return config;
+});
+
 export const applicationApi = {
   // Get all applications with advanced filtering
   getAll: async (filters?: {
@@ -60,6 +100,18 @@ export const applicationApi = {
     return response.data;
   },
 
+  // Same job URL, or same company with a similar title / description
+  checkDuplicates: async (data: {
+    company_name: string;
+    job_title: string;
+    job_url?: string;
+    job_description?: string;
+    exclude_id?: number;
+  }): Promise<DuplicateMatch[]> => {
+    const response = await api.post('/applications/check-duplicates', data);
+    return response.data;
+  },
+
   // Update application
   update: async (id: number, data: Partial<JobApplicationCreate>): Promise<JobApplication> => {
     const response = await api.put(`/applications/${id}`, data);
@@ -123,6 +175,12 @@ export const applicationApi = {
     return response.data;
   },
 
+  // Most used values of a field with a word starting with q
+  suggest: async (field: TypeaheadField, q: string, limit = 8): Promise<TypeaheadSuggestion[]> => {
+    const response = await api.get('/typeahead', { params: { field, q, limit } });
+    return response.data;
+  },
+
   // Get all tags
   getTags: async (): Promise<string[]> => {
     const response = await api.get('/tags/');
@@ -161,8 +219,19 @@ export const applicationApi = {
   },
 
   // Backup & Restore
-  backup: () => {
-    window.open(`${API_BASE_URL}/api/backup`, '_blank');
+  backup: async () => {
+    if (!getCurrentUser()) {
+      window.open(`${API_BASE_URL}/api/backup`, '_blank');
+      return;
+    }
+    // A plain link can't carry the X-User header, so download through axios
+    const response = await api.get('/api/backup', { responseType: 'blob' });
+    const url = URL.createObjectURL(response.data);
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = `job_tracker_backup_${new Date().toISOString().slice(0, 19).replace(/[-:T]/g, '')}.db`;
+    link.click();
+    URL.revokeObjectURL(url);
   },
 
   previewRestore: async (file: File): Promise<RestorePreview> => {
@@ -174,6 +243,33 @@ export const applicationApi = {
     return response.data;
   },
 
+  getRestoreDiff: async (
+    previewId: string,
+    table: string,
+    kind: 'added' | 'removed' | 'modified',
+    offset = 0,
+    limit = 50,
+  ): Promise<RestoreDiffPage> => {
+    const response = await api.get(`/api/restore/preview/${previewId}`, {
+      params: { table, kind, offset, limit },
+    });
+    return response.data;
+  },
+
+  mergeRestore: async (
+    source: { file?: File; previewId?: string },
+    policy: 'newest' | 'keep_current' | 'keep_backup' = 'newest',
+  ): Promise<{ message: string; policy: string; tables: Record<string, { inserted: number; updated: number }> }> => {
+    const formData = new FormData();
+    if (source.file) formData.append('file', source.file);
+    if (source.previewId) formData.append('preview_id', source.previewId);
+    formData.append('policy', policy);
+    const response = await api.post('/api/restore/merge', formData, {
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
   restore: async (file: File): Promise<void> => {
     const formData = new FormData();
     formData.append('file', file);
@@ -203,6 +299,32 @@ export const coldMessageApi = {
     return response.data;
   },
 
+  // Summaries without message_body / notes; use getOne for the full message
+  getPage: async (filters?: {
+    search?: string;
+    via?: string;
+    category?: string;
+    sort_by?: string;
+    sort_order?: string;
+  }, cursor?: string | null, limit = 50): Promise<Page<ColdMessage>> => {
+    const params: Record<string, unknown> = { limit };
+    if (filters) {
+      if (filters.search) params.search = filters.search;
+      if (filters.via) params.via = filters.via;
+      if (filters.category) params.category = filters.category;
+      if (filters.sort_by) params.sort_by = filters.sort_by;
+      if (filters.sort_order) params.sort_order = filters.sort_order;
+    }
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/cold-messages/page', { params });
+    return response.data;
+  },
+
+  getOne: async (id: number): Promise<ColdMessage> => {
+    const response = await api.get(`/cold-messages/${id}`);
+    return response.data;
+  },
+
   create: async (data: ColdMessageCreate): Promise<ColdMessage> => {
     const response = await api.post('/cold-messages/', data);
     return response.data;
@@ -247,6 +369,36 @@ export const connectionApi = {
     return response.data;
   },
 
+  // Summaries with notes cut to notes_preview; use getOne for the full record
+  getPage: async (filters?: {
+    search?: string;
+    status?: string;
+    category?: string;
+    cold_message_sent?: boolean;
+    stage?: string;
+    sort_by?: string;
+    sort_order?: string;
+  }, cursor?: string | null, limit = 50): Promise<Page<LinkedInConnection>> => {
+    const params: Record<string, unknown> = { limit };
+    if (filters) {
+      if (filters.search) params.search = filters.search;
+      if (filters.status) params.status = filters.status;
+      if (filters.category) params.category = filters.category;
+      if (filters.cold_message_sent !== undefined) params.cold_message_sent = filters.cold_message_sent;
+      if (filters.stage) params.stage = filters.stage;
+      if (filters.sort_by) params.sort_by = filters.sort_by;
+      if (filters.sort_order) params.sort_order = filters.sort_order;
+    }
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/connections/page', { params });
+    return response.data;
+  },
+
+  getOne: async (id: number): Promise<LinkedInConnection> => {
+    const response = await api.get(`/connections/${id}`);
+    return response.data;
+  },
+
   create: async (data: LinkedInConnectionCreate): Promise<LinkedInConnection> => {
     const response = await api.post('/connections/', data);
     return response.data;
@@ -269,9 +421,76 @@ export const connectionApi = {
     return response.data;
   },
 
+  // One request for many contacts; results come back in the same order
+  checkDuplicates: async (candidates: { name: string; company?: string; linkedin_url?: string }[]): Promise<{ exists: boolean; id?: number }[]> => {
+    const response = await api.post('/connections/check-duplicates', candidates);
+    return response.data;
+  },
+
+  // Connections.csv from LinkedIn's "Get a copy of your data" export
+  importCsv: async (file: File, dryRun = false): Promise<ConnectionImportReport> => {
+    const formData = new FormData();
+    formData.append('file', file);
+    const response = await api.post('/connections/import', formData, {
+      params: { dry_run: dryRun },
+      headers: { 'Content-Type': 'multipart/form-data' },
+    });
+    return response.data;
+  },
+
   getStatistics: async (): Promise<LinkedInConnectionStats> => {
     const response = await api.get('/connections/statistics/');
     return response.data;
   },
 };
 
+export const dueApi = {
+  // Deadlines, interviews and follow-ups due from today to `days` ahead, earliest first
+  getPage: async (days = 7, overdue = false, cursor?: string | null): Promise<Page<DueItem>> => {
+    const params: Record<string, string | number | boolean> = { days, overdue };
+    if (cursor) params.cursor = cursor;
+    const response = await api.get('/due', { params });
+    return response.data;
+  },
+};
+
+export const viewApi = {
+  // Saved views with their match counts
+  getAll: async (): Promise<SavedView[]> => {
+    const response = await api.get('/views');
+    return response.data;
+  },
+
+  create: async (data: SavedViewCreate): Promise<SavedView> => {
+    const response = await api.post('/views', data);
+    return response.data;
+  },
+
+  delete: async (id: number): Promise<void> => {
+    await api.delete(`/views/${id}`);
+  },
+
+  // Applications matching the view, in its saved sort order
+  getApplications: async (id: number): Promise<JobApplication[]> => {
+    const response = await api.get(`/views/${id}/applications`);
+    return response.data;
+  },
+};
+
+export const skillApi = {
+  // Most common skills in job descriptions per status or domain, e.g. groups ['Interview', 'Rejected']
+  getTop: async (by: 'status' | 'domain' = 'status', groups?: string[], limit = 10): Promise<SkillGroup[]> => {
+    const params: Record<string, string | number> = { by, limit };
+    if (groups && groups.length) params.groups = groups.join(',');
+    const response = await api.get('/skills/top', { params });
+    return response.data;
+  },
+};
+
+export const jdApi = {
+  // Fill empty salary / location / work type fields from the stored job descriptions
+  backfill: async (dryRun = false): Promise<JDBackfillReport> => {
+    const response = await api.post('/jd/backfill', null, { params: { dry_run: dryRun } });
+    return response.data;
+  },
+};
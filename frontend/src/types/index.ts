@@ -171,6 +171,30 @@ export interface FilterState {
   rejectionStage?: string;
 }
 
+// The GET /applications/ filters a saved view applies
+export interface SavedViewFilters {
+  status?: string;
+  domain?: string;
+  search?: string;
+  work_type?: string;
+  tags?: string;
+  include_archived?: boolean;
+  status_stage?: string;
+}
+
+export interface SavedViewCreate {
+  name: string;
+  filters: SavedViewFilters;
+  sort_by?: string;
+  sort_order?: 'asc' | 'desc';
+}
+
+export interface SavedView extends SavedViewCreate {
+  id: number;
+  match_count?: number | null;
+  created_at?: string;
+}
+
 // Cold Message Types
 export interface ColdMessage {
   id: number;
@@ -231,10 +255,69 @@ export interface LinkedInConnection {
   cold_message_id?: number;
   follow_up_date?: string;
   notes?: string;
+  notes_preview?: string;   // list pages only carry the start of the notes
   created_at: string;
   updated_at?: string;
 }
 
+// One page of a cursor-paginated list; pass next_cursor back to get the next page
+export interface Page<T> {
+  items: T[];
+  next_cursor: string | null;
+}
+
+export interface DuplicateApplication {
+  id: number;
+  company_name: string;
+  job_title: string;
+  status?: string;
+  job_url?: string;
+}
+
+export interface DuplicateMatch extends DuplicateApplication {
+  score: number;
+  reason: 'same_url' | 'similar';
+}
+
+export interface DueItem {
+  kind: 'deadline' | 'follow_up' | 'interview';
+  due: string;
+  id: number;
+  title: string;
+  company_name?: string;
+  company_id?: number;
+  detail?: string;
+}
+
+export interface JDBackfillReport {
+  scanned: number;
+  updated: number;
+  dry_run: boolean;
+  salary_min: number;
+  salary_max: number;
+  location: number;
+  work_type: number;
+}
+
+export interface SkillCount {
+  skill: string;
+  applications: number;
+  share: number;
+}
+
+export interface SkillGroup {
+  group: string | null;
+  applications: number;
+  skills: SkillCount[];
+}
+
+export type TypeaheadField = 'company_name' | 'job_title' | 'location' | 'domain' | 'applied_on';
+
+export interface TypeaheadSuggestion {
+  value: string;
+  count: number;
+}
+
 export interface LinkedInConnectionCreate {
   contact_name: string;
   linkedin_profile_id?: string;
@@ -261,6 +344,17 @@ export interface LinkedInConnectionStats {
   acceptance_rate: number;
 }
 
+export interface ConnectionImportReport {
+  rows: number;
+  inserted: number;
+  updated: number;
+  unchanged: number;
+  duplicates: number;
+  skipped: number;
+  errors: { line: number; error: string }[];
+  dry_run: boolean;
+}
+
 export const CONNECTION_STATUS_OPTIONS = ['Pending', 'Accepted', 'Withdrawn'];
 export const CONNECTION_CATEGORY_OPTIONS = ['Recruiter', 'Hiring Manager', 'Employee', 'Other'];
 